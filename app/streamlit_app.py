@@ -1,6 +1,9 @@
+import hashlib
+import io
 import json
 import os
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import streamlit as st
 
@@ -10,95 +13,262 @@ except ImportError:  # pragma: no cover - optional dependency
     def load_dotenv() -> bool:  # type: ignore
         return False
 
-from pipeline import run_pipeline_stage1, run_pipeline_stage2
+from pipeline import Pipeline, get_default_pipeline, run_pipeline_batch
+from pipeline.ingest_stream import iter_records
+from pipeline.models import ComplianceResult
+from pipeline.snapshot_diff import RESULT_STATUSES, catalog_summary, summarize_result
 
 load_dotenv()
 
 st.set_page_config(page_title="Dataspace Compliance Copilot", layout="wide")
 
+PAGE_SIZES = (25, 50, 100)
+# Catalog runs use a small pool of spawned processes: forking from Streamlit's threads can deadlock.
+CATALOG_WORKERS = 2
 
-def load_report_md(output_dir: str) -> str:
-    report_path = Path(output_dir) / "compliance_report.md"
+
+@st.cache_resource
+def get_engine() -> Pipeline:
+    # One warm pipeline (configs, compiled rules, LLM client) shared by every session.
+    return get_default_pipeline()
+
+
+def engine_version() -> str:
+    """Config and prompt hashes of the engine, so edited rules or prompts invalidate cached results."""
+
+    engine = get_engine()
+    engine.reload_if_changed()
+    return f"{engine.config_hash}:{engine.prompt_hash}"
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_stage1(content_hash: str, version: str, _metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return get_engine().stage1(_metadata)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_stage2(content_hash: str, version: str, _stage1: Dict[str, Any]) -> Dict[str, Any]:
+    return get_engine().stage2(_stage1)
+
+
+@st.cache_data(max_entries=4, show_spinner="Running every record of the catalog...")
+def cached_catalog(content_hash: str, version: str, _data: bytes) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Run every record of an NDJSON or JSON array catalog, keeping only per-record summaries."""
+
+    malformed: List[Dict[str, Any]] = []
+
+    def records():
+        for item in iter_records(io.BytesIO(_data)):
+            if "error" in item:
+                malformed.append(item)
+            elif isinstance(item["record"], dict):
+                yield item["record"]
+            else:
+                malformed.append({"offset": item["offset"], "error": "Expected a JSON object"})
+
+    summaries = [
+        {
+            "index": result["index"],
+            "dataset_id": result.get("dataset_id"),
+            **summarize_result(result),
+            "output_dir": result.get("output_dir"),
+        }
+        for result in run_pipeline_batch(
+            records(), workers=CATALOG_WORKERS, output_root=get_engine().output_root, mp_context="spawn"
+        )
+    ]
+    return summaries, malformed
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_report_md(output_dir: str, name: str = "compliance_report.md") -> str:
+    report_path = Path(output_dir) / name
     if report_path.exists():
         return report_path.read_text(encoding="utf-8")
     return "Report not available."
 
 
-def render_compliance(title: str, report: dict):
+def render_compliance(title: str, report: Any):
+    report = ComplianceResult.from_dict(report)
     st.subheader(title)
-    st.write(f"Status: **{report.get('overall_status')}** | Score: **{report.get('score')}**")
-    if report.get("findings"):
-        for finding in report["findings"]:
-            st.write(f"- [{finding.get('severity')}] {finding.get('field')}: {finding.get('message')}")
+    st.write(f"Status: **{report.overall_status}** | Score: **{report.score}**")
+    if report.findings:
+        for finding in report.findings:
+            st.write(f"- [{finding.severity}] {finding.field}: {finding.message}")
     else:
         st.success("No findings")
 
 
+def render_json_on_demand(label: str, value: Any, key: str):
+    # Large documents are only sent to the browser when asked for.
+    if st.toggle(label, key=key):
+        st.json(value, expanded=False)
+
+
+def parse_upload(data: bytes) -> Optional[Dict[str, Any]]:
+    """The upload as a single record, or None when it is a catalog (NDJSON or a JSON array)."""
+
+    try:
+        value = json.loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def is_catalog(data: bytes) -> bool:
+    """Whether the upload is NDJSON or a JSON array whose first entry is a record."""
+
+    try:
+        first = next(iter_records(io.BytesIO(data)), None)
+    except ValueError:
+        return False
+    return first is not None and isinstance(first.get("record"), dict)
+
+
+def render_single(digest: str, metadata: Dict[str, Any]):
+    render_json_on_demand("Show uploaded metadata", metadata, f"metadata_{digest}")
+    if st.button("Run compliance and suggest fixes (no apply yet)"):
+        st.session_state["stage1_hash"] = digest
+
+    if st.session_state.get("stage1_hash") != digest:
+        return
+    with st.spinner("Running analysis..."):
+        stage1 = cached_stage1(digest, engine_version(), metadata)
+
+    if stage1.get("status") != "ok":
+        st.error(stage1.get("error", "Unknown error"))
+        return
+
+    st.write(f"Validation quality score: **{stage1.get('quality_score')}**")
+    if stage1.get("validation_errors"):
+        st.warning("Validation warnings:")
+        for err in stage1["validation_errors"]:
+            st.write(f"- {err}")
+
+    st.subheader("Loire Self-Description (Before Patches)")
+    render_json_on_demand("Show self-description", stage1.get("loire", {}), f"loire_{digest}")
+
+    render_compliance("Compliance - Before", stage1.get("compliance_before", {}))
+
+    st.subheader("Suggested Explanation and Patches")
+    st.json({
+        "explanation": stage1.get("explanation"),
+        "patches": stage1.get("patches"),
+        "questions": stage1.get("questions"),
+    }, expanded=False)
+
+    if st.button("Apply suggested fixes and re-run", type="primary"):
+        st.session_state["stage2_hash"] = digest
+
+    if st.session_state.get("stage2_hash") != digest:
+        return
+    with st.spinner("Applying patches and re-running..."):
+        result_after = cached_stage2(digest, engine_version(), stage1)
+
+    st.subheader("Loire Self-Description (After Patches)")
+    render_json_on_demand("Show patched self-description", result_after.get("loire_after", {}), f"loire_after_{digest}")
+
+    render_compliance("Compliance - After", result_after.get("compliance_after", {}))
+
+    if result_after.get("output_dir") and os.path.exists(result_after.get("output_dir")):
+        st.subheader("Markdown Report")
+        st.markdown(load_report_md(result_after["output_dir"]))
+    else:
+        st.info("Report not available; ensure application can write to outputs directory.")
+
+
+def render_catalog(digest: str, data: bytes):
+    st.write(f"Catalog upload ({len(data) / 1024 / 1024:.1f} MB). Every record runs the full pipeline.")
+    if st.button("Run compliance on every record"):
+        st.session_state["catalog_hash"] = digest
+    if st.session_state.get("catalog_hash") != digest:
+        return
+
+    summaries, malformed = cached_catalog(digest, engine_version(), data)
+    summary = catalog_summary({str(s["index"]): s for s in summaries})
+
+    st.subheader("Catalog Summary")
+    cols = st.columns(3)
+    cols[0].metric("Records", f"{summary['records']:,}")
+    cols[1].metric("Mean score (after fixes)", f"{summary['mean_score'] or 0:.1f}")
+    cols[2].metric("Mean score (as submitted)", f"{summary['mean_input_score'] or 0:.1f}")
+    st.dataframe(
+        [{"status": status, "records": count} for status, count in summary["status_counts"].items()],
+        hide_index=True,
+    )
+    if summary["rule_failures"]:
+        st.dataframe(
+            [{"rule": rule, "failing records": count} for rule, count in summary["rule_failures"].items()],
+            hide_index=True,
+        )
+    if malformed:
+        st.warning(f"{len(malformed):,} malformed entries were skipped.")
+
+    st.subheader("Records")
+    statuses = st.multiselect("Status", RESULT_STATUSES, default=list(RESULT_STATUSES))
+    rows = [s for s in summaries if (s.get("status") or "error") in statuses]
+    page_size = st.selectbox("Records per page", PAGE_SIZES)
+    pages = max(1, -(-len(rows) // page_size))
+    page = st.number_input(
+        f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key=f"page_{digest}_{page_size}_{len(rows)}"
+    )
+    page_rows = rows[(page - 1) * page_size:page * page_size]
+    st.dataframe(
+        [
+            {
+                "index": row["index"],
+                "dataset": row.get("dataset_id"),
+                "status": row.get("status"),
+                "score": row.get("score"),
+                "input score": row.get("input_score"),
+                "failed rules": ", ".join(row.get("failed_rules", [])),
+            }
+            for row in page_rows
+        ],
+        hide_index=True,
+    )
+
+    # Only the selected record's report is read from disk and rendered.
+    choice = st.selectbox(
+        "Record details",
+        [None] + page_rows,
+        format_func=lambda row: "Select a record" if row is None else f"#{row['index']} {row.get('dataset_id') or ''}",
+    )
+    if choice is None:
+        return
+    if choice.get("status") == "error":
+        st.error(choice.get("error") or "Unknown error")
+    elif choice.get("output_dir") and os.path.exists(choice["output_dir"]):
+        st.markdown(load_report_md(choice["output_dir"]))
+    else:
+        st.info("Report not available; ensure application can write to outputs directory.")
+
+
 def main():
     st.title("Dataspace Compliance Copilot (DCC)")
-    st.write("Upload Health DCAT-AP metadata JSON to validate, map, and check compliance.")
-
-    uploaded = st.file_uploader("Upload Health DCAT-AP JSON", type=["json"])
-
-    if uploaded:
-        try:
-            metadata = json.load(uploaded)
-            st.session_state["metadata"] = metadata
-            st.session_state.pop("stage1", None)
-            st.session_state.pop("result_after", None)
-        except json.JSONDecodeError:
-            st.error("Invalid JSON file. Please upload a valid Health DCAT-AP JSON.")
-            return
-
-    if "metadata" in st.session_state:
-        st.json(st.session_state["metadata"], expanded=False)
-        if st.button("Run compliance and suggest fixes (no apply yet)"):
-            with st.spinner("Running analysis..."):
-                stage1 = run_pipeline_stage1(st.session_state["metadata"])
-                st.session_state["stage1"] = stage1
-                st.session_state.pop("result_after", None)
-
-    stage1 = st.session_state.get("stage1")
-    if stage1:
-        if stage1.get("status") != "ok":
-            st.error(stage1.get("error", "Unknown error"))
-            return
-
-        st.write(f"Validation quality score: **{stage1.get('quality_score')}**")
-        if stage1.get("validation_errors"):
-            st.warning("Validation warnings:")
-            for err in stage1["validation_errors"]:
-                st.write(f"- {err}")
-
-        st.subheader("Loire Self-Description (Before Patches)")
-        st.json(stage1.get("loire", {}), expanded=False)
-
-        render_compliance("Compliance - Before", stage1.get("compliance_before", {}))
-
-        st.subheader("Suggested Explanation and Patches")
-        st.json({
-            "explanation": stage1.get("explanation"),
-            "patches": stage1.get("patches"),
-            "questions": stage1.get("questions"),
-        }, expanded=False)
-
-        if st.button("Apply suggested fixes and re-run", type="primary"):
-            with st.spinner("Applying patches and re-running..."):
-                stage2 = run_pipeline_stage2(stage1)
-                st.session_state["result_after"] = stage2
-
-    result_after = st.session_state.get("result_after")
-    if result_after:
-        st.subheader("Loire Self-Description (After Patches)")
-        st.json(result_after.get("loire_after", {}), expanded=False)
-
-        render_compliance("Compliance - After", result_after.get("compliance_after", {}))
-
-        if result_after.get("output_dir") and os.path.exists(result_after.get("output_dir")):
-            st.subheader("Markdown Report")
-            st.markdown(load_report_md(result_after["output_dir"]))
-        else:
-            st.info("Report not available; ensure application can write to outputs directory.")
+    st.write(
+        "Upload Health DCAT-AP metadata JSON to validate, map, and check compliance, "
+        "or an NDJSON catalog (or JSON array) to check every record."
+    )
+    get_engine()
+
+    uploaded = st.file_uploader("Upload Health DCAT-AP JSON or NDJSON", type=["json", "ndjson", "jsonl"])
+    if not uploaded:
+        return
+
+    data = uploaded.getvalue()
+    digest = content_hash(data)
+    metadata = parse_upload(data)
+    if metadata is not None:
+        render_single(digest, metadata)
+        return
+    if not is_catalog(data):
+        st.error("Invalid JSON file. Please upload a valid Health DCAT-AP JSON.")
+        return
+    render_catalog(digest, data)
 
 
 if __name__ == "__main__":
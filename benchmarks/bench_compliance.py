@@ -0,0 +1,75 @@
+"""Compare the compiled RuleSet against the original per-call compliance path.
+
+Usage: python benchmarks/bench_compliance.py [records]
+"""
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from pipeline.compliance import EMAIL_REGEX, PENALTIES, _is_valid_url, run_compliance  # noqa: E402
+from pipeline.config_loader import load_yaml_config  # noqa: E402
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "configs", "federator_sim_rules.yaml")
+
+
+def _legacy_get_by_path(data: Dict[str, Any], path: str) -> Any:
+    current = data
+    for part in path.split("."):
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return None
+    return current
+
+
+def legacy_run_compliance(loire: Dict[str, Any], rules_path: str) -> Dict[str, Any]:
+    """The pre-RuleSet implementation: YAML re-read and if/elif dispatch on every call."""
+    cfg = load_yaml_config(rules_path)
+    rules: List[Dict[str, Any]] = cfg.get("rules", [])
+    findings: List[Dict[str, Any]] = []
+    score = 100
+    for rule in rules:
+        field = rule.get("field", "")
+        severity = rule.get("severity", "minor")
+        value = _legacy_get_by_path(loire, field)
+        violation = False
+        if rule.get("rule") == "required":
+            violation = value in (None, "", [], {})
+        elif rule.get("rule") == "format:email":
+            violation = not (isinstance(value, str) and EMAIL_REGEX.match(value or ""))
+        elif rule.get("rule") == "format:url":
+            violation = not (isinstance(value, str) and _is_valid_url(value))
+        if violation:
+            findings.append({"id": rule.get("id"), "severity": severity, "field": field,
+                             "message": rule.get("message", ""), "rule": rule.get("rule")})
+            score -= PENALTIES.get(severity, 0)
+    has_blocking = any(f.get("severity") in {"critical", "major"} for f in findings)
+    status = "fail" if has_blocking else ("pass_with_warnings" if findings else "pass")
+    return {"overall_status": status, "score": max(0, score), "findings": findings}
+
+
+def _records(n: int) -> List[Dict[str, Any]]:
+    good = {"title": "T", "description": "D", "contact": {"email": "a@b.org"}, "license": "https://x.org/l",
+            "landing_page": "https://x.org", "keywords": ["k"], "issued": "2024-01-01"}
+    bad = {"title": "", "description": "", "contact": {"email": "nope"}, "license": "x",
+           "landing_page": "http://", "keywords": [], "issued": None}
+    return [good if i % 2 else bad for i in range(n)]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    records = _records(n)
+    for name, fn in (("legacy", legacy_run_compliance), ("ruleset", run_compliance)):
+        start = time.perf_counter()
+        for record in records:
+            fn(record, RULES_PATH)
+        elapsed = time.perf_counter() - start
+        print(f"{name:8s} {n} records in {elapsed:.3f}s ({n / elapsed:,.0f} records/s)")
+    assert all(legacy_run_compliance(r, RULES_PATH) == run_compliance(r, RULES_PATH) for r in records[:2])
+
+
+if __name__ == "__main__":
+    main()
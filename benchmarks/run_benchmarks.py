@@ -0,0 +1,239 @@
+"""Time each pipeline stage and the full pipeline on synthetic records, and check for regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1k,100k,1M --output bench.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.25
+    python benchmarks/run_benchmarks.py --sizes 1k --update-baseline
+
+Everything runs offline: the LLM step uses the deterministic fallback patches. The I/O-bound
+stages (``write_reports`` and the full pipeline) are timed on at most ``--report-sample`` and
+``--pipeline-sample`` records of each size so a 1M run does not write millions of files;
+all results are per record. Exits with status 1 when a stage is slower than the baseline by
+more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir))
+
+from benchmarks.synthetic import DEFAULT_FAILURE_MIX, generate_records  # noqa: E402
+from pipeline.compliance import run_compliance  # noqa: E402
+from pipeline.explain_fix import Explainer, _fallback_patches  # noqa: E402
+from pipeline.ingest_validate import ValidationError, validate_health_dcat  # noqa: E402
+from pipeline.mapper import map_health_dcat_to_loire  # noqa: E402
+from pipeline.orchestrator import CONFIG_DIR, MAPPING_CONFIG, RULES_CONFIG, Pipeline  # noqa: E402
+from pipeline.patcher import apply_patches  # noqa: E402
+from pipeline.report import write_reports  # noqa: E402
+
+IO_STAGES = {"write_reports", "pipeline"}
+STAGES = ("validate_health_dcat", "map_health_dcat_to_loire", "run_compliance", "apply_patches", "write_reports", "pipeline")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+CHUNK_SIZE = 10000
+MAPPING_PATH = os.path.join(CONFIG_DIR, MAPPING_CONFIG)
+RULES_PATH = os.path.join(CONFIG_DIR, RULES_CONFIG)
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    factor = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Timer:
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.records: Dict[str, int] = {stage: 0 for stage in STAGES}
+
+    def add(self, stage: str, started: float, records: int) -> None:
+        self.seconds[stage] += time.perf_counter() - started
+        self.records[stage] += records
+
+    def result(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for stage in STAGES:
+            n, seconds = self.records[stage], self.seconds[stage]
+            if n:
+                out[stage] = {
+                    "records": n,
+                    "seconds": round(seconds, 6),
+                    "us_per_record": round(seconds / n * 1e6, 3),
+                    "records_per_s": round(n / seconds, 1) if seconds else None,
+                }
+        return out
+
+
+def bench_size(n: int, args: argparse.Namespace, workdir: str) -> Dict[str, Dict[str, float]]:
+    timer = _Timer()
+    records = generate_records(
+        n,
+        seed=args.seed,
+        failure_mix=args.failure_mix,
+        description_length=args.description_length,
+        keyword_count=args.keyword_count,
+        nesting_depth=args.nesting_depth,
+    )
+    report_budget = min(n, args.report_sample)
+    pipeline_budget = min(n, args.pipeline_sample)
+    pipeline = Pipeline(output_root=os.path.join(workdir, "pipeline"), explainer=Explainer("", ""), auto_reload=False)
+
+    for chunk in _chunks(records, CHUNK_SIZE):
+        started = time.perf_counter()
+        validated = []
+        for record in chunk:
+            try:
+                validated.append(validate_health_dcat(record)[0])
+            except ValidationError:
+                pass
+        timer.add("validate_health_dcat", started, len(chunk))
+
+        started = time.perf_counter()
+        loires = [map_health_dcat_to_loire(record, MAPPING_PATH)[0] for record in validated]
+        timer.add("map_health_dcat_to_loire", started, len(validated))
+
+        started = time.perf_counter()
+        compliance = [run_compliance(loire, RULES_PATH) for loire in loires]
+        timer.add("run_compliance", started, len(loires))
+
+        patches = [_fallback_patches(loire, result["findings"]) for loire, result in zip(loires, compliance)]
+        started = time.perf_counter()
+        patched = [apply_patches(loire, patch) for loire, patch in zip(loires, patches)]
+        timer.add("apply_patches", started, len(loires))
+
+        if report_budget > 0:
+            take = min(report_budget, len(loires))
+            after = [run_compliance(loire, RULES_PATH) for loire in patched[:take]]
+            started = time.perf_counter()
+            for index in range(take):
+                write_reports(
+                    os.path.join(workdir, "reports", f"run_{timer.records['write_reports'] + index:07d}"),
+                    {
+                        "loire_before": loires[index],
+                        "loire_after": patched[index],
+                        "compliance_before": compliance[index],
+                        "compliance_after": after[index],
+                        "patches": patches[index],
+                    },
+                    json.dumps(validated[index], indent=2),
+                )
+            timer.add("write_reports", started, take)
+            report_budget -= take
+
+        if pipeline_budget > 0:
+            take = chunk[:pipeline_budget]
+            started = time.perf_counter()
+            for record in take:
+                pipeline.run(record)
+            timer.add("pipeline", started, len(take))
+            pipeline_budget -= len(take)
+
+    return timer.result()
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, io_threshold: float = None
+) -> List[Tuple[str, str, float, float, float]]:
+    """Return ``(size, stage, baseline_us, current_us, ratio)`` for every stage over its threshold.
+
+    Disk-bound stages use ``io_threshold`` (default: ``threshold``) since they vary more between runs.
+    """
+
+    regressions = []
+    for size, stages in current.get("results", {}).items():
+        for stage, metrics in stages.items():
+            reference = baseline.get("results", {}).get(size, {}).get(stage)
+            if not reference or not reference.get("us_per_record"):
+                continue
+            ratio = metrics["us_per_record"] / reference["us_per_record"]
+            limit = io_threshold if stage in IO_STAGES and io_threshold is not None else threshold
+            if ratio > 1 + limit:
+                regressions.append((size, stage, reference["us_per_record"], metrics["us_per_record"], ratio))
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k", help="comma-separated record counts, e.g. 1k,100k,1M")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--failure-mix", type=json.loads, default=DEFAULT_FAILURE_MIX,
+                        help="JSON object of per-field failure probabilities")
+    parser.add_argument("--description-length", type=int, default=200)
+    parser.add_argument("--keyword-count", type=int, default=5)
+    parser.add_argument("--nesting-depth", type=int, default=0)
+    parser.add_argument("--report-sample", type=int, default=1000)
+    parser.add_argument("--pipeline-sample", type=int, default=1000)
+    parser.add_argument("--output", help="write results JSON to this path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown per stage (0.25 = 25%%)")
+    parser.add_argument("--io-threshold", type=float, default=1.0,
+                        help="allowed slowdown for write_reports and the full pipeline (disk-bound, noisier)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Keep the run hermetic: no API calls, caches or run store from the caller's environment.
+    for name in ("OPENAI_API_KEY", "DCC_LLM_CACHE", "DCC_RUN_STORE"):
+        os.environ.pop(name, None)
+
+    current: Dict[str, Any] = {
+        "meta": {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "failure_mix": args.failure_mix,
+            "description_length": args.description_length,
+            "keyword_count": args.keyword_count,
+            "nesting_depth": args.nesting_depth,
+            "report_sample": args.report_sample,
+            "pipeline_sample": args.pipeline_sample,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="dcc-bench-") as workdir:
+        for size_text in args.sizes.split(","):
+            n = parse_size(size_text)
+            current["results"][str(n)] = results = bench_size(n, args, workdir)
+            for stage, metrics in results.items():
+                print(f"{n:>9,} {stage:26s} {metrics['us_per_record']:>10.1f} us/record {metrics['records_per_s']:>12,.0f} records/s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold, args.io_threshold)
+    for size, stage, before, after, ratio in regressions:
+        print(f"REGRESSION {stage} at {int(size):,} records: {before:.1f} -> {after:.1f} us/record ({ratio:.2f}x)")
+    if not regressions:
+        print(f"No stage slower than the baseline by more than {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Seeded generator of synthetic Health DCAT-AP records for benchmarks.
+
+Each failure in ``failure_mix`` is applied independently with the given probability, so a
+record can fail several rules at once. ``pii`` plants a PII term that makes validation reject
+the record.
+"""
+import random
+from typing import Any, Dict, Iterator, Optional
+
+WORDS = (
+    "health", "statistics", "research", "cohort", "registry", "hospital", "admissions", "survey",
+    "regional", "annual", "aggregated", "outcomes", "vaccination", "mortality", "prevalence",
+    "indicator", "care", "primary", "secondary", "public", "open", "dataset", "monitoring", "trend",
+)
+
+DEFAULT_FAILURE_MIX: Dict[str, float] = {
+    "title": 0.1,
+    "description": 0.1,
+    "contact_email": 0.1,
+    "license": 0.1,
+    "landing_page": 0.05,
+    "keywords": 0.1,
+    "issued": 0.1,
+    "pii": 0.0,
+}
+
+
+def _text(rng: random.Random, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def _nested(rng: random.Random, depth: int) -> Dict[str, Any]:
+    node: Dict[str, Any] = {"label": _text(rng, 24)}
+    if depth > 1:
+        node["children"] = [_nested(rng, depth - 1) for _ in range(2)]
+    return node
+
+
+def generate_record(
+    rng: random.Random,
+    index: int,
+    failure_mix: Optional[Dict[str, float]] = None,
+    description_length: int = 200,
+    keyword_count: int = 5,
+    nesting_depth: int = 0,
+) -> Dict[str, Any]:
+    mix = DEFAULT_FAILURE_MIX if failure_mix is None else failure_mix
+
+    def fails(field: str) -> bool:
+        return rng.random() < mix.get(field, 0.0)
+
+    record: Dict[str, Any] = {
+        "datasetTitle": "" if fails("title") else _text(rng, 40).title(),
+        "description": "" if fails("description") else _text(rng, description_length),
+        "publisher": {"name": "Health Dept"},
+        "contactPoint": {
+            "email": "invalid-email" if fails("contact_email") else f"steward{index % 97}@health.example.org",
+            "name": "Data Steward",
+        },
+        "keywords": [] if fails("keywords") else [rng.choice(WORDS) for _ in range(keyword_count)],
+        "license": "not-a-url" if fails("license") else "https://creativecommons.org/licenses/by/4.0/",
+        "landingPage": "http://example" if fails("landing_page") else f"https://data.health.example.org/datasets/{index}",
+        "issued": "" if fails("issued") else f"20{rng.randint(10, 24)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+    }
+    if nesting_depth > 0:
+        record["extras"] = _nested(rng, nesting_depth)
+    if fails("pii"):
+        record["notes"] = "contains patient identifiers"
+    return record
+
+
+def generate_records(
+    n: int,
+    seed: int = 0,
+    failure_mix: Optional[Dict[str, float]] = None,
+    description_length: int = 200,
+    keyword_count: int = 5,
+    nesting_depth: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """Yield ``n`` records lazily; the same arguments always produce the same records."""
+
+    rng = random.Random(seed)
+    for index in range(n):
+        yield generate_record(rng, index, failure_mix, description_length, keyword_count, nesting_depth)
@@ -1,3 +1,11 @@
-from .orchestrator import run_pipeline, run_pipeline_stage1, run_pipeline_stage2
+from .batch import run_pipeline_batch
+from .orchestrator import Pipeline, get_default_pipeline, run_pipeline, run_pipeline_stage1, run_pipeline_stage2
 
-__all__ = ["run_pipeline", "run_pipeline_stage1", "run_pipeline_stage2"]
+__all__ = [
+    "Pipeline",
+    "get_default_pipeline",
+    "run_pipeline",
+    "run_pipeline_batch",
+    "run_pipeline_stage1",
+    "run_pipeline_stage2",
+]
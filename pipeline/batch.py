@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Set
+
+from .orchestrator import _new_run_id, get_default_pipeline, run_pipeline
+
+
+def _init_worker() -> None:
+    # Build the per-process pipeline up front so records never pay for config parsing.
+    get_default_pipeline()
+
+
+def _run_record(index: int, metadata: Dict[str, Any], output_root: Optional[str], run_id: str) -> Dict[str, Any]:
+    try:
+        result = run_pipeline(metadata, output_root=output_root, run_id=run_id)
+    except Exception as exc:  # a single bad record must not abort the batch
+        result = {
+            "status": "error",
+            "error": f"{type(exc).__name__}: {exc}",
+            "quality_score": 0,
+        }
+    result["index"] = index
+    return result
+
+
+def run_pipeline_batch(
+    records: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    output_root: Optional[str] = None,
+    ordered: bool = True,
+    max_in_flight: Optional[int] = None,
+    mp_context: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Run the full pipeline over many records on a process pool.
+
+    Results are yielded lazily, in input order when ``ordered`` is true or as they
+    complete otherwise; each carries the record's ``index``. At most ``max_in_flight``
+    records are submitted at once, so ``records`` may be an unbounded iterator.
+    ``workers`` of 0 or 1 runs everything in the calling process. ``mp_context`` names the
+    start method of the worker processes (e.g. ``"spawn"`` from a multithreaded server).
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_in_flight = max_in_flight or max(1, workers) * 4
+    batch_id = f"batch_{_new_run_id()[4:]}"
+
+    if workers <= 1:
+        _init_worker()
+        for index, metadata in enumerate(records):
+            yield _run_record(index, metadata, output_root, f"{batch_id}_{index:06d}")
+        return
+
+    context = multiprocessing.get_context(mp_context) if mp_context else None
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, mp_context=context)
+    try:
+        pending_ordered: Deque[Future] = deque()
+        pending: Set[Future] = set()
+        for index, metadata in enumerate(records):
+            future = executor.submit(_run_record, index, metadata, output_root, f"{batch_id}_{index:06d}")
+            if ordered:
+                pending_ordered.append(future)
+                if len(pending_ordered) >= max_in_flight:
+                    yield pending_ordered.popleft().result()
+            else:
+                pending.add(future)
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        yield finished.result()
+
+        while pending_ordered:
+            yield pending_ordered.popleft().result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for finished in done:
+                yield finished.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,4 +1,8 @@
-from typing import Any, Dict
+import os
+from typing import Any, Dict, Tuple
+
+_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
 
 def _convert_value(value: str) -> Any:
     value = value.strip()
@@ -67,3 +71,16 @@ def load_yaml_config(path: str) -> Dict[str, Any]:
         return _manual_parse(path)
 
 
+def load_yaml_config_cached(path: str) -> Dict[str, Any]:
+    """Load a YAML config once per process, re-reading only when the file's mtime changes.
+
+    The returned object is shared between callers and must be treated as read-only.
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    data = load_yaml_config(key)
+    _CACHE[key] = (mtime, data)
+    return data
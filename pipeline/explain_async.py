@@ -0,0 +1,176 @@
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .explain_fix import (
+    NO_API_KEY_MESSAGE,
+    NO_CLIENT_MESSAGE,
+    Explainer,
+    _fallback_result,
+    _invalid_response,
+    _llm_stats,
+    _normalize_response,
+)
+
+DEADLINE_MESSAGE = "Model response not received before the deadline. Deterministic placeholder patches provided."
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError", "InternalServerError", "RateLimitError"}
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return type(exc).__name__ in RETRYABLE_ERRORS
+
+
+class AsyncExplainer:
+    """Asyncio variant of ``Explainer.explain`` for many concurrent explanation calls.
+
+    One pooled async client is shared by all calls; at most ``max_concurrency`` requests are
+    in flight, each attempt is bounded by ``timeout`` seconds, and 429/5xx/timeout failures are
+    retried with exponential backoff. When ``deadline`` seconds pass for a record it gets the
+    deterministic fallback patches instead.
+    """
+
+    def __init__(
+        self,
+        explainer: Explainer,
+        max_concurrency: int = 32,
+        timeout: float = 30.0,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        deadline: Optional[float] = 120.0,
+        client: Any = None,
+    ) -> None:
+        self.explainer = explainer
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self._client = client
+        self._client_unavailable = False
+        self._semaphores: Dict[Any, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> Any:
+        if self._client is None and not self._client_unavailable:
+            try:
+                from openai import AsyncOpenAI  # type: ignore
+            except Exception:
+                self._client_unavailable = True
+                return None
+            # Retries are handled here so that backoff honours the per-record deadline.
+            self._client = AsyncOpenAI(
+                api_key=self.explainer.api_key,
+                base_url=self.explainer.base_url,
+                timeout=self.timeout,
+                max_retries=0,
+            )
+        return self._client
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the running loop, so keep one per loop.
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            self._semaphores = {loop: asyncio.Semaphore(self.max_concurrency)}
+            semaphore = self._semaphores[loop]
+        return semaphore
+
+    async def _request(self, client: Any, messages: List[Dict[str, str]], timeout: float) -> Tuple[Any, Any]:
+        response = await asyncio.wait_for(
+            client.chat.completions.create(model=self.explainer.model, messages=messages, temperature=0),
+            timeout=timeout,
+        )
+        content = response.choices[0].message.content if response.choices else ""
+        return json.loads(content), response
+
+    async def explain(
+        self,
+        loire: Dict[str, Any],
+        compliance: Dict[str, Any],
+        required_fields: List[str],
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if stats is None:
+            stats = {}
+        explainer = self.explainer
+        findings = compliance.get("findings", [])
+        if not explainer.api_key:
+            stats.update(_llm_stats("fallback"))
+            return _fallback_result(loire, findings, NO_API_KEY_MESSAGE)
+        client = self.client
+        if client is None:
+            stats.update(_llm_stats("fallback"))
+            return _fallback_result(loire, findings, NO_CLIENT_MESSAGE)
+
+        messages, key, prompt_stats = explainer.prepare_request(loire, compliance, required_fields)
+        if key:
+            cached = explainer.cache.get(key)
+            if cached is not None:
+                stats.update(_llm_stats("cache"))
+                return {**cached, "prompt_stats": prompt_stats}
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline if self.deadline is not None else None
+        started = time.perf_counter()
+
+        def timed_out() -> Dict[str, Any]:
+            stats.update(_llm_stats("fallback", started))
+            return _fallback_result(loire, findings, DEADLINE_MESSAGE)
+
+        async with self._semaphore():
+            for attempt in range(self.max_retries + 1):
+                timeout = self.timeout
+                if deadline is not None:
+                    timeout = min(timeout, deadline - loop.time())
+                    if timeout <= 0:
+                        return timed_out()
+                try:
+                    parsed, response = await self._request(client, messages, timeout)
+                except Exception as exc:
+                    if not _is_retryable(exc) or attempt == self.max_retries:
+                        if deadline is not None and loop.time() >= deadline:
+                            return timed_out()
+                        stats.update(_llm_stats("error", started))
+                        return {**_normalize_response(_invalid_response()), "prompt_stats": prompt_stats}
+                    delay = min(self.backoff_max, self.backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+                    if deadline is not None and loop.time() + delay >= deadline:
+                        return timed_out()
+                    await asyncio.sleep(delay)
+                    continue
+
+                result = _normalize_response(parsed)
+                if key:
+                    explainer.cache.put(key, result)
+                stats.update(_llm_stats("llm", started, response))
+                return {**result, "prompt_stats": prompt_stats}
+
+        return _normalize_response(_invalid_response())  # pragma: no cover - loop always returns
+
+    async def explain_many(
+        self,
+        items: Iterable[Tuple[Dict[str, Any], Dict[str, Any], List[str]]],
+        stats: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Explain ``(loire, compliance, required_fields)`` items concurrently, preserving order.
+
+        ``stats``, when given, is a list of dicts (one per item) that receive the LLM stats.
+        """
+
+        items = list(items)
+        per_item = stats if stats is not None else [None] * len(items)
+        return list(await asyncio.gather(*(self.explain(*item, stats=st) for item, st in zip(items, per_item))))
+
+    async def aclose(self) -> None:
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            await close()
+        self._client = None
@@ -0,0 +1,130 @@
+import hashlib
+import json
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .explain_async import AsyncExplainer
+from .explain_fix import Explainer
+
+ExplainItem = Tuple[Dict[str, Any], Dict[str, Any], List[str]]
+
+
+def _get_by_path(data: Dict[str, Any], path: str) -> Any:
+    current = data
+    for part in path.split("."):
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return None
+    return current
+
+
+def _set_by_path(data: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    current = data
+    for part in parts[:-1]:
+        child = current.get(part)
+        if not isinstance(child, dict):
+            child = current[part] = {}
+        current = child
+    current[parts[-1]] = value
+
+
+def finding_signature(loire: Dict[str, Any], findings: List[Dict[str, Any]]) -> str:
+    """Canonical hash of a record's findings and the current values of the fields they name."""
+
+    canonical = sorted(
+        (
+            str(f.get("id")),
+            str(f.get("rule")),
+            str(f.get("field")),
+            json.dumps(_get_by_path(loire, f.get("field") or ""), sort_keys=True, default=str),
+        )
+        for f in findings
+    )
+    return hashlib.sha256(json.dumps(canonical).encode("utf-8")).hexdigest()
+
+
+def plan_groups(items: Sequence[ExplainItem]) -> Dict[str, List[int]]:
+    groups: Dict[str, List[int]] = {}
+    for index, (loire, compliance, _required) in enumerate(items):
+        signature = finding_signature(loire, compliance.get("findings", []))
+        groups.setdefault(signature, []).append(index)
+    return groups
+
+
+def _group_request(item: ExplainItem) -> ExplainItem:
+    # Members of a group only agree on the failing fields, so the shared request must not
+    # show the model anything else it could copy into a patch.
+    loire, compliance, required_fields = item
+    projected: Dict[str, Any] = {}
+    for finding in compliance.get("findings", []):
+        field = finding.get("field")
+        if field:
+            _set_by_path(projected, field, deepcopy(_get_by_path(loire, field)))
+    return projected, compliance, required_fields
+
+
+def _stats(total: int, requests: int, groups: Dict[str, List[int]]) -> Dict[str, Any]:
+    return {
+        "records": total,
+        "llm_requests": requests,
+        "groups": len(groups),
+        "shared_groups": sum(1 for members in groups.values() if len(members) > 1),
+        "dedup_ratio": total / requests if requests else 1.0,
+        "requests_saved": total - requests,
+    }
+
+
+def _scatter(results: List[Any], members: List[int], result: Dict[str, Any]) -> None:
+    results[members[0]] = result
+    for index in members[1:]:
+        results[index] = deepcopy(result)
+
+
+def _scatter_stats(stats: Optional[List[Dict[str, Any]]], members: List[int], call: Dict[str, Any]) -> None:
+    # Every member records the call's source and latency; its tokens are counted once.
+    if stats is None:
+        return
+    stats[members[0]].update(call)
+    for index in members[1:]:
+        stats[index].update({**call, "prompt_tokens": 0, "completion_tokens": 0, "shared": True})
+
+
+def explain_deduplicated(
+    explainer: Explainer, items: Sequence[ExplainItem], stats: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Explain many records with one request per finding signature.
+
+    Records that share a signature get copies of one response made from a projection onto the
+    failing fields; unique records are explained individually with their full document.
+    Returns the per-record results (in input order) and dedup statistics. ``stats``, when
+    given, is a list of dicts (one per item) that receive the LLM stats of the item's request.
+    """
+
+    groups = plan_groups(items)
+    results: List[Any] = [None] * len(items)
+    for members in groups.values():
+        item = items[members[0]] if len(members) == 1 else _group_request(items[members[0]])
+        call: Dict[str, Any] = {}
+        _scatter(results, members, explainer.explain(*item, stats=call))
+        _scatter_stats(stats, members, call)
+    return results, _stats(len(items), len(groups), groups)
+
+
+async def aexplain_deduplicated(
+    explainer: AsyncExplainer, items: Sequence[ExplainItem], stats: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Asyncio variant of ``explain_deduplicated``; group requests run concurrently."""
+
+    groups = plan_groups(items)
+    requests = [
+        items[members[0]] if len(members) == 1 else _group_request(items[members[0]]) for members in groups.values()
+    ]
+    calls: List[Dict[str, Any]] = [{} for _ in requests]
+    responses = await explainer.explain_many(requests, stats=calls)
+    results: List[Any] = [None] * len(items)
+    for members, response, call in zip(groups.values(), responses, calls):
+        _scatter(results, members, response)
+        _scatter_stats(stats, members, call)
+    return results, _stats(len(items), len(groups), groups)
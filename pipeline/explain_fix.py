@@ -1,6 +1,7 @@
 import json
 import os
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 try:
     from dotenv import load_dotenv
@@ -8,6 +9,12 @@ except ImportError:  # pragma: no cover - optional dependency
     def load_dotenv() -> bool:  # type: ignore
         return False
 
+from .llm_cache import LLMCache, cache_key
+from .patch_stream import IncrementalPatchParser
+from .prompt_builder import DEFAULT_TOKEN_BUDGET, build_user_content
+
+DEFAULT_MODEL = "gpt-4.1"
+
 DEFAULT_EXPLANATION = {
     "explanation": {"critical": [], "major": [], "minor": []},
     "patches": [],
@@ -15,6 +22,15 @@ DEFAULT_EXPLANATION = {
 }
 
 
+def _default_explanation() -> Dict[str, Any]:
+    # Fresh nested lists per call; a shallow copy of DEFAULT_EXPLANATION would share them across records.
+    return {
+        "explanation": {"critical": [], "major": [], "minor": []},
+        "patches": [],
+        "questions": [],
+    }
+
+
 def _fallback_patches(loire: Dict[str, Any], findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     patches: List[Dict[str, Any]] = []
     for finding in findings:
@@ -56,59 +72,42 @@ def _validate_patch_list(patches: Any) -> List[Dict[str, Any]]:
     return validated
 
 
-def generate_explanation_and_patches(loire: Dict[str, Any], compliance: Dict[str, Any], required_fields: List[str], prompts_dir: str) -> Dict[str, Any]:
-    load_dotenv()
-    api_key = os.getenv("OPENAI_API_KEY")
-    model = os.getenv("OPENAI_MODEL", "gpt-4.1")
-    base_url = os.getenv("OPENAI_BASE_URL")
+NO_API_KEY_MESSAGE = "Set OPENAI_API_KEY to enable LLM-based explanations. Deterministic placeholder patches provided."
+NO_CLIENT_MESSAGE = "OpenAI client not installed. Install openai or set OPENAI_API_KEY."
+INVALID_RESPONSE_MESSAGE = "Model response invalid or unavailable. No patches applied."
+INCOMPLETE_STREAM_MESSAGE = "Model response ended early. Only patches received before the error are included."
 
-    if not api_key:
-        fallback = DEFAULT_EXPLANATION.copy()
-        findings = compliance.get("findings", [])
-        fallback["explanation"]["minor"].append(
-            "Set OPENAI_API_KEY to enable LLM-based explanations. Deterministic placeholder patches provided."
-        )
-        fallback["patches"] = _fallback_patches(loire, findings)
-        return fallback
-
-    try:
-        from openai import OpenAI  # type: ignore
-    except Exception:
-        fallback = DEFAULT_EXPLANATION.copy()
-        fallback["explanation"]["minor"].append(
-            "OpenAI client not installed. Install openai or set OPENAI_API_KEY."
-        )
-        fallback["patches"] = _fallback_patches(loire, compliance.get("findings", []))
-        return fallback
 
-    system_prompt = _load_prompt(os.path.join(prompts_dir, "system_prompt.txt"))
-    fix_prompt = _load_prompt(os.path.join(prompts_dir, "fix_prompt.txt"))
+def _fallback_result(loire: Dict[str, Any], findings: List[Dict[str, Any]], message: str) -> Dict[str, Any]:
+    fallback = _default_explanation()
+    fallback["explanation"]["minor"].append(message)
+    fallback["patches"] = _fallback_patches(loire, findings)
+    return fallback
+
 
-    client = OpenAI(api_key=api_key, base_url=base_url)
+def _llm_stats(source: str, started: Optional[float] = None, response: Any = None) -> Dict[str, Any]:
+    """Where an explanation came from (llm, cache, fallback or error), LLM latency and token usage."""
 
-    user_content = {
-        "loire": loire,
-        "findings": compliance.get("findings", []),
-        "required_fields": required_fields,
-        "instructions": fix_prompt,
+    usage = getattr(response, "usage", None)
+    return {
+        "source": source,
+        "latency_s": round(time.perf_counter() - started, 6) if started is not None else 0.0,
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
     }
 
-    try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(user_content)},
-            ],
-            temperature=0,
-        )
-        content = response.choices[0].message.content if response.choices else ""
-        parsed = json.loads(content)
-    except Exception:
-        parsed = DEFAULT_EXPLANATION.copy()
-        parsed["explanation"]["minor"].append("Model response invalid or unavailable. No patches applied.")
 
-    explanation = parsed.get("explanation", DEFAULT_EXPLANATION["explanation"])
+def _invalid_response() -> Dict[str, Any]:
+    parsed = _default_explanation()
+    parsed["explanation"]["minor"].append(INVALID_RESPONSE_MESSAGE)
+    return parsed
+
+
+def _normalize_response(parsed: Any) -> Dict[str, Any]:
+    if not isinstance(parsed, dict):
+        parsed = _invalid_response()
+
+    explanation = parsed.get("explanation", _default_explanation()["explanation"])
     patches = _validate_patch_list(parsed.get("patches", []))
     questions = parsed.get("questions", []) if isinstance(parsed.get("questions", []), list) else []
 
@@ -121,3 +120,234 @@ def generate_explanation_and_patches(loire: Dict[str, Any], compliance: Dict[str
         "patches": patches,
         "questions": questions,
     }
+
+
+class Explainer:
+    """Prompts, model settings and a single shared LLM client for the explanation stage."""
+
+    def __init__(
+        self,
+        system_prompt: str,
+        fix_prompt: str,
+        api_key: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        base_url: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+    ) -> None:
+        self.system_prompt = system_prompt
+        self.fix_prompt = fix_prompt
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.cache = cache
+        self.token_budget = token_budget
+        self._client: Any = None
+        self._client_unavailable = False
+
+    @classmethod
+    def from_env(cls, prompts_dir: str) -> "Explainer":
+        load_dotenv()
+        return cls(
+            _load_prompt(os.path.join(prompts_dir, "system_prompt.txt")),
+            _load_prompt(os.path.join(prompts_dir, "fix_prompt.txt")),
+            api_key=os.getenv("OPENAI_API_KEY"),
+            model=os.getenv("OPENAI_MODEL", DEFAULT_MODEL),
+            base_url=os.getenv("OPENAI_BASE_URL"),
+            cache=LLMCache.from_env(),
+            token_budget=int(os.getenv("DCC_PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)),
+        )
+
+    def with_prompts(self, system_prompt: str, fix_prompt: str) -> "Explainer":
+        """Return an explainer with new prompts that keeps this one's settings and client."""
+
+        explainer = Explainer(
+            system_prompt,
+            fix_prompt,
+            api_key=self.api_key,
+            model=self.model,
+            base_url=self.base_url,
+            cache=self.cache,
+            token_budget=self.token_budget,
+        )
+        explainer._client = self._client
+        explainer._client_unavailable = self._client_unavailable
+        return explainer
+
+    @property
+    def client(self) -> Any:
+        if self._client is None and not self._client_unavailable:
+            try:
+                from openai import OpenAI  # type: ignore
+            except Exception:
+                self._client_unavailable = True
+                return None
+            self._client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        return self._client
+
+    @property
+    def uses_llm(self) -> bool:
+        """Whether explanations come from the model rather than the fallback without an API key or client."""
+
+        return bool(self.api_key) and self.client is not None
+
+    def prepare_request(
+        self, loire: Dict[str, Any], compliance: Dict[str, Any], required_fields: List[str]
+    ) -> Tuple[List[Dict[str, str]], str, Dict[str, Any]]:
+        """Return the chat messages, their cache key (or an empty string) and prompt size stats.
+
+        The Loire document is projected onto the fields the findings and required fields
+        reference (see ``prompt_builder``); patch paths still address the full document.
+        """
+
+        findings = compliance.get("findings", [])
+        content, projected, stats = build_user_content(
+            loire, findings, required_fields, self.fix_prompt, self.system_prompt, self.token_budget
+        )
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": content},
+        ]
+        key = ""
+        if self.cache is not None:
+            key = cache_key(projected, findings, required_fields, self.system_prompt, self.fix_prompt, self.model)
+        return messages, key, stats
+
+    def build_messages(self, loire: Dict[str, Any], compliance: Dict[str, Any], required_fields: List[str]) -> List[Dict[str, str]]:
+        return self.prepare_request(loire, compliance, required_fields)[0]
+
+    def explain(
+        self,
+        loire: Dict[str, Any],
+        compliance: Dict[str, Any],
+        required_fields: List[str],
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Explanation and patches for ``loire``; ``stats``, when given, receives ``_llm_stats``."""
+
+        if stats is None:
+            stats = {}
+        findings = compliance.get("findings", [])
+        if not self.api_key:
+            stats.update(_llm_stats("fallback"))
+            return _fallback_result(loire, findings, NO_API_KEY_MESSAGE)
+
+        client = self.client
+        if client is None:
+            stats.update(_llm_stats("fallback"))
+            return _fallback_result(loire, findings, NO_CLIENT_MESSAGE)
+
+        messages, key, prompt_stats = self.prepare_request(loire, compliance, required_fields)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                stats.update(_llm_stats("cache"))
+                return {**cached, "prompt_stats": prompt_stats}
+
+        started = time.perf_counter()
+        response = None
+        try:
+            response = client.chat.completions.create(model=self.model, messages=messages, temperature=0)
+            content = response.choices[0].message.content if response.choices else ""
+            parsed = json.loads(content)
+        except Exception:
+            # Failures are not cached so the next run retries the model.
+            stats.update(_llm_stats("error", started, response))
+            return {**_normalize_response(_invalid_response()), "prompt_stats": prompt_stats}
+
+        stats.update(_llm_stats("llm", started, response))
+        result = _normalize_response(parsed)
+        if key:
+            self.cache.put(key, result)
+        return {**result, "prompt_stats": prompt_stats}
+
+    def stream_explain(
+        self,
+        loire: Dict[str, Any],
+        compliance: Dict[str, Any],
+        required_fields: List[str],
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Like ``explain`` but with a streamed completion.
+
+        Yields ``{"type": "patch", "patch", "elapsed"}`` for each patch as soon as the model has
+        finished writing it (validated with ``_validate_patch_list`` rules), then a final
+        ``{"type": "result", "result"}`` holding what ``explain`` would have returned.
+        """
+
+        if stats is None:
+            stats = {}
+        started = time.perf_counter()
+        findings = compliance.get("findings", [])
+        result: Optional[Dict[str, Any]] = None
+        if not self.api_key:
+            result = _fallback_result(loire, findings, NO_API_KEY_MESSAGE)
+        elif self.client is None:
+            result = _fallback_result(loire, findings, NO_CLIENT_MESSAGE)
+        if result is not None:
+            for patch in result["patches"]:
+                yield {"type": "patch", "patch": patch, "elapsed": time.perf_counter() - started}
+            stats.update(_llm_stats("fallback"))
+            yield {"type": "result", "result": result}
+            return
+
+        messages, key, prompt_stats = self.prepare_request(loire, compliance, required_fields)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                for patch in cached["patches"]:
+                    yield {"type": "patch", "patch": patch, "elapsed": time.perf_counter() - started}
+                stats.update(_llm_stats("cache"))
+                yield {"type": "result", "result": {**cached, "prompt_stats": prompt_stats}}
+                return
+
+        parser = IncrementalPatchParser()
+        streamed: List[Dict[str, Any]] = []
+        requested = time.perf_counter()
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model, messages=messages, temperature=0, stream=True
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                for patch in _validate_patch_list(parser.feed(delta)):
+                    streamed.append(patch)
+                    yield {"type": "patch", "patch": patch, "elapsed": time.perf_counter() - started}
+            parsed = parser.result()
+        except Exception:
+            invalid = _invalid_response()
+            if streamed:
+                # Patches already handed out stay valid even if the tail of the response is not.
+                invalid["explanation"]["minor"] = [INCOMPLETE_STREAM_MESSAGE]
+                invalid["patches"] = streamed
+            stats.update(_llm_stats("error", requested))
+            yield {"type": "result", "result": {**_normalize_response(invalid), "prompt_stats": prompt_stats}}
+            return
+
+        result = _normalize_response(parsed)
+        if key:
+            self.cache.put(key, result)
+        stats.update(_llm_stats("llm", requested))
+        yield {"type": "result", "result": {**result, "prompt_stats": prompt_stats}}
+
+
+_EXPLAINERS: Dict[str, Tuple[Tuple[int, int], Explainer]] = {}
+
+
+def _prompt_mtimes(prompts_dir: str) -> Tuple[int, int]:
+    return (
+        os.stat(os.path.join(prompts_dir, "system_prompt.txt")).st_mtime_ns,
+        os.stat(os.path.join(prompts_dir, "fix_prompt.txt")).st_mtime_ns,
+    )
+
+
+def generate_explanation_and_patches(loire: Dict[str, Any], compliance: Dict[str, Any], required_fields: List[str], prompts_dir: str) -> Dict[str, Any]:
+    key = os.path.abspath(prompts_dir)
+    mtimes = _prompt_mtimes(key)
+    cached = _EXPLAINERS.get(key)
+    if cached is None or cached[0] != mtimes:
+        cached = (mtimes, Explainer.from_env(key))
+        _EXPLAINERS[key] = cached
+    return cached[1].explain(loire, compliance, required_fields)
@@ -0,0 +1,302 @@
+"""Columnar export of batch compliance results for catalog-wide analytics.
+
+One row per (record, stage, failed rule), with the record's score and status at that stage;
+a record without findings at a stage gets a single row with an empty ``rule_id``, and a record
+that errored gets one ``stage="error"`` row. Written as Parquet or Arrow IPC when ``pyarrow``
+is installed, otherwise as a directory of typed ``array`` column files with string
+dictionaries in ``manifest.json``. Both the Arrow IPC file and the column directory can be
+memory-mapped, so a question such as "how many records fail R3" reads only the ``rule_id``
+and ``stage`` columns::
+
+    python -m pipeline.findings_export outputs/ findings.parquet
+    python -m pipeline.findings_export outputs/ findings_columns --format columns
+"""
+import argparse
+import array
+import json
+import mmap
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None  # type: ignore
+    pa_ipc = None  # type: ignore
+    pq = None  # type: ignore
+
+from .report import ARTIFACT_FILES
+
+EXPORT_FORMATS = ("auto", "parquet", "arrow", "columns")
+MANIFEST = "manifest.json"
+CHUNK_ROWS = 65536
+# (name, kind, array typecode): ints are stored as-is (None as -1), strings as dictionary codes.
+COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ("record", "int", "q"),
+    ("run_id", "str", "I"),
+    ("dataset_id", "str", "I"),
+    ("stage", "str", "I"),
+    ("rule_id", "str", "I"),
+    ("severity", "str", "I"),
+    ("field", "str", "I"),
+    ("score", "int", "h"),
+    ("status", "str", "I"),
+)
+COLUMN_NAMES = tuple(name for name, _, _ in COLUMNS)
+
+Row = Tuple[Any, ...]
+
+
+def finding_rows(result: Dict[str, Any], record: Optional[int] = None) -> Iterator[Row]:
+    """The export rows of one pipeline result, in ``COLUMN_NAMES`` order."""
+
+    if record is None:
+        record = result.get("index", -1)
+    run_id = result.get("run_id")
+    dataset = result.get("dataset_id")
+    if result.get("status") == "error":
+        yield (record, run_id, dataset, "error", None, None, None, None, "error")
+        return
+    for stage, key in (("before", "compliance_before"), ("after", "compliance_after")):
+        compliance = result.get(key)
+        if not compliance:
+            continue
+        score = compliance.get("score")
+        status = compliance.get("overall_status")
+        findings = compliance.get("findings") or [None]
+        for finding in findings:
+            if finding is None:
+                yield (record, run_id, dataset, stage, None, None, None, score, status)
+            else:
+                yield (
+                    record, run_id, dataset, stage,
+                    finding.get("id"), finding.get("severity"), finding.get("field"), score, status,
+                )
+
+
+def iter_output_results(output_root: str) -> Iterator[Dict[str, Any]]:
+    """Rebuild minimal results from the ``run_*`` report directories under ``output_root``."""
+
+    for index, name in enumerate(sorted(os.listdir(output_root))):
+        run_dir = os.path.join(output_root, name)
+        before_path = os.path.join(run_dir, ARTIFACT_FILES["compliance_before"])
+        if not os.path.isfile(before_path):
+            continue
+        result: Dict[str, Any] = {"index": index, "run_id": name, "status": "ok"}
+        for key in ("compliance_before", "compliance_after"):
+            path = os.path.join(run_dir, ARTIFACT_FILES[key])
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as f:
+                    result[key] = json.load(f)
+        yield result
+
+
+def _chunks(results: Iterable[Dict[str, Any]], chunk_rows: int) -> Iterator[List[Row]]:
+    chunk: List[Row] = []
+    for record, result in enumerate(results):
+        chunk.extend(finding_rows(result, result.get("index", record)))
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_columns(chunks: Iterable[List[Row]], path: str) -> int:
+    os.makedirs(path, exist_ok=True)
+    dictionaries: List[Dict[Any, int]] = [{} for _ in COLUMNS]
+    files = [open(os.path.join(path, f"{name}.bin"), "wb") for name in COLUMN_NAMES]
+    rows = 0
+    try:
+        for chunk in chunks:
+            for position, (_, kind, typecode) in enumerate(COLUMNS):
+                values = [row[position] for row in chunk]
+                if kind == "int":
+                    column = array.array(typecode, (-1 if value is None else value for value in values))
+                else:
+                    codes = dictionaries[position]
+                    column = array.array(typecode, (codes.setdefault(value, len(codes)) for value in values))
+                column.tofile(files[position])
+            rows += len(chunk)
+    finally:
+        for f in files:
+            f.close()
+
+    manifest = {
+        "format": "dcc-findings-columns",
+        "version": 1,
+        "rows": rows,
+        "byteorder": sys.byteorder,
+        "columns": {
+            name: {
+                "kind": kind,
+                "typecode": typecode,
+                "itemsize": array.array(typecode).itemsize,
+                **({"dictionary": list(dictionaries[position])} if kind == "str" else {}),
+            }
+            for position, (name, kind, typecode) in enumerate(COLUMNS)
+        },
+    }
+    with open(os.path.join(path, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return rows
+
+
+def _arrow_schema() -> Any:
+    types = {"int": pa.int64(), "str": pa.string()}
+    return pa.schema([(name, pa.int16() if typecode == "h" else types[kind]) for name, kind, typecode in COLUMNS])
+
+
+def _write_arrow(chunks: Iterable[List[Row]], path: str, fmt: str) -> int:
+    schema = _arrow_schema()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if fmt == "parquet":
+        writer: Any = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa_ipc.new_file(path, schema)
+    rows = 0
+    try:
+        for chunk in chunks:
+            columns = [pa.array([row[position] for row in chunk], type=schema.field(position).type)
+                       for position in range(len(COLUMNS))]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+
+def export_findings(
+    results: Iterable[Dict[str, Any]], path: str, fmt: str = "auto", chunk_rows: int = CHUNK_ROWS
+) -> Dict[str, Any]:
+    """Write ``results`` (e.g. from ``run_pipeline_batch``) in a columnar layout; streams in chunks.
+
+    ``fmt="auto"`` picks Parquet when ``pyarrow`` is installed and the column directory otherwise.
+    """
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+    if fmt == "auto":
+        fmt = "parquet" if pa is not None else "columns"
+    chunks = _chunks(results, chunk_rows)
+    if fmt == "columns":
+        rows = _write_columns(chunks, path)
+    elif pa is None:
+        raise ImportError(f"Export format {fmt!r} needs pyarrow; install it or use fmt='columns'")
+    else:
+        rows = _write_arrow(chunks, path, fmt)
+    return {"path": path, "format": fmt, "rows": rows}
+
+
+class FindingsColumns:
+    """Read-only, memory-mapped view of a column directory written by ``export_findings``."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{path} was written on a {self.manifest.get('byteorder')}-endian machine")
+        self.rows: int = self.manifest["rows"]
+        self._maps: Dict[str, Any] = {}
+        self._views: Dict[str, memoryview] = {}
+
+    def dictionary(self, name: str) -> List[Any]:
+        return self.manifest["columns"][name].get("dictionary", [])
+
+    def raw(self, name: str) -> memoryview:
+        """The stored integers (values or dictionary codes) of one column, without copying.
+
+        The view is released by ``close``; copy what is needed beyond that (``list(view)``).
+        """
+
+        spec = self.manifest["columns"][name]
+        if array.array(spec["typecode"]).itemsize != spec["itemsize"]:
+            raise ValueError(f"Column {name} uses {spec['itemsize']}-byte items, not supported here")
+        if not self.rows:
+            return memoryview(array.array(spec["typecode"]))
+        if name not in self._views:
+            with open(os.path.join(self.path, f"{name}.bin"), "rb") as f:
+                self._maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            base = memoryview(self._maps[name])
+            self._views[name] = base.cast(spec["typecode"])
+            base.release()
+        return self._views[name]
+
+    def column(self, name: str) -> List[Any]:
+        """One column decoded to Python values (strings for dictionary columns, None for missing)."""
+
+        values = self.raw(name)
+        if self.manifest["columns"][name]["kind"] == "str":
+            dictionary = self.dictionary(name)
+            return [dictionary[code] for code in values]
+        return [None if value == -1 else value for value in values]
+
+    def code(self, name: str, value: Any) -> Optional[int]:
+        try:
+            return self.dictionary(name).index(value)
+        except ValueError:
+            return None
+
+    def count_failing(self, rule_id: str, stage: str = "after") -> int:
+        """Number of records failing ``rule_id`` at ``stage``, reading only two columns."""
+
+        rule_code, stage_code = self.code("rule_id", rule_id), self.code("stage", stage)
+        if rule_code is None or stage_code is None:
+            return 0
+        return sum(1 for r, s in zip(self.raw("rule_id"), self.raw("stage")) if r == rule_code and s == stage_code)
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        for mapped in self._maps.values():
+            try:
+                mapped.close()
+            except BufferError:
+                # A caller still holds a slice of a view; the map is unmapped once that is dropped.
+                pass
+        self._views = {}
+        self._maps = {}
+
+    def __enter__(self) -> "FindingsColumns":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def count_failing(path: str, rule_id: str, stage: str = "after") -> int:
+    """Records failing ``rule_id`` at ``stage`` in an export of any format."""
+
+    if os.path.isdir(path):
+        with FindingsColumns(path) as table:
+            return table.count_failing(rule_id, stage)
+    if pa is None:
+        raise ImportError("Reading Parquet or Arrow exports needs pyarrow")
+    import pyarrow.compute as pc
+
+    if path.endswith(".parquet"):
+        table = pq.read_table(path, columns=["rule_id", "stage"], memory_map=True)
+    else:
+        table = pa_ipc.open_file(pa.memory_map(path)).read_all().select(["rule_id", "stage"])
+    mask = pc.and_(pc.equal(table["rule_id"], rule_id), pc.equal(table["stage"], stage))
+    return int(pc.sum(mask).as_py() or 0)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export findings from run output directories in a columnar layout.")
+    parser.add_argument("output_root", help="directory holding run_* report directories")
+    parser.add_argument("path", help="destination file (.parquet/.arrow) or directory (columns)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="auto")
+    args = parser.parse_args(argv)
+
+    summary = export_findings(iter_output_results(args.output_root), args.path, fmt=args.format)
+    print(f"Wrote {summary['rows']:,} rows to {summary['path']} ({summary['format']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Deterministic fixers tried before the LLM.
+
+A fixer is registered per rule type and turns a candidate value into a repaired one (or
+``None``). Candidates are the field's current value followed by the field's variants in the
+input record (``FIELD_VARIANTS``); the first repaired candidate that passes the rule's own
+check becomes an ``add`` patch.
+"""
+import datetime as dt
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .compliance import RuleSet, _compile_path
+
+Fixer = Callable[[Any, Any], Any]
+FIXERS: Dict[str, Fixer] = {}
+
+# Where else a Loire field's value may sit in a Health DCAT-AP record, in order of preference.
+FIELD_VARIANTS: Dict[str, Tuple[str, ...]] = {
+    "title": ("datasetTitle", "title", "dct:title", "dcterms:title", "name"),
+    "description": ("description", "dct:description", "dcterms:description", "abstract"),
+    "contact.email": ("contactPoint.email", "contactPoint.hasEmail", "contactPoint.vcard:hasEmail", "contactEmail"),
+    "keywords": ("keywords", "keyword", "dcat:keyword", "tags"),
+    "license": ("license", "dct:license", "dcterms:license"),
+    "landing_page": ("landingPage", "dcat:landingPage", "homepage"),
+    "issued": ("issued", "dct:issued", "dcterms:issued"),
+}
+
+# Loire fields holding lists; a missing one is filled with a list, not a single value.
+LIST_FIELDS = frozenset({"keywords"})
+
+_ANGLE_EMAIL = re.compile(r"<([^<>\s]+@[^<>\s]+)>")
+_BARE_HOST = re.compile(r"^(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,}(?::\d+)?(?:[/?#]\S*)?$", re.IGNORECASE)
+_DATE_FORMATS = ("%Y/%m/%d", "%Y.%m.%d", "%Y%m%d", "%d.%m.%Y")
+
+
+def register_fixer(name: str) -> Callable[[Fixer], Fixer]:
+    def decorator(fixer: Fixer) -> Fixer:
+        FIXERS[name] = fixer
+        return fixer
+
+    return decorator
+
+
+def _text(value: Any) -> Optional[str]:
+    """A plain string from a string, a language map or a list of JSON-LD value objects."""
+
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, dict):
+        for key in ("en", "@value"):
+            if key in value:
+                return _text(value[key])
+        return next((text for text in map(_text, value.values()) if text), None)
+    if isinstance(value, list):
+        return next((text for text in map(_text, value) if text), None)
+    return None
+
+
+@register_fixer("required")
+def _fix_required(candidate: Any, current: Any) -> Any:
+    if isinstance(current, list):
+        items = candidate if isinstance(candidate, list) else str(candidate).split(",")
+        texts = [text for text in map(_text, items) if text]
+        return texts or None
+    if isinstance(candidate, list):
+        # A list of several values keeps its shape instead of collapsing to the first one.
+        texts = [text for text in map(_text, candidate) if text]
+        if len(texts) > 1:
+            return texts
+    return _text(candidate)
+
+
+@register_fixer("format:email")
+def _fix_email(candidate: Any, current: Any) -> Optional[str]:
+    text = _text(candidate)
+    if text is None:
+        return None
+    match = _ANGLE_EMAIL.search(text)
+    if match:
+        text = match.group(1)
+    if text.lower().startswith("mailto:"):
+        text = text[len("mailto:"):]
+    for marker in ("[at]", "(at)"):
+        text = text.replace(marker, "@")
+    return "".join(text.split()).lower()
+
+
+@register_fixer("format:url")
+def _fix_url(candidate: Any, current: Any) -> Optional[str]:
+    text = _text(candidate)
+    if text is None:
+        return None
+    if text.startswith("//"):
+        return "https:" + text
+    if "://" not in text and _BARE_HOST.match(text):
+        return "https://" + text
+    return text
+
+
+@register_fixer("format:date")
+def _fix_date(candidate: Any, current: Any) -> Optional[str]:
+    text = _text(candidate)
+    if text is None:
+        return None
+    for fmt in _DATE_FORMATS:
+        try:
+            return dt.datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text
+
+
+class FixerSet:
+    """The registered fixers bound to a rule set, with the variant lookups compiled once."""
+
+    def __init__(self, ruleset: RuleSet, variants: Optional[Dict[str, Tuple[str, ...]]] = None) -> None:
+        self.rules = {rule.id: rule for rule in ruleset.rules if rule.rule in FIXERS}
+        variants = FIELD_VARIANTS if variants is None else variants
+        self.variants = {field: tuple(map(_compile_path, paths)) for field, paths in variants.items()}
+
+    def patches(
+        self, loire: Dict[str, Any], findings: List[Dict[str, Any]], source: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Patches for the findings a fixer can resolve; the others are left for the LLM."""
+
+        patches: List[Dict[str, Any]] = []
+        fixed: Dict[str, Any] = {}
+        for finding in findings:
+            rule = self.rules.get(finding.get("id"))
+            if rule is None or rule.field != finding.get("field"):
+                continue
+            current = fixed.get(rule.field, rule.get(loire))
+            if rule.field in fixed and rule.check(current):
+                continue
+            candidates = [current]
+            if source is not None:
+                candidates.extend(get(source) for get in self.variants.get(rule.field, ()))
+            for candidate in candidates:
+                if candidate in (None, "", [], {}):
+                    continue
+                shape = [] if current is None and rule.field in LIST_FIELDS else current
+                value = FIXERS[rule.rule](candidate, shape)
+                if value is not None and value != current and rule.check(value):
+                    fixed[rule.field] = value
+                    patches.append({"op": "add", "path": "/" + rule.field.replace(".", "/"), "value": value})
+                    break
+        return patches
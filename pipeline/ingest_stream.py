@@ -0,0 +1,193 @@
+import codecs
+import json
+import re
+from collections import deque
+from typing import IO, Any, Deque, Dict, Iterator, Optional, Tuple, Union
+
+from .batch import run_pipeline_batch
+
+CHUNK_SIZE = 64 * 1024
+MAX_RECORD_BYTES = 16 * 1024 * 1024
+
+# Strings (possibly unterminated at the end of the buffer), brackets and commas are all the
+# array splitter needs to find element boundaries; scalars are skipped over.
+_TOKEN_RE = re.compile(r'(?P<str>"(?:[^"\\]|\\.)*")|(?P<open>"(?:[^"\\]|\\.)*\\?\Z)|[\[\]{},]')
+
+Source = Union[str, IO[bytes]]
+
+
+def _open(source: Source) -> Tuple[IO[bytes], bool]:
+    if isinstance(source, str):
+        return open(source, "rb"), True
+    return source, False
+
+
+def _peek_format(handle: IO[bytes]) -> str:
+    peek = getattr(handle, "peek", None)
+    head = peek(64) if peek else b""
+    if not head and hasattr(handle, "seek"):
+        pos = handle.tell()
+        head = handle.read(64)
+        handle.seek(pos)
+    head = head.lstrip(codecs.BOM_UTF8).lstrip()
+    return "array" if head[:1] == b"[" else "ndjson"
+
+
+def iter_ndjson(handle: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    offset = 0
+    for lineno, line in enumerate(handle, start=1):
+        start = offset
+        offset += len(line)
+        if lineno == 1:
+            line = line.lstrip(codecs.BOM_UTF8)
+        if not line.strip():
+            continue
+        try:
+            yield {"offset": start, "record": json.loads(line)}
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            yield {"offset": start, "error": f"Malformed JSON on line {lineno}: {exc}"}
+
+
+def iter_json_array(
+    handle: IO[bytes], chunk_size: int = CHUNK_SIZE, max_record_bytes: int = MAX_RECORD_BYTES
+) -> Iterator[Dict[str, Any]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    mark = [0, 0]  # (buffer index, byte offset) of the last reported position; only moves forward
+    pos = 0  # start of the element being scanned
+    scan_pos = 0  # where scanning for the element end resumes
+    depth = 0
+    opened = False
+    eof = False
+
+    def byte_offset(index: int) -> int:
+        mark[1] += len(buffer[mark[0]:index].encode("utf-8"))
+        mark[0] = index
+        return mark[1]
+
+    while True:
+        if not opened:
+            stripped = buffer.lstrip()
+            if stripped:
+                if stripped[0] != "[":
+                    yield {"offset": byte_offset(0), "error": "Expected a JSON array"}
+                    return
+                pos = scan_pos = len(buffer) - len(stripped) + 1
+                opened = True
+                continue
+        else:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            scan_pos = max(scan_pos, pos)
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            end = None
+            incomplete = False
+            for match in _TOKEN_RE.finditer(buffer, scan_pos):
+                if match.group("str"):
+                    continue
+                if match.group("open"):
+                    incomplete = True
+                    scan_pos = match.start()
+                    break
+                token = match.group()
+                if token in "[{":
+                    depth += 1
+                elif token in "]}":
+                    if depth == 0:
+                        end = match.start()
+                        break
+                    depth -= 1
+                elif depth == 0:
+                    end = match.start()
+                    break
+            if end is not None:
+                text = buffer[pos:end]
+                try:
+                    yield {"offset": byte_offset(pos), "record": json.loads(text)}
+                except json.JSONDecodeError as exc:
+                    yield {"offset": byte_offset(pos), "error": f"Malformed JSON array element: {exc}"}
+                pos = scan_pos = end
+                depth = 0
+                if pos > chunk_size:
+                    byte_offset(pos)
+                    buffer = buffer[pos:]
+                    pos = scan_pos = mark[0] = 0
+                continue
+            if not incomplete:
+                scan_pos = len(buffer)
+            if len(buffer) - pos > max_record_bytes:
+                yield {"offset": byte_offset(pos), "error": "Array element exceeds the maximum record size"}
+                return
+
+        if eof:
+            if opened and buffer[pos:].strip():
+                yield {"offset": byte_offset(pos), "error": "Truncated JSON array"}
+            elif not opened:
+                yield {"offset": 0, "error": "Empty input"}
+            return
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            eof = True
+            buffer += decoder.decode(b"", final=True)
+        else:
+            buffer += decoder.decode(chunk)
+
+
+def iter_records(source: Source, fmt: str = "auto") -> Iterator[Dict[str, Any]]:
+    """Yield ``{"offset", "record"}`` or ``{"offset", "error"}`` items from NDJSON or a JSON array.
+
+    Only one record (plus one read chunk) is held in memory at a time.
+    """
+
+    handle, owned = _open(source)
+    try:
+        if fmt == "auto":
+            fmt = _peek_format(handle)
+        if fmt == "array":
+            yield from iter_json_array(handle)
+        elif fmt == "ndjson":
+            yield from iter_ndjson(handle)
+        else:
+            raise ValueError(f"Unsupported format: {fmt}")
+    finally:
+        if owned:
+            handle.close()
+
+
+def stream_pipeline(
+    source: Source,
+    fmt: str = "auto",
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    output_root: Optional[str] = None,
+    ordered: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Run every record of a catalog export through the pipeline, yielding one result per record.
+
+    Results carry the record's byte ``offset`` in the source. Malformed entries are yielded as
+    ``{"status": "error", ...}`` results and do not stop the stream.
+    """
+
+    offsets: Dict[int, int] = {}
+    errors: Deque[Dict[str, Any]] = deque()
+
+    def _records() -> Iterator[Dict[str, Any]]:
+        index = 0
+        for item in iter_records(source, fmt=fmt):
+            if "error" in item:
+                errors.append({"status": "error", "error": item["error"], "offset": item["offset"]})
+                continue
+            offsets[index] = item["offset"]
+            index += 1
+            yield item["record"]
+
+    for result in run_pipeline_batch(
+        _records(), workers=workers, output_root=output_root, ordered=ordered, max_in_flight=max_in_flight
+    ):
+        while errors:
+            yield errors.popleft()
+        result["offset"] = offsets.pop(result["index"])
+        yield result
+    while errors:
+        yield errors.popleft()
@@ -1,7 +1,9 @@
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from .models import ValidationResult
+
 
 REQUIRED_FIELDS = [
     "datasetTitle",
@@ -16,6 +18,10 @@ REQUIRED_FIELDS = [
 EMAIL_REGEX = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 PHONE_REGEX = re.compile(r"\+?\d[\d\-\s]{7,}\d")
 LONG_ID_REGEX = re.compile(r"\b\d{10,}\b")
+PII_TERMS = ("patient", "dob", "ssn", "social security")
+# Same hits as PHONE_REGEX (its leading "+" is optional) but starts with a digit class,
+# which lets the regex engine skip ahead; any LONG_ID_REGEX hit is also a hit here.
+_DIGIT_RUN = re.compile(r"\d[\d\-\s]{7,}\d")
 SAFE_PATHS = {
     "issued",
     "contactPoint.email",
@@ -43,32 +49,59 @@ def _get_by_path(data: Dict[str, Any], path: str) -> Any:
     return current
 
 
+def _render_path(node: Optional[Tuple[Any, Any, bool]]) -> Any:
+    segments = []
+    while node is not None:
+        node, key, is_index = node
+        segments.append((key, is_index))
+    path: Any = ""
+    for key, is_index in reversed(segments):
+        if is_index:
+            path = f"{path}[{key}]"
+        else:
+            path = f"{path}.{key}" if path else key
+    return path
+
+
 def detect_pii(data: Any) -> List[str]:
+    """Return the paths of strings that look like PII/PHI, in document order.
+
+    The tree is walked iteratively. Each string gets one lowercase term scan, an ``@``
+    probe and one ``_DIGIT_RUN`` search; paths are only rendered for strings that hit.
+    """
+
     matches: List[str] = []
+    # Each entry is (value, path node); a path node is (parent node, key, is_index) or None.
+    stack: List[Tuple[Any, Optional[Tuple[Any, Any, bool]]]] = [(data, None)]
+    digit_run = _DIGIT_RUN.search
 
-    def _scan(value: Any, path: str = "") -> None:
-        if isinstance(value, dict):
-            for k, v in value.items():
-                _scan(v, f"{path}.{k}" if path else k)
-        elif isinstance(value, list):
-            for idx, item in enumerate(value):
-                _scan(item, f"{path}[{idx}]")
-        elif isinstance(value, str):
+    while stack:
+        value, node = stack.pop()
+        if isinstance(value, str):
             lower = value.lower()
-            if any(term in lower for term in ["patient", "dob", "ssn", "social security"]):
+            term_hit = any(term in lower for term in PII_TERMS)
+            email_hit = "@" in value and EMAIL_REGEX.search(value) is not None
+            phone_hit = digit_run(value) is not None
+            if not (term_hit or email_hit or phone_hit):
+                continue
+            path = _render_path(node)
+            if term_hit:
                 matches.append(path)
-            if EMAIL_REGEX.search(value) and path not in {"contactPoint.email", "contact.email"}:
+            if email_hit and path not in {"contactPoint.email", "contact.email"}:
                 matches.append(path)
-            if PHONE_REGEX.search(value) and path not in SAFE_PATHS:
-                matches.append(path)
-            if LONG_ID_REGEX.search(value) and path not in SAFE_PATHS:
+            if phone_hit and path not in SAFE_PATHS:
                 matches.append(path)
+                if LONG_ID_REGEX.search(value):
+                    matches.append(path)
+        elif isinstance(value, dict):
+            stack.extend((v, (node, k, False)) for k, v in reversed(list(value.items())))
+        elif isinstance(value, list):
+            stack.extend((value[idx], (node, idx, True)) for idx in range(len(value) - 1, -1, -1))
 
-    _scan(data)
     return matches
 
 
-def validate_health_dcat(metadata: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str], int]:
+def validate_health_dcat(metadata: Dict[str, Any]) -> ValidationResult:
     errors: List[str] = []
 
     pii_hits = detect_pii(metadata)
@@ -101,4 +134,4 @@ def validate_health_dcat(metadata: Dict[str, Any]) -> Tuple[Dict[str, Any], List
     quality_score -= 5 * sum(1 for e in errors if "not a valid" in e)
     quality_score = max(0, min(quality_score, 100))
 
-    return metadata, errors, quality_score
+    return ValidationResult(metadata, errors, quality_score)
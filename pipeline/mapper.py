@@ -1,51 +1,162 @@
 import datetime as dt
-from typing import Any, Dict, List, Tuple
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .config_loader import load_yaml_config
+from .config_loader import load_yaml_config_cached
 
+LOIRE_TEMPLATE: Dict[str, Any] = {
+    "title": None,
+    "description": None,
+    "publisher": {"name": None},
+    "contact": {"email": None, "name": None},
+    "keywords": [],
+    "license": None,
+    "landing_page": None,
+    "issued": None,
+}
 
-def _get_by_path(data: Dict[str, Any], path: str) -> Any:
-    current = data
-    for part in path.split("."):
-        if isinstance(current, dict) and part in current:
-            current = current[part]
-        else:
-            return None
-    return current
 
+def _trim(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return [item.strip() if isinstance(item, str) else item for item in value]
+    return value
 
-def map_health_dcat_to_loire(metadata: Dict[str, Any], config_path: str) -> Tuple[Dict[str, Any], List[str], Dict[str, str]]:
-    config = load_yaml_config(config_path)
-
-    mappings: Dict[str, str] = config.get("mappings", {})
-    required_fields: List[str] = config.get("required_fields", [])
-    loire: Dict[str, Any] = {
-        "title": None,
-        "description": None,
-        "publisher": {"name": None},
-        "contact": {"email": None, "name": None},
-        "keywords": [],
-        "license": None,
-        "landing_page": None,
-        "issued": None,
+
+def _lowercase(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, list):
+        return [item.lower() if isinstance(item, str) else item for item in value]
+    return value
+
+
+def _list_wrap(value: Any) -> Any:
+    if value is None or isinstance(value, list):
+        return value
+    return [value]
+
+
+TRANSFORMS: Dict[str, Callable[[Any], Any]] = {
+    "trim": _trim,
+    "lowercase": _lowercase,
+    "list_wrap": _list_wrap,
+}
+
+
+def _compile_getter(path: str) -> Callable[[Dict[str, Any]], Any]:
+    parts = tuple(path.split("."))
+
+    def getter(data: Dict[str, Any]) -> Any:
+        current = data
+        for part in parts:
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            else:
+                return None
+        return current
+
+    return getter
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _copy_template(template: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: _copy_template(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+        for key, value in template.items()
     }
-    provenance: Dict[str, str] = {}
-    missing_fields: List[str] = []
 
-    for target, source in mappings.items():
-        value = _get_by_path(metadata, source)
-        current = loire
+
+class _FieldPlan:
+    __slots__ = ("target", "source", "parents", "leaf", "get", "transforms", "default", "has_default", "required")
+
+    def __init__(self, target: str, spec: Any, required: bool) -> None:
+        if isinstance(spec, dict):
+            source = spec.get("source", "")
+            names = spec.get("transforms", []) or []
+            if isinstance(names, str):
+                names = [names]
+            unknown = [name for name in names if name not in TRANSFORMS]
+            if unknown:
+                raise ValueError(f"Unknown mapping transform(s) for {target}: {', '.join(unknown)}")
+            self.transforms = tuple(TRANSFORMS[name] for name in names)
+            self.has_default = "default" in spec
+            self.default = spec.get("default")
+        else:
+            source = spec
+            self.transforms = ()
+            self.has_default = False
+            self.default = None
         parts = target.split(".")
-        for part in parts[:-1]:
-            current = current.setdefault(part, {})
-        current[parts[-1]] = value
-        provenance[target] = source
-        if (value is None or value == "" or value == []) and target in required_fields:
-            missing_fields.append(target)
-
-    loire.setdefault("provenance", {})
-    loire["provenance"]["mapped_from"] = provenance
-    loire["provenance"]["generated_at"] = dt.datetime.utcnow().isoformat() + "Z"
-    loire["missing_fields"] = missing_fields
-
-    return loire, missing_fields, provenance
+        self.target = target
+        self.parents = tuple(parts[:-1])
+        self.leaf = parts[-1]
+        self.get = _compile_getter(source)
+        self.required = required
+        self.source = source
+
+
+class CompiledMapper:
+    """Mapping config compiled once into getter/setter plans, reusable across records.
+
+    Mapping values are either a source path or ``{source, transforms, default}`` where
+    ``transforms`` is a list drawn from ``TRANSFORMS`` and ``default`` replaces empty results.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]]) -> None:
+        config = config or {}
+        mappings: Dict[str, Any] = config.get("mappings", {}) or {}
+        required_fields: List[str] = config.get("required_fields", []) or []
+        required = set(required_fields)
+        self.plans: Tuple[_FieldPlan, ...] = tuple(
+            _FieldPlan(target, spec, target in required) for target, spec in mappings.items()
+        )
+        # Static per config; shared by every record rather than rebuilt per call.
+        self.provenance: Dict[str, str] = {plan.target: plan.source for plan in self.plans}
+
+    def map(self, metadata: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str], Dict[str, str]]:
+        loire = _copy_template(LOIRE_TEMPLATE)
+        missing_fields: List[str] = []
+
+        for plan in self.plans:
+            value = plan.get(metadata)
+            for transform in plan.transforms:
+                value = transform(value)
+            if plan.has_default and _is_empty(value):
+                value = deepcopy(plan.default) if isinstance(plan.default, (dict, list)) else plan.default
+            current = loire
+            for part in plan.parents:
+                current = current.setdefault(part, {})
+            current[plan.leaf] = value
+            if plan.required and _is_empty(value):
+                missing_fields.append(plan.target)
+
+        loire.setdefault("provenance", {})
+        loire["provenance"]["mapped_from"] = self.provenance
+        loire["provenance"]["generated_at"] = dt.datetime.utcnow().isoformat() + "Z"
+        loire["missing_fields"] = missing_fields
+
+        return loire, missing_fields, self.provenance
+
+
+_MAPPERS: Dict[str, Tuple[Dict[str, Any], CompiledMapper]] = {}
+
+
+def load_mapper(config_path: str) -> CompiledMapper:
+    """Return the compiled mapper for ``config_path``, recompiling only when the file changes."""
+
+    config = load_yaml_config_cached(config_path)
+    cached = _MAPPERS.get(config_path)
+    if cached is not None and cached[0] is config:
+        return cached[1]
+    mapper = CompiledMapper(config)
+    _MAPPERS[config_path] = (config, mapper)
+    return mapper
+
+
+def map_health_dcat_to_loire(metadata: Dict[str, Any], config_path: str) -> Tuple[Dict[str, Any], List[str], Dict[str, str]]:
+    return load_mapper(config_path).map(metadata)
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_NULL_SPAN = nullcontext()
+
+
+class RunTimings:
+    """Wall and CPU time per stage of one run, plus the LLM call's latency and token usage."""
+
+    def __init__(self, previous: Optional[Dict[str, Any]] = None) -> None:
+        previous = previous or {}
+        self.stages: Dict[str, Dict[str, float]] = dict(previous.get("stages", {}))
+        self.llm: Optional[Dict[str, Any]] = previous.get("llm")
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.stages[name] = {
+                "wall_ms": round((time.perf_counter() - wall) * 1000, 3),
+                "cpu_ms": round((time.thread_time() - cpu) * 1000, 3),
+            }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": self.stages,
+            "total_wall_ms": round(sum(s["wall_ms"] for s in self.stages.values()), 3),
+            "llm": self.llm,
+        }
+
+
+class _NullTimings:
+    """Stand-in used when instrumentation is off: spans are a shared no-op context."""
+
+    llm = None
+
+    def span(self, name: str) -> Any:
+        return _NULL_SPAN
+
+    def to_dict(self) -> None:
+        return None
+
+
+NULL_TIMINGS = _NullTimings()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Process-wide aggregates of run timings, LLM usage, cache hits and findings per rule.
+
+    Export with ``snapshot()`` / ``write_json(path)`` or ``to_prometheus()`` /
+    ``write_prometheus(path)`` (text format, e.g. for the node_exporter textfile collector).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self.runs: Dict[Tuple[str, str], int] = {}
+            self.stage_seconds: Dict[str, Dict[str, float]] = {}
+            self.stage_count: Dict[str, int] = {}
+            self.llm_calls: Dict[str, int] = {}
+            self.llm_latency_seconds = 0.0
+            self.llm_tokens: Dict[str, int] = {"prompt": 0, "completion": 0}
+            self.run_store: Dict[str, int] = {"hits": 0, "misses": 0}
+            self.findings: Dict[Tuple[str, str], int] = {}
+
+    def observe_run(self, status: str, timings: Optional[Dict[str, Any]], source: str = "pipeline") -> None:
+        """Count a finished run; ``source`` is ``"run_store"`` for a result reused from the run store."""
+
+        with self._lock:
+            key = (status, source)
+            self.runs[key] = self.runs.get(key, 0) + 1
+            if not timings:
+                return
+            for stage, span in timings.get("stages", {}).items():
+                totals = self.stage_seconds.setdefault(stage, {"wall": 0.0, "cpu": 0.0})
+                totals["wall"] += span["wall_ms"] / 1000
+                totals["cpu"] += span["cpu_ms"] / 1000
+                self.stage_count[stage] = self.stage_count.get(stage, 0) + 1
+
+    def observe_llm(self, stats: Optional[Dict[str, Any]]) -> None:
+        if not stats:
+            return
+        with self._lock:
+            source = stats.get("source", "unknown")
+            self.llm_calls[source] = self.llm_calls.get(source, 0) + 1
+            self.llm_latency_seconds += stats.get("latency_s") or 0.0
+            self.llm_tokens["prompt"] += stats.get("prompt_tokens") or 0
+            self.llm_tokens["completion"] += stats.get("completion_tokens") or 0
+
+    def observe_findings(self, stage: str, compliance: Optional[Dict[str, Any]]) -> None:
+        if not compliance:
+            return
+        with self._lock:
+            for finding in compliance.get("findings", []):
+                key = (str(finding.get("id")), stage)
+                self.findings[key] = self.findings.get(key, 0) + 1
+
+    def observe_run_store(self, hit: bool) -> None:
+        with self._lock:
+            self.run_store["hits" if hit else "misses"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = max(time.time() - self.started_at, 1e-9)
+            records = sum(self.runs.values())
+            runs: Dict[str, int] = {}
+            runs_by_source: Dict[str, int] = {}
+            for (status, source), count in self.runs.items():
+                runs[status] = runs.get(status, 0) + count
+                runs_by_source[source] = runs_by_source.get(source, 0) + count
+            lookups = self.llm_calls.get("llm", 0) + self.llm_calls.get("error", 0) + self.llm_calls.get("cache", 0)
+            store_lookups = self.run_store["hits"] + self.run_store["misses"]
+            return {
+                "elapsed_seconds": round(elapsed, 3),
+                "records": records,
+                "records_per_second": round(records / elapsed, 3),
+                "runs": runs,
+                "runs_by_source": runs_by_source,
+                "run_counts": [
+                    {"status": status, "source": source, "count": count}
+                    for (status, source), count in sorted(self.runs.items())
+                ],
+                "stages": {
+                    stage: {
+                        "count": self.stage_count[stage],
+                        "wall_seconds": round(totals["wall"], 6),
+                        "cpu_seconds": round(totals["cpu"], 6),
+                        "mean_wall_ms": round(totals["wall"] / self.stage_count[stage] * 1000, 3),
+                    }
+                    for stage, totals in self.stage_seconds.items()
+                },
+                "llm": {
+                    "calls": dict(self.llm_calls),
+                    "latency_seconds": round(self.llm_latency_seconds, 6),
+                    "prompt_tokens": self.llm_tokens["prompt"],
+                    "completion_tokens": self.llm_tokens["completion"],
+                    "cache_hit_rate": self.llm_calls.get("cache", 0) / lookups if lookups else 0.0,
+                },
+                "run_store": {
+                    **self.run_store,
+                    "hit_rate": self.run_store["hits"] / store_lookups if store_lookups else 0.0,
+                },
+                "findings": [
+                    {"rule": rule, "stage": stage, "count": count}
+                    for (rule, stage), count in sorted(self.findings.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        snap = self.snapshot()
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[Tuple[Dict[str, Any], Any]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric("dcc_runs_total", "counter", "Pipeline runs by result status and source (pipeline or run_store).",
+               [({"status": r["status"], "source": r["source"]}, r["count"]) for r in snap["run_counts"]])
+        metric("dcc_records_per_second", "gauge", "Runs per second since the metrics were reset.",
+               [({}, snap["records_per_second"])])
+        metric("dcc_stage_wall_seconds_total", "counter", "Wall-clock time spent per stage.",
+               [({"stage": stage}, s["wall_seconds"]) for stage, s in sorted(snap["stages"].items())])
+        metric("dcc_stage_cpu_seconds_total", "counter", "CPU time spent per stage.",
+               [({"stage": stage}, s["cpu_seconds"]) for stage, s in sorted(snap["stages"].items())])
+        metric("dcc_stage_runs_total", "counter", "Number of timed executions per stage.",
+               [({"stage": stage}, s["count"]) for stage, s in sorted(snap["stages"].items())])
+        metric("dcc_llm_calls_total", "counter", "Explanation requests by source (llm, cache, fallback, error).",
+               [({"source": source}, count) for source, count in sorted(snap["llm"]["calls"].items())])
+        metric("dcc_llm_latency_seconds_total", "counter", "Time spent waiting for the LLM.",
+               [({}, snap["llm"]["latency_seconds"])])
+        metric("dcc_llm_tokens_total", "counter", "LLM tokens used.",
+               [({"kind": "prompt"}, snap["llm"]["prompt_tokens"]), ({"kind": "completion"}, snap["llm"]["completion_tokens"])])
+        metric("dcc_llm_cache_hit_ratio", "gauge", "Share of LLM lookups answered by the response cache.",
+               [({}, round(snap["llm"]["cache_hit_rate"], 6))])
+        metric("dcc_run_store_hit_ratio", "gauge", "Share of runs answered by the run store.",
+               [({}, round(snap["run_store"]["hit_rate"], 6))])
+        metric("dcc_findings_total", "counter", "Compliance findings per rule, before and after patching.",
+               [({"rule": f["rule"], "stage": f["stage"]}, f["count"]) for f in snap["findings"]])
+        return "\n".join(lines) + "\n"
+
+    def _write(self, path: str, text: str) -> None:
+        # Write-then-rename so scrapers never read a half-written file.
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def write_prometheus(self, path: str) -> None:
+        self._write(path, self.to_prometheus())
+
+    def write_json(self, path: str) -> None:
+        self._write(path, json.dumps(self.snapshot(), indent=2))
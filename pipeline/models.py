@@ -0,0 +1,127 @@
+"""Compact, read-only types for compliance findings, compliance results and validation results.
+
+``Finding`` and ``ComplianceResult`` are slotted and behave as read-only mappings with the
+keys of the dicts they replace, so ``result["score"]``, ``finding.get("field")``, ``**result``
+and equality with plain dicts keep working. JSON output goes through ``to_dict()`` (or
+``json_default`` as the ``default=`` hook of ``json.dumps``/``orjson.dumps``).
+"""
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Record(Mapping):
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        return type(self), tuple(getattr(self, name) for name in self._fields)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class Finding(_Record):
+    """One failed rule. Rule id, severity, field and rule type strings are interned."""
+
+    __slots__ = ("id", "severity", "field", "message", "rule")
+    _fields = __slots__
+
+    def __init__(
+        self, id: Any, severity: Optional[str], field: Optional[str], message: Optional[str], rule: Optional[str]
+    ) -> None:
+        setter = object.__setattr__
+        setter(self, "id", _intern(id))
+        setter(self, "severity", _intern(severity))
+        setter(self, "field", _intern(field))
+        setter(self, "message", message)
+        setter(self, "rule", _intern(rule))
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "Finding":
+        if isinstance(data, Finding):
+            return data
+        return cls(data.get("id"), data.get("severity"), data.get("field"), data.get("message"), data.get("rule"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "severity": self.severity,
+            "field": self.field,
+            "message": self.message,
+            "rule": self.rule,
+        }
+
+
+class ComplianceResult(_Record):
+    """Overall status, score and findings of one compliance check."""
+
+    __slots__ = ("overall_status", "score", "findings")
+    _fields = __slots__
+
+    def __init__(self, overall_status: str, score: int, findings: List[Finding]) -> None:
+        setter = object.__setattr__
+        setter(self, "overall_status", _intern(overall_status))
+        setter(self, "score", score)
+        setter(self, "findings", findings)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "ComplianceResult":
+        if isinstance(data, ComplianceResult):
+            return data
+        findings = [Finding.from_dict(finding) for finding in data.get("findings", [])]
+        return cls(data.get("overall_status"), data.get("score"), findings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "overall_status": self.overall_status,
+            "score": self.score,
+            "findings": [finding.to_dict() for finding in self.findings],
+        }
+
+
+class ValidationResult(NamedTuple):
+    """Result of ``validate_health_dcat``; unpacks as ``(validated, errors, quality_score)``."""
+
+    validated: Dict[str, Any]
+    errors: List[str]
+    quality_score: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"validated": self.validated, "validation_errors": list(self.errors), "quality_score": self.quality_score}
+
+
+def json_default(value: Any) -> Any:
+    """``default=`` hook for ``json.dumps``/``orjson.dumps``: model types as dicts, anything else as text."""
+
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    return str(value)
@@ -1,7 +1,13 @@
+import asyncio
+import hashlib
 import json
 import os
+import shutil
+import threading
+import time
+import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 try:
     from dotenv import load_dotenv
@@ -9,13 +15,18 @@ except ImportError:  # pragma: no cover - optional dependency
     def load_dotenv() -> bool:  # type: ignore
         return False
 
-from .compliance import run_compliance
+from .compliance import RuleSet
 from .config_loader import load_yaml_config
-from .explain_fix import generate_explanation_and_patches
+from .explain_async import AsyncExplainer
+from .explain_dedup import aexplain_deduplicated
+from .explain_fix import Explainer, _default_explanation, _load_prompt
+from .fixers import FixerSet
 from .ingest_validate import ValidationError, validate_health_dcat
-from .mapper import map_health_dcat_to_loire
+from .mapper import CompiledMapper
+from .metrics import NULL_TIMINGS, Metrics, RunTimings
 from .patcher import apply_patches
-from .report import write_reports
+from .report import ReportWriter, artifact_refs, bundle_refs, load_artifact, write_reports
+from .run_store import DEFAULT_DATASET_KEY, RunStore, dataset_id, files_hash, input_checksum, metadata_checksum
 
 
 load_dotenv()
@@ -23,93 +34,549 @@ load_dotenv()
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_DIR = os.path.join(BASE_DIR, os.pardir, "configs")
 PROMPTS_DIR = os.path.join(BASE_DIR, os.pardir, "prompts")
+DEFAULT_OUTPUT_ROOT = os.path.join(os.path.dirname(BASE_DIR), "outputs")
 
+MAPPING_CONFIG = "mapping_healthdcat_to_loire.yaml"
+RULES_CONFIG = "federator_sim_rules.yaml"
+REQUIRED_FIELDS_CONFIG = "loire_required_fields.yaml"
+SYSTEM_PROMPT = "system_prompt.txt"
+FIX_PROMPT = "fix_prompt.txt"
+# Stage 1 fields stage 2 consumes but does not pass on: the self-description before patching
+# stays available as a report artifact, and ``raw_input`` only appears in older stage 1 results.
+HANDOFF_ONLY = ("loire", "raw_input")
+# Runs whose explanation did not come from the model are not reused from the run store.
+UNSTORED_LLM_SOURCES = ("fallback", "error")
 
-def _load_required_fields() -> list:
-    data = load_yaml_config(os.path.join(CONFIG_DIR, "loire_required_fields.yaml")) or {}
-    return data.get("required", [])
 
+def _new_run_id() -> str:
+    # The random suffix keeps runs started within the same second apart.
+    return f"run_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}_{uuid.uuid4().hex[:8]}"
 
-def run_pipeline_stage1(metadata: Dict[str, Any], output_root: Optional[str] = None) -> Dict[str, Any]:
-    raw_input = json.dumps(metadata, indent=2)
-    output_root = output_root or os.path.join(os.path.dirname(BASE_DIR), "outputs")
-    run_id = f"run_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}"
-    output_dir = os.path.join(output_root, run_id)
 
-    try:
-        validated, validation_errors, quality_score = validate_health_dcat(metadata)
-    except ValidationError as exc:  # PII guard triggers
+class Pipeline:
+    """Parsed configs, compiled rules and mapping, prompts and one LLM client, built once.
+
+    With ``auto_reload`` the config and prompt files are mtime-checked before each run and
+    reloaded when they change; the LLM client is kept across reloads. ``verify_compliance``
+    (default: the ``DCC_VERIFY_COMPLIANCE`` env var) cross-checks every incremental
+    compliance re-check against a full one. Reports go through ``report_writer`` when given
+    (written in the background; the caller flushes and closes it), else are written inline.
+    With a ``run_store`` (default: ``DCC_RUN_STORE``) finished runs are indexed and ``run``
+    returns the stored result when the same input meets the same configs and prompts again
+    (runs explained by the fallback or a failed LLM call are not stored).
+    With ``metrics`` (default: a fresh ``Metrics`` when ``DCC_METRICS`` is set) every result
+    carries a ``timings`` block and the aggregates are collected; otherwise nothing is timed.
+    """
+
+    def __init__(
+        self,
+        config_dir: str = CONFIG_DIR,
+        prompts_dir: str = PROMPTS_DIR,
+        output_root: Optional[str] = None,
+        explainer: Optional[Explainer] = None,
+        auto_reload: bool = True,
+        verify_compliance: Optional[bool] = None,
+        report_writer: Optional[ReportWriter] = None,
+        run_store: Optional[RunStore] = None,
+        dataset_key: str = DEFAULT_DATASET_KEY,
+        metrics: Optional[Metrics] = None,
+        deterministic_fixes: bool = True,
+        max_fix_iterations: int = 3,
+        fix_time_budget: Optional[float] = 60.0,
+    ) -> None:
+        self.config_dir = config_dir
+        self.prompts_dir = prompts_dir
+        self.output_root = output_root or DEFAULT_OUTPUT_ROOT
+        self.auto_reload = auto_reload
+        if verify_compliance is None:
+            verify_compliance = os.getenv("DCC_VERIFY_COMPLIANCE", "").lower() in {"1", "true", "yes"}
+        self.verify_compliance = verify_compliance
+        self.report_writer = report_writer
+        self.run_store = run_store if run_store is not None else RunStore.from_env()
+        self.dataset_key = dataset_key
+        if metrics is None and os.getenv("DCC_METRICS", "").lower() in {"1", "true", "yes"}:
+            metrics = Metrics()
+        self.metrics = metrics
+        self.deterministic_fixes = deterministic_fixes
+        self.max_fix_iterations = max_fix_iterations
+        self.fix_time_budget = fix_time_budget
+        self._lock = threading.Lock()
+        self._mtimes: Dict[str, int] = {}
+        self.explainer = explainer or Explainer.from_env(prompts_dir)
+        self._async_explainer: Optional[AsyncExplainer] = None
+        self.last_dedup_stats: Optional[Dict[str, Any]] = None
+        self._load()
+
+    def _watched_files(self) -> List[str]:
+        return [
+            os.path.join(self.config_dir, MAPPING_CONFIG),
+            os.path.join(self.config_dir, RULES_CONFIG),
+            os.path.join(self.config_dir, REQUIRED_FIELDS_CONFIG),
+            os.path.join(self.prompts_dir, SYSTEM_PROMPT),
+            os.path.join(self.prompts_dir, FIX_PROMPT),
+        ]
+
+    def _current_mtimes(self) -> Dict[str, int]:
+        return {path: os.stat(path).st_mtime_ns for path in self._watched_files()}
+
+    def _load(self) -> None:
+        mtimes = self._current_mtimes()
+        mapper = CompiledMapper(load_yaml_config(os.path.join(self.config_dir, MAPPING_CONFIG)))
+        ruleset = RuleSet.from_config(load_yaml_config(os.path.join(self.config_dir, RULES_CONFIG)))
+        required = load_yaml_config(os.path.join(self.config_dir, REQUIRED_FIELDS_CONFIG)) or {}
+        explainer = self.explainer.with_prompts(
+            _load_prompt(os.path.join(self.prompts_dir, SYSTEM_PROMPT)),
+            _load_prompt(os.path.join(self.prompts_dir, FIX_PROMPT)),
+        )
+
+        self.mapper = mapper
+        self.ruleset = ruleset
+        self.fixers = FixerSet(ruleset)
+        self.required_fields: List[str] = required.get("required", [])
+        self.explainer = explainer
+        self.config_hash = files_hash(self._watched_files()[:3])
+        # Runs explained without a client must not be reused once an API key is configured.
+        llm_state = "llm" if explainer.uses_llm else "fallback"
+        self.prompt_hash = hashlib.sha256(
+            (files_hash(self._watched_files()[3:]) + explainer.model + llm_state).encode("utf-8")
+        ).hexdigest()
+        self._mtimes = mtimes
+
+    def reload_if_changed(self) -> bool:
+        """Reload configs and prompts when any of their files changed on disk."""
+
+        if self._current_mtimes() == self._mtimes:
+            return False
+        with self._lock:
+            if self._current_mtimes() == self._mtimes:
+                return False
+            self._load()
+        return True
+
+    def _timings(self, previous: Optional[Dict[str, Any]] = None) -> Any:
+        return RunTimings(previous) if self.metrics is not None else NULL_TIMINGS
+
+    def _observe_error(self, result: Dict[str, Any], timings: Any) -> Dict[str, Any]:
+        if self.metrics is not None:
+            result["timings"] = timings.to_dict()
+            self.metrics.observe_run("error", result["timings"])
+        return result
+
+    def _prepare(
+        self,
+        metadata: Dict[str, Any],
+        output_root: Optional[str],
+        run_id: Optional[str],
+        timings: Any = NULL_TIMINGS,
+    ) -> Dict[str, Any]:
+        if self.auto_reload:
+            self.reload_if_changed()
+
+        checksum = metadata_checksum(metadata)
+        output_root = output_root or self.output_root
+        run_id = run_id or _new_run_id()
+        output_dir = os.path.join(output_root, run_id)
+
+        try:
+            with timings.span("validate"):
+                validated, validation_errors, quality_score = validate_health_dcat(metadata)
+        except ValidationError as exc:  # PII guard triggers
+            return self._observe_error({
+                "status": "error",
+                "error": str(exc),
+                "quality_score": 0,
+            }, timings)
+
+        with timings.span("map"):
+            loire, missing_fields, provenance = self.mapper.map(validated)
+
+        with timings.span("compliance"):
+            compliance_before = self.ruleset.evaluate(loire)
+        if self.metrics is not None:
+            self.metrics.observe_findings("before", compliance_before)
+
+        with timings.span("fix"):
+            fixes = self.fixers.patches(loire, compliance_before["findings"], metadata) if self.deterministic_fixes else []
+            residual_loire, residual = loire, compliance_before
+            if fixes:
+                residual_loire = apply_patches(loire, fixes)
+                residual = self.ruleset.reevaluate(residual_loire, compliance_before, fixes, verify=self.verify_compliance)
+
         return {
-            "status": "error",
-            "error": str(exc),
-            "quality_score": 0,
+            "status": "ok",
+            "run_id": run_id,
+            "output_dir": output_dir,
+            "validation_errors": validation_errors,
+            "quality_score": quality_score,
+            "loire": loire,
+            "compliance_before": compliance_before,
+            "dataset_id": dataset_id(metadata, self.dataset_key),
+            "input_checksum": checksum,
+            # Stage 2 carries findings over from compliance_before only under the same rules.
+            "config_hash": self.config_hash,
+            "deterministic_patches": fixes,
+            # What is left for the LLM once the deterministic fixes are applied; dropped in _finish.
+            "residual": {"loire": residual_loire, "compliance": residual},
         }
 
-    loire, missing_fields, provenance = map_health_dcat_to_loire(
-        validated, os.path.join(CONFIG_DIR, "mapping_healthdcat_to_loire.yaml")
-    )
+    def _finish(
+        self,
+        prepared: Dict[str, Any],
+        explain: Optional[Dict[str, Any]],
+        timings: Any = NULL_TIMINGS,
+        llm_stats: Any = None,
+        llm_calls: int = 1,
+    ) -> Dict[str, Any]:
+        prepared.pop("residual")
+        fixes = prepared.pop("deterministic_patches")
+        explain = explain or _default_explanation()
+        explanation = _copy_explanation(explain.get("explanation", {}))
+        if fixes and isinstance(explanation, dict):
+            explanation.setdefault("minor", []).append(
+                "Fixed without the LLM: " + ", ".join(patch["path"] for patch in fixes)
+            )
+        llm_patches = explain.get("patches", [])
+        prepared.update({
+            "patches": fixes + llm_patches,
+            "explanation": explanation,
+            "questions": explain.get("questions", []),
+            "prompt_stats": explain.get("prompt_stats"),
+            "fix_tiers": {"deterministic": len(fixes), "llm": len(llm_patches), "llm_calls": llm_calls},
+            "llm_source": (llm_stats or {}).get("source"),
+        })
+        if self.metrics is not None:
+            timings.llm = llm_stats or None
+            self.metrics.observe_llm(llm_stats)
+            prepared["timings"] = timings.to_dict()
+        return prepared
 
-    compliance_before = run_compliance(loire, os.path.join(CONFIG_DIR, "federator_sim_rules.yaml"))
+    def stage1(
+        self, metadata: Dict[str, Any], output_root: Optional[str] = None, run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        timings = self._timings()
+        prepared = self._prepare(metadata, output_root, run_id, timings)
+        if prepared["status"] != "ok":
+            return prepared
+        llm_stats: Dict[str, Any] = {}
+        with timings.span("explain"):
+            explain, llm_calls = self._explain_residual(prepared["residual"], llm_stats)
+        return self._finish(prepared, explain, timings, llm_stats, llm_calls)
 
-    required_fields = _load_required_fields()
-    explain = generate_explanation_and_patches(loire, compliance_before, required_fields, PROMPTS_DIR)
-    patches = explain.get("patches", [])
+    def _explain_residual(
+        self, residual: Dict[str, Any], llm_stats: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Ask the LLM about the findings left after the deterministic fixes, re-checking after each answer.
 
-    return {
-        "status": "ok",
-        "run_id": run_id,
-        "output_dir": output_dir,
-        "validation_errors": validation_errors,
-        "quality_score": quality_score,
-        "loire": loire,
-        "compliance_before": compliance_before,
-        "patches": patches,
-        "explanation": explain.get("explanation", {}),
-        "questions": explain.get("questions", []),
-        "raw_input": raw_input,
-    }
+        Stops once no findings remain, an answer brings no improvement, or ``max_fix_iterations``
+        calls or ``fix_time_budget`` seconds are used up. Returns the merged explanation (``None``
+        when the LLM was not needed) and the number of calls.
+        """
+
+        loire, compliance = residual["loire"], residual["compliance"]
+        merged: Optional[Dict[str, Any]] = None
+        started = time.monotonic()
+        calls = 0
+        while compliance["findings"] and calls < self.max_fix_iterations:
+            if calls and self.fix_time_budget is not None and time.monotonic() - started >= self.fix_time_budget:
+                break
+            stats: Dict[str, Any] = {}
+            explain = self.explainer.explain(loire, compliance, self.required_fields, stats=stats)
+            calls += 1
+            _merge_llm_stats(llm_stats, stats)
+            merged = explain if merged is None else _merge_explanations(merged, explain)
+            patches = explain.get("patches", [])
+            if not patches:
+                break
+            loire = apply_patches(loire, patches)
+            rechecked = self.ruleset.reevaluate(loire, compliance, patches, verify=self.verify_compliance)
+            improved = rechecked["score"] > compliance["score"] or len(rechecked["findings"]) < len(compliance["findings"])
+            compliance = rechecked
+            if not improved:
+                break
+        return merged, calls
+
+    def stage1_stream(
+        self, metadata: Dict[str, Any], output_root: Optional[str] = None, run_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stage 1 with a streamed LLM response, previewing each patch as it arrives.
+
+        Yields ``{"type": "patch", "patch", "elapsed", "compliance"}`` where ``compliance`` is
+        the re-check with all patches so far applied, then ``{"type": "stage1", "result"}``
+        with the usual stage 1 result (ready for ``stage2``). Errors yield only the latter.
+        """
+
+        timings = self._timings()
+        prepared = self._prepare(metadata, output_root, run_id, timings)
+        if prepared["status"] != "ok":
+            yield {"type": "stage1", "result": prepared}
+            return
+
+        patched = prepared["loire"]
+        compliance = prepared["compliance_before"]
+        started = time.monotonic()
+        for patch in prepared["deterministic_patches"]:
+            patched = apply_patches(patched, [patch])
+            compliance = self.ruleset.reevaluate(patched, compliance, [patch], verify=self.verify_compliance)
+            yield {"type": "patch", "patch": patch, "elapsed": time.monotonic() - started, "compliance": compliance}
+
+        if not compliance["findings"]:
+            yield {"type": "stage1", "result": self._finish(prepared, None, timings, None, 0)}
+            return
+        llm_stats: Dict[str, Any] = {}
+        events = self.explainer.stream_explain(patched, compliance, self.required_fields, stats=llm_stats)
+        for event in events:
+            if event["type"] == "patch":
+                patched = apply_patches(patched, [event["patch"]])
+                compliance = self.ruleset.reevaluate(patched, compliance, [event["patch"]], verify=self.verify_compliance)
+                yield {**event, "compliance": compliance}
+            else:
+                yield {"type": "stage1", "result": self._finish(prepared, event["result"], timings, llm_stats)}
+
+    async def astage1_many(
+        self,
+        records: List[Dict[str, Any]],
+        output_root: Optional[str] = None,
+        dedup: bool = False,
+        **async_options: Any,
+    ) -> List[Dict[str, Any]]:
+        """Stage 1 for many records with the LLM calls in flight concurrently (see ``AsyncExplainer``).
+
+        With ``dedup`` records failing identically share one LLM request (see ``explain_dedup``)
+        and the resulting statistics are kept in ``last_dedup_stats``.
+        """
+
+        if self._async_explainer is None or self._async_explainer.explainer is not self.explainer or async_options:
+            self._async_explainer = AsyncExplainer(self.explainer, **async_options)
+        explainer = self._async_explainer
+        batch_id = _new_run_id()
+        timings = [self._timings() for _ in records]
+        prepared = [
+            self._prepare(metadata, output_root, f"{batch_id}_{index:06d}", timings[index])
+            for index, metadata in enumerate(records)
+        ]
+        done = [(item, timing) for item, timing in zip(prepared, timings) if item["status"] == "ok"]
+        # Records the deterministic fixes already resolved never reach the LLM.
+        pending = [(item, timing) for item, timing in done if item["residual"]["compliance"]["findings"]]
+        for item, timing in done:
+            if not item["residual"]["compliance"]["findings"]:
+                self._finish(item, None, timing, None, 0)
+        requests = [
+            (item["residual"]["loire"], item["residual"]["compliance"], self.required_fields) for item, _ in pending
+        ]
+        llm_stats: List[Dict[str, Any]] = [{} for _ in pending]
+        if dedup:
+            explanations, self.last_dedup_stats = await aexplain_deduplicated(explainer, requests, stats=llm_stats)
+        else:
+            explanations = await explainer.explain_many(requests, stats=llm_stats)
+        for (item, timing), explain, stats in zip(pending, explanations, llm_stats):
+            self._finish(item, explain, timing, stats)
+        return prepared
+
+    def stage1_many(
+        self,
+        records: List[Dict[str, Any]],
+        output_root: Optional[str] = None,
+        dedup: bool = False,
+        **async_options: Any,
+    ) -> List[Dict[str, Any]]:
+        async def _run() -> List[Dict[str, Any]]:
+            try:
+                return await self.astage1_many(records, output_root=output_root, dedup=dedup, **async_options)
+            finally:
+                # The pooled client is bound to this event loop, which asyncio.run closes.
+                if self._async_explainer is not None:
+                    await self._async_explainer.aclose()
 
+        return asyncio.run(_run())
 
-def run_pipeline_stage2(stage1_result: Dict[str, Any], output_root: Optional[str] = None) -> Dict[str, Any]:
-    if stage1_result.get("status") != "ok":
-        return stage1_result
-
-    loire = stage1_result["loire"]
-    patches = stage1_result.get("patches", [])
-    raw_input = stage1_result.get("raw_input", json.dumps(loire))
-    run_id = stage1_result.get("run_id") or f"run_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}"
-    output_root = output_root or os.path.join(os.path.dirname(BASE_DIR), "outputs")
-    output_dir = stage1_result.get("output_dir") or os.path.join(output_root, run_id)
-
-    loire_after = apply_patches(loire, patches)
-    compliance_after = run_compliance(loire_after, os.path.join(CONFIG_DIR, "federator_sim_rules.yaml"))
-
-    try:
-        write_reports(
-            output_dir,
-            {
-                "loire_before": loire,
-                "loire_after": loire_after,
-                "compliance_before": stage1_result["compliance_before"],
-                "compliance_after": compliance_after,
-                "patches": patches,
-            },
-            raw_input,
+    def stage2(
+        self, stage1_result: Dict[str, Any], output_root: Optional[str] = None, trusted: bool = True
+    ) -> Dict[str, Any]:
+        """Apply the stage 1 patches, re-check compliance and write the reports.
+
+        An untrusted ``stage1_result`` (e.g. posted by a client) is re-checked against every rule
+        and never recorded in the run store, whatever checksum or hashes it claims.
+        """
+
+        if stage1_result.get("status") != "ok":
+            return stage1_result
+
+        loire = stage1_result["loire"]
+        patches = stage1_result.get("patches", [])
+        # Stage 1 results from before the checksum handoff still carry the serialized input.
+        checksum = stage1_result.get("input_checksum") or input_checksum(
+            stage1_result.get("raw_input", json.dumps(loire))
         )
-    except OSError:
-        pass
+        run_id = stage1_result.get("run_id") or _new_run_id()
+        output_root = output_root or self.output_root
+        output_dir = stage1_result.get("output_dir") or os.path.join(output_root, run_id)
+
+        timings = self._timings(stage1_result.get("timings"))
+        with timings.span("patch"):
+            loire_after = apply_patches(loire, patches)
+        with timings.span("recheck"):
+            if trusted and stage1_result.get("config_hash") == self.config_hash:
+                compliance_after = self.ruleset.reevaluate(
+                    loire_after, stage1_result["compliance_before"], patches, verify=self.verify_compliance
+                )
+            else:
+                compliance_after = self.ruleset.evaluate(loire_after)
+
+        artifacts = {
+            "loire_before": loire,
+            "loire_after": loire_after,
+            "compliance_before": stage1_result["compliance_before"],
+            "compliance_after": compliance_after,
+            "patches": patches,
+            "timings": timings.to_dict(),
+            "input_checksum": checksum,
+        }
+        with timings.span("reports"):
+            if self.report_writer is not None:
+                self.report_writer.submit(output_dir, artifacts)
+            else:
+                try:
+                    write_reports(output_dir, artifacts)
+                except OSError:
+                    pass
+
+        result = {key: value for key, value in stage1_result.items() if key not in HANDOFF_ONLY}
+        result.update({
+            "run_id": run_id,
+            "output_dir": output_dir,
+            "input_checksum": checksum,
+            "loire_after": loire_after,
+            "compliance_after": compliance_after,
+            "artifacts": self._artifact_refs(output_dir),
+        })
+        if self.metrics is not None:
+            result["timings"] = timings.to_dict()
+            self.metrics.observe_findings("after", compliance_after)
+            self.metrics.observe_run(compliance_after.get("overall_status", "ok"), result["timings"])
+        if self.run_store is not None and trusted and result.get("llm_source") not in UNSTORED_LLM_SOURCES:
+            self.run_store.record(
+                result, checksum, self.config_hash, self.prompt_hash, result.get("dataset_id")
+            )
+        return result
+
+    def _reuse(
+        self, stored: Dict[str, Any], output_root: Optional[str], run_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """A stored result for ``run``; with a ``run_id`` or ``output_root`` its report files are copied there.
+
+        Returns ``None`` (run again) when the stored run's report directory no longer exists.
+        """
+
+        result = {**stored, "from_run_store": True}
+        if output_root is None and run_id is None:
+            return result
+        source = stored.get("output_dir")
+        if not source or not os.path.isdir(source):
+            return None
+        run_id = run_id or _new_run_id()
+        output_dir = os.path.join(output_root or self.output_root, run_id)
+        shutil.copytree(source, output_dir, dirs_exist_ok=True)
+        result.update({"run_id": run_id, "output_dir": output_dir, "artifacts": artifact_refs(output_dir)})
+        return result
+
+    def _artifact_refs(self, output_dir: str) -> Dict[str, str]:
+        if self.report_writer is not None and self.report_writer.mode != "files":
+            return bundle_refs(self.report_writer.bundle_path, self.report_writer.mode)
+        return artifact_refs(output_dir)
+
+    def load_artifact(self, result: Dict[str, Any], name: str) -> Any:
+        """Load a full artifact of a finished run (e.g. ``"loire_before"``), waiting for pending report writes."""
+
+        if self.report_writer is not None:
+            self.report_writer.flush()
+        return load_artifact(result, name)
+
+    def run(
+        self, metadata: Dict[str, Any], output_root: Optional[str] = None, run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if self.run_store is not None:
+            if self.auto_reload:
+                self.reload_if_changed()
+            stored = self.run_store.lookup(metadata_checksum(metadata), self.config_hash, self.prompt_hash)
+            if self.metrics is not None:
+                self.metrics.observe_run_store(stored is not None)
+            if stored is not None:
+                reused = self._reuse(stored, output_root, run_id)
+                if reused is not None:
+                    if self.metrics is not None:
+                        status = (reused.get("compliance_after") or {}).get("overall_status", "ok")
+                        self.metrics.observe_run(status, None, source="run_store")
+                    return reused
+
+        stage1 = self.stage1(metadata, output_root=output_root, run_id=run_id)
+        if stage1.get("status") != "ok":
+            return stage1
+        return self.stage2(stage1, output_root=output_root)
 
+
+def _merge_llm_stats(total: Dict[str, Any], stats: Dict[str, Any]) -> None:
+    if not total:
+        total.update(stats)
+        return
+    # A fallback or failed call marks the whole explanation, even if a later call succeeded.
+    if total.get("source") not in UNSTORED_LLM_SOURCES:
+        total["source"] = stats.get("source", total.get("source"))
+    for key in ("latency_s", "prompt_tokens", "completion_tokens"):
+        if stats.get(key) is not None:
+            total[key] = (total.get(key) or 0) + stats[key]
+
+
+def _copy_explanation(explanation: Any) -> Any:
+    # Explanations may come from the shared LLM cache, so notes are added to copies.
+    if not isinstance(explanation, dict):
+        return explanation
+    return {severity: list(notes) if isinstance(notes, list) else notes for severity, notes in explanation.items()}
+
+
+def _merge_explanations(merged: Dict[str, Any], explain: Dict[str, Any]) -> Dict[str, Any]:
+    explanation = _copy_explanation(merged.get("explanation", {}))
+    extra = explain.get("explanation")
+    if isinstance(explanation, dict) and isinstance(extra, dict):
+        for severity, notes in extra.items():
+            if isinstance(notes, list) and isinstance(explanation.setdefault(severity, []), list):
+                explanation[severity].extend(notes)
     return {
-        **stage1_result,
-        "run_id": run_id,
-        "output_dir": output_dir,
-        "loire_after": loire_after,
-        "compliance_after": compliance_after,
+        **merged,
+        "explanation": explanation,
+        "patches": merged.get("patches", []) + explain.get("patches", []),
+        "questions": merged.get("questions", []) + explain.get("questions", []),
+        "prompt_stats": explain.get("prompt_stats", merged.get("prompt_stats")),
     }
 
 
-def run_pipeline(metadata: Dict[str, Any], output_root: Optional[str] = None) -> Dict[str, Any]:
-    stage1 = run_pipeline_stage1(metadata, output_root=output_root)
-    if stage1.get("status") != "ok":
-        return stage1
-    return run_pipeline_stage2(stage1, output_root=output_root)
+_default_pipeline: Optional[Pipeline] = None
+_default_lock = threading.Lock()
+
+
+def get_default_pipeline() -> Pipeline:
+    """Return the process-wide pipeline used by the module-level entry points."""
+
+    global _default_pipeline
+    if _default_pipeline is None:
+        with _default_lock:
+            if _default_pipeline is None:
+                _default_pipeline = Pipeline()
+    return _default_pipeline
+
+
+def run_pipeline_stage1(
+    metadata: Dict[str, Any], output_root: Optional[str] = None, run_id: Optional[str] = None
+) -> Dict[str, Any]:
+    return get_default_pipeline().stage1(metadata, output_root=output_root, run_id=run_id)
+
+
+def run_pipeline_stage2(
+    stage1_result: Dict[str, Any], output_root: Optional[str] = None, trusted: bool = True
+) -> Dict[str, Any]:
+    return get_default_pipeline().stage2(stage1_result, output_root=output_root, trusted=trusted)
+
+
+def run_pipeline(
+    metadata: Dict[str, Any], output_root: Optional[str] = None, run_id: Optional[str] = None
+) -> Dict[str, Any]:
+    return get_default_pipeline().run(metadata, output_root=output_root, run_id=run_id)
@@ -0,0 +1,75 @@
+import json
+from typing import Any, Dict, List, Optional
+
+
+class IncrementalPatchParser:
+    """Pull complete patch objects out of a streamed ``{"patches": [...]}`` response.
+
+    ``feed`` takes the next text fragment and returns the patch objects of the top-level
+    ``patches`` array that became complete with it, in order. Only the response JSON's
+    structure is tracked (strings, nesting and the current key); elements are decoded with
+    ``json.loads`` once their closing brace arrives.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._in_patches = False
+        self._element_start = -1
+
+    def feed(self, fragment: str) -> List[Any]:
+        self.text += fragment
+        text = self.text
+        completed: List[Any] = []
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        try:
+                            self._last_string = json.loads(text[self._string_start:pos + 1])
+                        except ValueError:
+                            self._last_string = None
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char == ":" and len(self._stack) == 1:
+                self._key = self._last_string
+            elif char == "," and len(self._stack) == 1:
+                self._key = None
+            elif char in "{[":
+                if char == "{" and self._in_patches and len(self._stack) == 2:
+                    self._element_start = pos
+                self._stack.append(char)
+                if char == "[" and len(self._stack) == 2 and self._key == "patches":
+                    self._in_patches = True
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and self._in_patches and len(self._stack) == 2 and self._element_start >= 0:
+                    try:
+                        completed.append(json.loads(text[self._element_start:pos + 1]))
+                    except ValueError:
+                        pass
+                    self._element_start = -1
+                elif char == "]" and self._in_patches and len(self._stack) == 1:
+                    self._in_patches = False
+        self._pos = len(text)
+        return completed
+
+    def result(self) -> Dict[str, Any]:
+        """Decode the whole response once the stream has ended."""
+
+        return json.loads(self.text)
@@ -1,62 +1,229 @@
+import re
 from copy import deepcopy
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     import jsonpatch
 except ImportError:  # pragma: no cover - optional dependency
     jsonpatch = None  # type: ignore
 
+COW_OPS = {"add", "replace"}
+_ARRAY_INDEX = re.compile(r"0|[1-9][0-9]*")
+_BAD_ESCAPE = re.compile(r"~(?![01])")
 
-def _apply_single(target: Dict[str, Any], op: str, path: str, value: Any) -> None:
+
+class PatchConflict(Exception):
+    """A patch operation does not apply to the document under RFC 6902 rules."""
+
+
+def _strict_parts(path: Any) -> Optional[Tuple[str, ...]]:
+    # RFC 6901 pointer as jsonpatch parses it; None when malformed.
+    if not isinstance(path, str) or (path and not path.startswith("/")):
+        return None
+    if not path:
+        return ()
+    parts = path[1:].split("/")
+    if any(_BAD_ESCAPE.search(part) for part in parts):
+        return None
+    return tuple(part.replace("~1", "/").replace("~0", "~") for part in parts)
+
+
+def _lenient_parts(path: Any) -> Optional[Tuple[str, ...]]:
+    # The deterministic fallback's pointer handling: no unescaping, leading slashes stripped.
+    if not isinstance(path, str):
+        return None
     pointer = path.lstrip("/")
-    parts = pointer.split("/") if pointer else []
-    current: Any = target
+    return tuple(pointer.split("/")) if pointer else ()
+
+
+def _fresh(value: Any) -> Any:
+    return deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class _Writer:
+    """Copy-on-write view of a document: containers are copied the first time they are written."""
+
+    def __init__(self, document: Any) -> None:
+        self.root = document
+        self._owned: set = set()
+
+    def own(self, container: Any) -> Any:
+        if id(container) in self._owned:
+            return container
+        copied = dict(container) if isinstance(container, dict) else list(container)
+        self._owned.add(id(copied))
+        return copied
+
+    def own_root(self) -> Any:
+        self.root = self.own(self.root)
+        return self.root
+
+    def own_child(self, parent: Any, key: Any) -> Any:
+        child = parent[key]
+        if isinstance(child, (dict, list)):
+            owned = self.own(child)
+            if owned is not child:
+                parent[key] = owned
+            return owned
+        return child
+
+    def created(self, container: Any) -> Any:
+        self._owned.add(id(container))
+        return container
+
+
+def _list_index(part: str, size: int, allow_end: bool) -> int:
+    if allow_end and part == "-":
+        return size
+    if not _ARRAY_INDEX.fullmatch(part):
+        raise PatchConflict(f"invalid array index {part!r}")
+    return int(part)
+
+
+def _apply_strict(writer: _Writer, op: str, parts: Tuple[str, ...], value: Any) -> None:
+    if not parts:
+        writer.root = _fresh(value)
+        return
+    if not isinstance(writer.root, (dict, list)):
+        raise PatchConflict("document root is not a container")
+    current = writer.own_root()
+    for part in parts[:-1]:
+        if isinstance(current, dict):
+            if part not in current:
+                raise PatchConflict(f"missing member {part!r}")
+            key: Any = part
+        elif isinstance(current, list):
+            key = _list_index(part, len(current), allow_end=False)
+            if key >= len(current):
+                raise PatchConflict(f"index {key} out of range")
+        else:
+            raise PatchConflict(f"cannot descend into {type(current).__name__}")
+        current = writer.own_child(current, key)
+
+    last = parts[-1]
+    if isinstance(current, dict):
+        if op == "replace" and last not in current:
+            raise PatchConflict(f"cannot replace missing member {last!r}")
+        current[last] = _fresh(value)
+    elif isinstance(current, list):
+        index = _list_index(last, len(current), allow_end=op == "add")
+        if op == "add":
+            if index > len(current):
+                raise PatchConflict(f"index {index} out of range")
+            current.insert(index, _fresh(value))
+        else:
+            if index >= len(current):
+                raise PatchConflict(f"index {index} out of range")
+            current[index] = _fresh(value)
+    else:
+        raise PatchConflict(f"cannot patch into {type(current).__name__}")
+
+
+def _apply_lenient(writer: _Writer, op: str, parts: Tuple[str, ...], value: Any) -> None:
+    # Same effect as the original deepcopy-based fallback: missing containers are created and
+    # writes that do not fit are skipped.
+    if not parts:
+        return
+    current = writer.own_root() if isinstance(writer.root, (dict, list)) else writer.root
     for part in parts[:-1]:
         if isinstance(current, list):
             idx = int(part)
             while len(current) <= idx:
-                current.append({})
-            current = current[idx]
+                current.append(writer.created({}))
+            current = writer.own_child(current, idx)
         else:
-            current = current.setdefault(part, {})
-    if not parts:
-        return
+            if part not in current:
+                current[part] = writer.created({})
+            current = writer.own_child(current, part)
     last = parts[-1]
     if isinstance(current, list):
         idx = int(last)
         if op == "add":
             if idx == len(current):
-                current.append(value)
+                current.append(_fresh(value))
             elif 0 <= idx < len(current):
-                current.insert(idx, value)
+                current.insert(idx, _fresh(value))
         elif op == "replace" and 0 <= idx < len(current):
-            current[idx] = value
+            current[idx] = _fresh(value)
     elif isinstance(current, dict):
-        current[last] = value
+        current[last] = _fresh(value)
 
 
-def apply_patches(loire: Dict[str, Any], patches: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Apply JSONPatch operations using jsonpatch when available, with a deterministic fallback."""
+class CompiledPatch:
+    """A JSON Patch list parsed once and applied copy-on-write to any number of documents.
 
-    if not patches:
-        return loire
+    ``apply`` never mutates its input: only the containers along patched paths are copied and
+    every other subtree is shared with the input, so treat results as read-only. Lists made
+    only of ``add``/``replace`` operations are applied with RFC 6902 semantics first and, when
+    that fails, with the lenient fallback (missing parents created, unfit writes skipped).
+    Other operations go through ``jsonpatch`` as before.
+    """
+
+    def __init__(self, patches: Iterable[Dict[str, Any]]) -> None:
+        self.patches: List[Dict[str, Any]] = list(patches)
+        self._cow = all(isinstance(p, dict) and p.get("op") in COW_OPS for p in self.patches)
+        self._strict: Optional[List[Tuple[str, Tuple[str, ...], Any]]] = []
+        self._lenient: Optional[List[Tuple[str, Tuple[str, ...], Any]]] = []
+        for patch in self.patches:
+            if not isinstance(patch, dict):
+                self._strict = self._lenient = None
+                break
+            op = patch.get("op")
+            strict = _strict_parts(patch.get("path"))
+            if self._strict is not None:
+                if op not in COW_OPS or strict is None or "value" not in patch:
+                    self._strict = None
+                else:
+                    self._strict.append((op, strict, patch["value"]))
+            lenient = _lenient_parts(patch.get("path"))
+            if self._lenient is not None and op in COW_OPS and lenient is not None:
+                self._lenient.append((op, lenient, patch.get("value")))
+
+    def __len__(self) -> int:
+        return len(self.patches)
+
+    def _run(self, document: Any, ops: List[Tuple[str, Tuple[str, ...], Any]], apply_op: Any) -> Any:
+        writer = _Writer(document)
+        for op, parts, value in ops:
+            apply_op(writer, op, parts, value)
+        return writer.root
 
-    updated = deepcopy(loire)
+    def apply(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.patches:
+            return document
 
-    if jsonpatch:
+        if jsonpatch:
+            if self._cow and self._strict is not None:
+                try:
+                    return self._run(document, self._strict, _apply_strict)
+                except (PatchConflict, TypeError):
+                    pass
+            elif not self._cow:
+                try:
+                    return jsonpatch.apply_patch(deepcopy(document), self.patches, in_place=False)
+                except Exception:
+                    pass
+
+        # Fallback for offline/demo environments or when the patch does not apply cleanly
+        if self._lenient is None:
+            return document
         try:
-            return jsonpatch.apply_patch(updated, patches, in_place=False)
+            return self._run(document, self._lenient, _apply_lenient)
         except Exception:
-            pass
+            return document
 
-    # Fallback for offline/demo environments or when jsonpatch fails
-    try:
-        for patch in patches:
-            op = patch.get("op")
-            path = patch.get("path", "")
-            if op not in {"add", "replace"} or not isinstance(path, str):
-                continue
-            _apply_single(updated, op, path, patch.get("value"))
-        return updated
-    except Exception:
+    def apply_many(self, documents: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for document in documents:
+            yield self.apply(document)
+
+
+def compile_patches(patches: Iterable[Dict[str, Any]]) -> CompiledPatch:
+    return CompiledPatch(patches)
+
+
+def apply_patches(loire: Dict[str, Any], patches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply JSONPatch operations copy-on-write, with a deterministic fallback (see ``CompiledPatch``)."""
+
+    if not patches:
         return loire
+    return CompiledPatch(patches).apply(loire)
@@ -0,0 +1,147 @@
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .models import json_default
+
+DEFAULT_TOKEN_BUDGET = 1500
+MIN_STRING_LENGTH = 32
+TRUNCATION_MARKER = "...[truncated]"
+# Fields never worth sending: the mapping provenance and a copy of the findings' fields.
+EXCLUDED_FIELDS = {"provenance", "missing_fields"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for JSON-heavy English text (about four characters per token)."""
+
+    return (len(text) + 3) // 4
+
+
+def _add_path(tree: Dict[str, Any], path: str) -> None:
+    parts = path.split(".")
+    node = tree
+    for part in parts[:-1]:
+        child = node.get(part)
+        if child is True:
+            return
+        if child is None:
+            child = node[part] = {}
+        node = child
+    node[parts[-1]] = True
+
+
+def _select(value: Any, tree: Dict[str, Any]) -> Any:
+    selected: Dict[str, Any] = {}
+    for key, child in value.items():
+        if key not in tree or key in EXCLUDED_FIELDS:
+            continue
+        subtree = tree[key]
+        if subtree is True or not isinstance(child, dict):
+            selected[key] = child
+        else:
+            selected[key] = _select(child, subtree)
+    return selected
+
+
+def _sibling_paths(loire: Dict[str, Any], field: str) -> Iterable[str]:
+    parent_path, _, _ = field.rpartition(".")
+    if not parent_path:
+        return []
+    parent: Any = loire
+    for part in parent_path.split("."):
+        parent = parent.get(part) if isinstance(parent, dict) else None
+    if not isinstance(parent, dict):
+        return []
+    return [f"{parent_path}.{key}" for key, value in parent.items() if not isinstance(value, (dict, list))]
+
+
+def project_loire(
+    loire: Dict[str, Any], finding_fields: List[str], required_fields: List[str], with_context: bool = True
+) -> Dict[str, Any]:
+    """Keep only the fields named by findings and required fields, at their original paths.
+
+    With ``with_context`` the scalar siblings of each failing field are kept as well.
+    """
+
+    tree: Dict[str, Any] = {}
+    for field in finding_fields:
+        _add_path(tree, field)
+        if with_context:
+            for sibling in _sibling_paths(loire, field):
+                _add_path(tree, sibling)
+    for field in required_fields:
+        _add_path(tree, field)
+    return _select(loire, tree)
+
+
+def _truncate_strings(value: Any, max_length: int) -> Any:
+    if isinstance(value, str) and len(value) > max_length:
+        return value[:max_length] + TRUNCATION_MARKER
+    if isinstance(value, dict):
+        return {k: _truncate_strings(v, max_length) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_truncate_strings(v, max_length) for v in value]
+    return value
+
+
+def _longest_string(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return max((_longest_string(v) for v in value.values()), default=0)
+    if isinstance(value, list):
+        return max((_longest_string(v) for v in value), default=0)
+    return 0
+
+
+def build_user_content(
+    loire: Dict[str, Any],
+    findings: List[Dict[str, Any]],
+    required_fields: List[str],
+    instructions: str,
+    system_prompt: str = "",
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+    """Build the fix request's user message from a projection of ``loire``, trimmed to a token budget.
+
+    Trimming drops, in order, the sibling context, the required-but-passing fields and then
+    shortens long strings. Returns the message text, the projected document and size stats.
+    """
+
+    def render(document: Dict[str, Any]) -> str:
+        return json.dumps({
+            "loire": document,
+            "findings": findings,
+            "required_fields": required_fields,
+            "instructions": instructions,
+        }, default=json_default)
+
+    overhead = estimate_tokens(system_prompt)
+    full_tokens = overhead + estimate_tokens(render(loire))
+    finding_fields = [f.get("field") for f in findings if f.get("field")]
+
+    candidates = [
+        lambda: project_loire(loire, finding_fields, required_fields),
+        lambda: project_loire(loire, finding_fields, required_fields, with_context=False),
+        lambda: project_loire(loire, finding_fields, [], with_context=False),
+    ]
+    for build in candidates:
+        projected = build()
+        content = render(projected)
+        if overhead + estimate_tokens(content) <= token_budget:
+            break
+    else:
+        max_length = _longest_string(projected)
+        while overhead + estimate_tokens(content) > token_budget and max_length > MIN_STRING_LENGTH:
+            max_length = max(MIN_STRING_LENGTH, max_length // 2)
+            projected = _truncate_strings(projected, max_length)
+            content = render(projected)
+
+    prompt_tokens = overhead + estimate_tokens(content)
+    stats = {
+        "full_tokens": full_tokens,
+        "prompt_tokens": prompt_tokens,
+        "token_budget": token_budget,
+        "within_budget": prompt_tokens <= token_budget,
+        "reduction": round(1 - prompt_tokens / full_tokens, 3) if full_tokens else 0.0,
+    }
+    return content, projected, stats
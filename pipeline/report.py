@@ -1,26 +1,35 @@
 import hashlib
 import json
 import os
+import queue
+import threading
+import zipfile
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+from .models import ComplianceResult, Finding, json_default
 
-def _group_findings(findings: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    grouped: Dict[str, List[Dict[str, Any]]] = {"critical": [], "major": [], "minor": []}
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+def _group_findings(findings: List[Finding]) -> Dict[str, List[Finding]]:
+    grouped: Dict[str, List[Finding]] = {"critical": [], "major": [], "minor": []}
     for finding in findings:
-        severity = finding.get("severity", "minor")
-        grouped.setdefault(severity, []).append(finding)
+        grouped.setdefault(finding.severity or "minor", []).append(finding)
     return grouped
 
 
-def _render_markdown(report: Dict[str, Any], after: bool = False) -> str:
-    findings = report.get("findings", [])
-    grouped = _group_findings(findings)
+def _render_markdown(report: Any, after: bool = False) -> str:
+    report = ComplianceResult.from_dict(report)
+    grouped = _group_findings(report.findings)
     lines = []
     lines.append(f"# Compliance Report {'(After Fixes)' if after else '(Before Fixes)'}")
     lines.append("")
-    lines.append(f"**Status:** {report.get('overall_status')}  ")
-    lines.append(f"**Score:** {report.get('score')}")
+    lines.append(f"**Status:** {report.overall_status}  ")
+    lines.append(f"**Score:** {report.score}")
     lines.append("")
     for severity in ["critical", "major", "minor"]:
         lines.append(f"## {severity.title()} Findings")
@@ -28,39 +37,117 @@ def _render_markdown(report: Dict[str, Any], after: bool = False) -> str:
             lines.append("- None")
         else:
             for finding in grouped[severity]:
-                lines.append(f"- [{finding.get('id')}] {finding.get('field')}: {finding.get('message')}")
+                lines.append(f"- [{finding.id}] {finding.field}: {finding.message}")
         lines.append("")
     return "\n".join(lines)
 
 
-def write_reports(output_dir: str, run_artifacts: Dict[str, Any], raw_input: str) -> None:
-    os.makedirs(output_dir, exist_ok=True)
-    checksum = hashlib.sha256(raw_input.encode("utf-8")).hexdigest()
+def _render_timings(timings: Optional[Dict[str, Any]]) -> List[str]:
+    if not timings:
+        return []
+    stages = ", ".join(f"{name} {span['wall_ms']:.1f}" for name, span in timings.get("stages", {}).items())
+    lines = [f"- Stage Timings (ms): {stages}"]
+    llm = timings.get("llm")
+    if llm:
+        lines.append(f"- LLM: {llm.get('source')} in {llm.get('latency_s', 0) * 1000:.0f} ms")
+    return lines
+
+
+def _dumps(value: Any, compact: bool) -> str:
+    if not compact:
+        return json.dumps(value, indent=2, default=json_default)
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"), default=json_default)
+
+
+ARTIFACT_FILES = {
+    "loire_before": "loire_self_description.json",
+    "loire_after": "loire_self_description_after.json",
+    "patches": "fix_patches.json",
+    "compliance_before": "compliance_report.json",
+    "compliance_after": "compliance_report_after.json",
+    "report": "compliance_report.md",
+    "report_after": "compliance_report_after.md",
+}
+
+
+def artifact_refs(output_dir: str) -> Dict[str, str]:
+    """Paths of a run's report files by artifact name, for loading with ``load_artifact``."""
+
+    return {name: os.path.join(output_dir, file_name) for name, file_name in ARTIFACT_FILES.items()}
+
+
+def bundle_refs(bundle_path: str, mode: str) -> Dict[str, str]:
+    """Artifact refs of a run written by a ``ReportWriter`` in ``"ndjson"`` or ``"zip"`` mode."""
+
+    return {"bundle": bundle_path, "bundle_mode": mode}
+
+
+def _load_bundled(refs: Dict[str, str], run_id: str, name: str) -> Any:
+    if refs.get("bundle_mode") == "zip":
+        if name not in ARTIFACT_FILES:
+            raise KeyError(f"Run {run_id} has no {name!r} artifact")
+        member = f"{run_id}/{ARTIFACT_FILES[name]}"
+        with zipfile.ZipFile(refs["bundle"]) as bundle:
+            text = bundle.read(member).decode("utf-8")
+        return json.loads(text) if member.endswith(".json") else text
+
+    # NDJSON bundles hold one line per run; the last line for the run wins.
+    found: Optional[Dict[str, Any]] = None
+    with open(refs["bundle"], encoding="utf-8") as f:
+        for line in f:
+            if run_id in line:
+                record = json.loads(line)
+                if record.get("audit", {}).get("run_id") == run_id:
+                    found = record
+    if found is None or name == "audit" or name not in found:
+        raise KeyError(f"Run {run_id} has no {name!r} artifact in {refs['bundle']} (Markdown reports are not bundled)")
+    return found[name]
+
+
+def load_artifact(result: Dict[str, Any], name: str) -> Any:
+    """Load one artifact of a finished run from its report file or bundle; JSON files are parsed."""
+
+    refs = result.get("artifacts") or artifact_refs(result["output_dir"])
+    if "bundle" in refs:
+        return _load_bundled(refs, os.path.basename(result["output_dir"]), name)
+    if name not in refs:
+        raise KeyError(f"Run {result.get('run_id')} has no {name!r} artifact file (reports: {refs})")
+    path = refs[name]
+    with open(path, encoding="utf-8") as f:
+        return json.load(f) if path.endswith(".json") else f.read()
+
+
+def build_audit(
+    output_dir: str,
+    raw_input: Optional[str] = None,
+    timings: Optional[Dict[str, Any]] = None,
+    checksum: Optional[str] = None,
+) -> Dict[str, Any]:
+    if checksum is None:
+        checksum = hashlib.sha256((raw_input or "").encode("utf-8")).hexdigest()
     audit = {
         "run_id": os.path.basename(output_dir),
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "input_checksum": checksum,
     }
+    if timings:
+        audit["timings"] = timings
+    return audit
 
-    before_loire = run_artifacts["loire_before"]
-    after_loire = run_artifacts.get("loire_after", before_loire)
 
-    with open(os.path.join(output_dir, "loire_self_description.json"), "w", encoding="utf-8") as f:
-        json.dump(before_loire, f, indent=2)
-    with open(os.path.join(output_dir, "loire_self_description_after.json"), "w", encoding="utf-8") as f:
-        json.dump(after_loire, f, indent=2)
-
-    with open(os.path.join(output_dir, "fix_patches.json"), "w", encoding="utf-8") as f:
-        json.dump(run_artifacts.get("patches", []), f, indent=2)
+def render_reports(
+    run_artifacts: Dict[str, Any], audit: Dict[str, Any], compact: bool = False
+) -> List[Tuple[str, str]]:
+    """Render the report files of one run as ``(file name, text)`` pairs."""
 
+    before_loire = run_artifacts["loire_before"]
+    after_loire = run_artifacts.get("loire_after", before_loire)
+    patches = run_artifacts.get("patches", [])
     before_report = run_artifacts["compliance_before"]
     after_report = run_artifacts["compliance_after"]
 
-    with open(os.path.join(output_dir, "compliance_report.json"), "w", encoding="utf-8") as f:
-        json.dump(before_report, f, indent=2)
-    with open(os.path.join(output_dir, "compliance_report_after.json"), "w", encoding="utf-8") as f:
-        json.dump(after_report, f, indent=2)
-
     md_before = _render_markdown(before_report)
     md_after = _render_markdown(after_report, after=True)
 
@@ -76,13 +163,14 @@ def write_reports(output_dir: str, run_artifacts: Dict[str, Any], raw_input: str
         "",
         "## Suggested Patches",
         "```json",
-        json.dumps(run_artifacts.get("patches", []), indent=2),
+        _dumps(patches, compact),
         "```",
         "",
         "## Audit",
         f"- Run ID: {audit['run_id']}",
         f"- Generated At: {audit['generated_at']}",
         f"- Input SHA256: {audit['input_checksum']}",
+        *_render_timings(audit.get("timings")),
         "",
         "---",
         md_before,
@@ -90,7 +178,196 @@ def write_reports(output_dir: str, run_artifacts: Dict[str, Any], raw_input: str
         md_after,
     ]
 
-    with open(os.path.join(output_dir, "compliance_report.md"), "w", encoding="utf-8") as f:
-        f.write("\n".join(summary_lines))
-    with open(os.path.join(output_dir, "compliance_report_after.md"), "w", encoding="utf-8") as f:
-        f.write(md_after)
+    return [
+        (ARTIFACT_FILES["loire_before"], _dumps(before_loire, compact)),
+        (ARTIFACT_FILES["loire_after"], _dumps(after_loire, compact)),
+        (ARTIFACT_FILES["patches"], _dumps(patches, compact)),
+        (ARTIFACT_FILES["compliance_before"], _dumps(before_report, compact)),
+        (ARTIFACT_FILES["compliance_after"], _dumps(after_report, compact)),
+        (ARTIFACT_FILES["report"], "\n".join(summary_lines)),
+        (ARTIFACT_FILES["report_after"], md_after),
+    ]
+
+
+def _audit(output_dir: str, run_artifacts: Dict[str, Any], raw_input: Optional[str]) -> Dict[str, Any]:
+    return build_audit(output_dir, raw_input, run_artifacts.get("timings"), run_artifacts.get("input_checksum"))
+
+
+def write_reports(
+    output_dir: str, run_artifacts: Dict[str, Any], raw_input: Optional[str] = None, compact: bool = False
+) -> List[str]:
+    """Write one run's report files.
+
+    The audit checksum is ``run_artifacts["input_checksum"]`` when present, else the SHA-256 of ``raw_input``.
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+    audit = _audit(output_dir, run_artifacts, raw_input)
+    paths = []
+    for name, text in render_reports(run_artifacts, audit, compact):
+        path = os.path.join(output_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        paths.append(path)
+    return paths
+
+
+def _fsync_path(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover - e.g. directories on some platforms
+        pass
+    finally:
+        os.close(fd)
+
+
+REPORT_MODES = ("files", "ndjson", "zip")
+_STOP = object()
+
+
+class ReportWriter:
+    """Write run reports on a background thread fed by a bounded queue.
+
+    ``mode="files"`` writes the usual per-run report files; ``"ndjson"`` appends one line per
+    run (audit, documents, patches and both compliance results, no Markdown) to ``bundle_path``;
+    ``"zip"`` stores each run's report files under ``<run_id>/`` in the ``bundle_path``
+    archive. ``submit`` blocks while ``max_queue`` runs are pending. ``flush`` returns once
+    everything submitted is written and fsynced, and re-raises the first write error.
+    Submitted artifacts are serialised later and must not be mutated afterwards.
+    """
+
+    def __init__(
+        self,
+        mode: str = "files",
+        bundle_path: Optional[str] = None,
+        compact: bool = True,
+        max_queue: int = 256,
+    ) -> None:
+        if mode not in REPORT_MODES:
+            raise ValueError(f"Unknown report mode {mode!r}; expected one of {', '.join(REPORT_MODES)}")
+        if mode != "files" and not bundle_path:
+            raise ValueError(f"Report mode {mode!r} needs a bundle_path")
+        self.mode = mode
+        self.bundle_path = bundle_path
+        self.compact = compact
+        self.written = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._error: Optional[BaseException] = None
+        self._unsynced: List[str] = []
+        self._bundle: Any = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="report-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, output_dir: str, run_artifacts: Dict[str, Any], raw_input: Optional[str] = None) -> None:
+        if self._closed:
+            raise RuntimeError("ReportWriter is closed")
+        self._queue.put((output_dir, run_artifacts, raw_input))
+
+    def _open_bundle(self) -> Any:
+        if self._bundle is None:
+            directory = os.path.dirname(os.path.abspath(self.bundle_path))
+            os.makedirs(directory, exist_ok=True)
+            if self.mode == "zip":
+                self._bundle = zipfile.ZipFile(self.bundle_path, "a", compression=zipfile.ZIP_DEFLATED)
+            else:
+                self._bundle = open(self.bundle_path, "a", encoding="utf-8")
+        return self._bundle
+
+    def _write(self, output_dir: str, run_artifacts: Dict[str, Any], raw_input: Optional[str]) -> None:
+        if self.mode == "files":
+            self._unsynced.extend(write_reports(output_dir, run_artifacts, raw_input, compact=self.compact))
+            return
+
+        audit = _audit(output_dir, run_artifacts, raw_input)
+        bundle = self._open_bundle()
+        if self.mode == "zip":
+            for name, text in render_reports(run_artifacts, audit, compact=self.compact):
+                bundle.writestr(f"{audit['run_id']}/{name}", text)
+            return
+
+        before_loire = run_artifacts["loire_before"]
+        record = {
+            "audit": audit,
+            "loire_before": before_loire,
+            "loire_after": run_artifacts.get("loire_after", before_loire),
+            "patches": run_artifacts.get("patches", []),
+            "compliance_before": run_artifacts["compliance_before"],
+            "compliance_after": run_artifacts["compliance_after"],
+        }
+        bundle.write(_dumps(record, compact=True) + "\n")
+
+    def _sync(self) -> None:
+        if self._bundle is not None:
+            if self.mode == "zip":
+                # The central directory is only written on close; reopen lazily for the next run.
+                self._bundle.close()
+                self._bundle = None
+                _fsync_path(self.bundle_path)
+            else:
+                self._bundle.flush()
+                os.fsync(self._bundle.fileno())
+        directories = set()
+        for path in self._unsynced:
+            _fsync_path(path)
+            directories.add(os.path.dirname(path))
+        for directory in directories:
+            _fsync_path(directory)
+        self._unsynced = []
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                if isinstance(item, threading.Event):
+                    try:
+                        self._sync()
+                    except BaseException as exc:
+                        self._error = self._error or exc
+                    item.set()
+                    continue
+                try:
+                    self._write(*item)
+                    self.written += 1
+                except BaseException as exc:
+                    self._error = self._error or exc
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def flush(self) -> None:
+        """Block until every submitted run is written and synced to disk."""
+
+        if not self._thread.is_alive():
+            self._raise_error()
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_error()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join()
+            if self._bundle is not None:
+                self._bundle.close()
+                self._bundle = None
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import json_default
+
+DEFAULT_DATASET_KEY = "landingPage"
+SUMMARY_COLUMNS = (
+    "run_id, dataset_id, input_checksum, created_at, status_before, score_before,"
+    " status_after, score_after, output_dir"
+)
+
+
+def input_checksum(raw_input: str) -> str:
+    """SHA-256 of the serialized input, as recorded in the audit block of the reports."""
+
+    return hashlib.sha256(raw_input.encode("utf-8")).hexdigest()
+
+
+def metadata_checksum(metadata: Dict[str, Any], chunk_size: int = 64 * 1024) -> str:
+    """``input_checksum(json.dumps(metadata, indent=2))`` without holding the serialized input."""
+
+    digest = hashlib.sha256()
+    buffer: List[str] = []
+    size = 0
+    for chunk in json.JSONEncoder(indent=2).iterencode(metadata):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            digest.update("".join(buffer).encode("utf-8"))
+            buffer, size = [], 0
+    digest.update("".join(buffer).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def files_hash(paths: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            content = f.read()
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+def dataset_id(metadata: Dict[str, Any], key: str = DEFAULT_DATASET_KEY) -> Optional[str]:
+    current: Any = metadata
+    for part in key.split("."):
+        if not isinstance(current, dict):
+            return None
+        current = current.get(part)
+    if current in (None, "") or isinstance(current, (dict, list)):
+        return None
+    return str(current)
+
+
+class RunStore:
+    """SQLite index of finished runs: input checksum, config/prompt hashes, scores, findings, artifacts.
+
+    ``lookup`` returns the stored result of an earlier run of the same input under the same
+    config and prompt hashes; ``latest_per_dataset`` and ``runs_failing`` answer catalog
+    questions without walking the output directories.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._pid = -1
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork, so pool workers open their own.
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " run_id TEXT PRIMARY KEY, input_checksum TEXT NOT NULL, config_hash TEXT NOT NULL,"
+                " prompt_hash TEXT NOT NULL, dataset_id TEXT, created_at REAL NOT NULL,"
+                " status_before TEXT, score_before INTEGER, status_after TEXT, score_after INTEGER,"
+                " output_dir TEXT, result TEXT NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS run_findings ("
+                " run_id TEXT NOT NULL, stage TEXT NOT NULL, rule_id TEXT, severity TEXT, field TEXT)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS runs_input ON runs (input_checksum, config_hash, prompt_hash, created_at)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS runs_dataset ON runs (dataset_id, created_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS run_findings_rule ON run_findings (rule_id, stage)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS run_findings_run ON run_findings (run_id)")
+            self._pid = os.getpid()
+        return self._db
+
+    @classmethod
+    def from_env(cls) -> Optional["RunStore"]:
+        path = os.getenv("DCC_RUN_STORE")
+        return cls(path) if path else None
+
+    def record(
+        self,
+        result: Dict[str, Any],
+        checksum: str,
+        config_hash: str,
+        prompt_hash: str,
+        dataset: Optional[str] = None,
+    ) -> None:
+        before = result.get("compliance_before") or {}
+        after = result.get("compliance_after") or {}
+        encoded = json.dumps(result, separators=(",", ":"), ensure_ascii=False, default=json_default)
+        findings = [
+            (result["run_id"], stage, f.get("id"), f.get("severity"), f.get("field"))
+            for stage, report in (("before", before), ("after", after))
+            for f in report.get("findings", [])
+        ]
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.execute("DELETE FROM run_findings WHERE run_id = ?", (result["run_id"],))
+                conn.execute(
+                    "INSERT OR REPLACE INTO runs (run_id, input_checksum, config_hash, prompt_hash, dataset_id,"
+                    " created_at, status_before, score_before, status_after, score_after, output_dir, result)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        result["run_id"], checksum, config_hash, prompt_hash, dataset, time.time(),
+                        before.get("overall_status"), before.get("score"),
+                        after.get("overall_status"), after.get("score"),
+                        result.get("output_dir"), encoded,
+                    ),
+                )
+                conn.executemany("INSERT INTO run_findings VALUES (?, ?, ?, ?, ?)", findings)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def lookup(self, checksum: str, config_hash: str, prompt_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM runs WHERE input_checksum = ? AND config_hash = ? AND prompt_hash = ?"
+                " ORDER BY created_at DESC LIMIT 1",
+                (checksum, config_hash, prompt_hash),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _summaries(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(sql, tuple(params))
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def latest_per_dataset(self) -> List[Dict[str, Any]]:
+        """Most recent run summary for every dataset id."""
+
+        return self._summaries(
+            f"SELECT {SUMMARY_COLUMNS} FROM runs r WHERE dataset_id IS NOT NULL"
+            " AND created_at = (SELECT MAX(created_at) FROM runs WHERE dataset_id = r.dataset_id)"
+            " ORDER BY dataset_id"
+        )
+
+    def runs_failing(self, rule_id: str, stage: str = "after") -> List[Dict[str, Any]]:
+        """Summaries of runs with a finding for ``rule_id`` before or after patching, newest first."""
+
+        return self._summaries(
+            f"SELECT {SUMMARY_COLUMNS} FROM runs WHERE run_id IN"
+            " (SELECT run_id FROM run_findings WHERE rule_id = ? AND stage = ?)"
+            " ORDER BY created_at DESC",
+            (rule_id, stage),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None and self._pid == os.getpid():
+                self._db.close()
+            self._db = None
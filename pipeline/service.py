@@ -0,0 +1,255 @@
+"""HTTP service for the pipeline, for systems that cannot go through the Streamlit app.
+
+    python -m pipeline.service --host 0.0.0.0 --port 8080 --workers 8
+
+Endpoints (JSON in, JSON out):
+
+- ``POST /validate``: Health DCAT-AP metadata -> validation errors and quality score
+- ``POST /stage1``: metadata -> stage 1 result (findings and suggested patches)
+- ``POST /stage2``: a stage 1 result -> patched self-description, re-check and reports
+  (written under a new run id in the service's output root; the result's ``output_dir`` and
+  ``run_id`` are replaced, an ``output_dir`` outside the root is rejected, and the result is
+  never recorded in the run store)
+- ``POST /run``: metadata -> full result
+- ``POST /bulk``: NDJSON metadata, one record per line -> NDJSON results streamed back in
+  input order, each with the record's ``index``
+- ``GET /health``
+
+Requests are handled on threads; the pipeline stages run on a pool of warm worker
+processes that each load the configs, prompts and LLM client once.
+"""
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import IO, Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from .batch import _init_worker, _run_record
+from .ingest_stream import iter_ndjson
+from .ingest_validate import ValidationError, validate_health_dcat
+from .models import json_default
+from .orchestrator import DEFAULT_OUTPUT_ROOT, _new_run_id, run_pipeline, run_pipeline_stage1, run_pipeline_stage2
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# Stage 1 fields a /stage2 client cannot set: where reports go and what stage 1 claims about itself.
+CLIENT_STAGE1_IGNORED = ("output_dir", "run_id", "config_hash", "llm_source")
+
+
+def _validate(metadata: Dict[str, Any], output_root: Optional[str]) -> Dict[str, Any]:
+    try:
+        validation = validate_health_dcat(metadata)
+    except ValidationError as exc:
+        return {"status": "error", "error": str(exc), "quality_score": 0}
+    return {"status": "ok", **validation.to_dict()}
+
+
+def _stage1(metadata: Dict[str, Any], output_root: Optional[str]) -> Dict[str, Any]:
+    return run_pipeline_stage1(metadata, output_root=output_root)
+
+
+def _inside(path: str, root: str) -> bool:
+    root = os.path.realpath(root)
+    return os.path.commonpath([os.path.realpath(path), root]) == root
+
+
+def _stage2(stage1_result: Dict[str, Any], output_root: Optional[str]) -> Dict[str, Any]:
+    # Clients never choose where reports are written: the run id and directory are generated here.
+    output_root = output_root or DEFAULT_OUTPUT_ROOT
+    claimed = stage1_result.get("output_dir")
+    if claimed is not None and not (isinstance(claimed, str) and _inside(claimed, output_root)):
+        return {"status": "error", "error": "output_dir is outside the service's output root"}
+    run_id = _new_run_id()
+    # Posted stage 1 results are untrusted: every rule is re-checked and nothing reaches the run store.
+    payload = {key: value for key, value in stage1_result.items() if key not in CLIENT_STAGE1_IGNORED}
+    payload.update({"run_id": run_id, "output_dir": os.path.join(output_root, run_id)})
+    return run_pipeline_stage2(payload, output_root=output_root, trusted=False)
+
+
+def _run(metadata: Dict[str, Any], output_root: Optional[str]) -> Dict[str, Any]:
+    return run_pipeline(metadata, output_root=output_root)
+
+
+ENDPOINTS: Dict[str, Callable[[Dict[str, Any], Optional[str]], Dict[str, Any]]] = {
+    "/validate": _validate,
+    "/stage1": _stage1,
+    "/stage2": _stage2,
+    "/run": _run,
+}
+
+
+class _BodyReader:
+    """The request body as a line iterator that stops at ``Content-Length``."""
+
+    def __init__(self, rfile: IO[bytes], length: int) -> None:
+        self.rfile = rfile
+        self.remaining = length
+
+    def __iter__(self) -> Iterator[bytes]:
+        while self.remaining > 0:
+            line = self.rfile.readline(min(self.remaining, MAX_BODY_BYTES))
+            if not line:
+                return
+            self.remaining -= len(line)
+            yield line
+
+
+class DCCService:
+    """Worker pool and request dispatch, independent of the HTTP server around it.
+
+    ``workers`` of 0 or 1 runs the stages on threads of the serving process instead of
+    separate processes.
+    """
+
+    def __init__(
+        self, workers: Optional[int] = None, output_root: Optional[str] = None, max_in_flight: Optional[int] = None
+    ) -> None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.output_root = output_root
+        self.max_in_flight = max_in_flight or max(1, workers) * 4
+        self.executor: Executor
+        if workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=4, initializer=_init_worker)
+
+    def call(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.executor.submit(ENDPOINTS[path], payload, self.output_root).result()
+
+    def bulk(self, lines: Iterator[bytes]) -> Iterator[Dict[str, Any]]:
+        """Run every NDJSON record on the pool, yielding results in input order with their ``index``."""
+
+        batch_id = f"bulk_{_new_run_id()[4:]}"
+        pending: Deque[Future] = deque()
+        for index, item in enumerate(iter_ndjson(lines)):  # type: ignore[arg-type]
+            error = item.get("error")
+            if error is None and not isinstance(item["record"], dict):
+                error = "Expected a JSON object"
+            if error is not None:
+                future: Future = Future()
+                future.set_result({"status": "error", "error": error, "quality_score": 0, "index": index})
+            else:
+                future = self.executor.submit(
+                    _run_record, index, item["record"], self.output_root, f"{batch_id}_{index:06d}"
+                )
+            pending.append(future)
+            if len(pending) >= self.max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "DCCServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: Any) -> None:
+        data = json.dumps(body, ensure_ascii=False, default=json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _content_length(self) -> Optional[int]:
+        try:
+            return int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            return None
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "workers": self.server.service.workers})
+        else:
+            self._send_json(404, {"status": "error", "error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        length = self._content_length()
+        if length is None:
+            self._send_json(411, {"status": "error", "error": "Content-Length required"})
+            return
+        if self.path == "/bulk":
+            self._bulk(length)
+            return
+        if self.path not in ENDPOINTS:
+            self.close_connection = True
+            self._send_json(404, {"status": "error", "error": f"Unknown endpoint {self.path}"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"status": "error", "error": "Request body too large"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            self._send_json(400, {"status": "error", "error": f"Malformed JSON: {exc}"})
+            return
+        if not isinstance(payload, dict):
+            self._send_json(400, {"status": "error", "error": "Expected a JSON object"})
+            return
+        try:
+            result = self.server.service.call(self.path, payload)
+        except Exception as exc:
+            self._send_json(500, {"status": "error", "error": f"{type(exc).__name__}: {exc}"})
+            return
+        self._send_json(200, result)
+
+    def _bulk(self, length: int) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        reader = _BodyReader(self.rfile, length)
+        for result in self.server.service.bulk(iter(reader)):
+            line = json.dumps(result, ensure_ascii=False, default=json_default).encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+        # Lines the parser never reached must not be read as the next request.
+        if reader.remaining:
+            self.close_connection = True
+
+
+class DCCServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Any, service: DCCService, quiet: bool = False) -> None:
+        self.service = service
+        self.quiet = quiet
+        super().__init__(address, _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the compliance pipeline over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--output-root", default=None)
+    parser.add_argument("--quiet", action="store_true", help="do not log each request")
+    args = parser.parse_args(argv)
+
+    server = DCCServer((args.host, args.port), DCCService(args.workers, args.output_root), quiet=args.quiet)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} with {server.service.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from .batch import run_pipeline_batch
+from .ingest_stream import Source, iter_records
+from .run_store import DEFAULT_DATASET_KEY, dataset_id
+
+CHANGE_TYPES = ("added", "removed", "changed", "unchanged")
+RESULT_STATUSES = ("pass", "pass_with_warnings", "fail", "error")
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    encoded = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def record_key(record: Dict[str, Any], key: str, digest: Optional[str] = None) -> str:
+    """The record's match key; records without one are matched by content hash."""
+
+    return dataset_id(record, key) or f"sha256:{digest or record_hash(record)}"
+
+
+def index_snapshot(source: Source, key: str = DEFAULT_DATASET_KEY, fmt: str = "auto") -> Dict[str, str]:
+    """Map each record key of a snapshot to its content hash; malformed entries are skipped."""
+
+    index: Dict[str, str] = {}
+    for item in iter_records(source, fmt=fmt):
+        if "record" in item:
+            digest = record_hash(item["record"])
+            index.setdefault(record_key(item["record"], key, digest), digest)
+    return index
+
+
+def summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The per-record fields kept in a diff report and carried over to the next snapshot."""
+
+    if result.get("status") != "ok":
+        return {
+            "run_id": result.get("run_id"),
+            "status": "error",
+            "error": result.get("error"),
+            "score": 0,
+            "input_score": 0,
+        }
+    compliance = result.get("compliance_after") or result.get("compliance_before") or {}
+    return {
+        "run_id": result.get("run_id"),
+        "status": compliance.get("overall_status"),
+        "score": compliance.get("score"),
+        "input_score": (result.get("compliance_before") or {}).get("score"),
+        "failed_rules": [f.get("id") for f in compliance.get("findings", [])],
+    }
+
+
+def catalog_summary(results: Mapping[str, Dict[str, Any]]) -> Dict[str, Any]:
+    status_counts = {status: 0 for status in RESULT_STATUSES}
+    rule_failures: Dict[str, int] = {}
+    scores = []
+    input_scores = []
+    for summary in results.values():
+        status = summary.get("status") or "error"
+        status_counts[status] = status_counts.get(status, 0) + 1
+        if summary.get("score") is not None:
+            scores.append(summary["score"])
+        if summary.get("input_score") is not None:
+            input_scores.append(summary["input_score"])
+        for rule_id in summary.get("failed_rules", []):
+            rule_failures[rule_id] = rule_failures.get(rule_id, 0) + 1
+    return {
+        "records": len(results),
+        "mean_score": sum(scores) / len(scores) if scores else None,
+        "mean_input_score": sum(input_scores) / len(input_scores) if input_scores else None,
+        "status_counts": status_counts,
+        "rule_failures": dict(sorted(rule_failures.items())),
+    }
+
+
+def _delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]], field: str) -> Optional[int]:
+    old = before.get(field) if before else None
+    new = after.get(field) if after else None
+    return new - old if old is not None and new is not None else None
+
+
+def _score_move(key: str, change: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # ``score`` is after the suggested fixes; ``input_score`` is the record as submitted.
+    return {
+        "key": key,
+        "change": change,
+        "score_before": before.get("score") if before else None,
+        "score_after": after.get("score") if after else None,
+        "delta": _delta(before, after, "score"),
+        "input_delta": _delta(before, after, "input_score"),
+        "status_before": before.get("status") if before else None,
+        "status_after": after.get("status") if after else None,
+    }
+
+
+def diff_snapshots(
+    previous: Source,
+    new: Source,
+    key: str = DEFAULT_DATASET_KEY,
+    previous_results: Optional[Mapping[str, Dict[str, Any]]] = None,
+    fmt: str = "auto",
+    workers: Optional[int] = None,
+    output_root: Optional[str] = None,
+    max_in_flight: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run the pipeline only on records of ``new`` that were added or changed since ``previous``.
+
+    Records are matched by ``key`` (a dotted path into the input, ``landingPage`` by default).
+    Unchanged records keep their entry from ``previous_results`` (the ``results`` of the
+    previous diff report) and are only re-run when they have none. Returns a report with
+    the catalog-level ``summary``, the ``changes`` (counts and per-record score moves;
+    ``improved``/``regressed`` compare input scores, before suggested fixes) and the
+    per-record ``results`` to pass as ``previous_results`` next time.
+    """
+
+    previous_index = index_snapshot(previous, key, fmt)
+    previous_results = previous_results or {}
+    seen: Dict[str, str] = {}
+    changes: Dict[str, List[str]] = {change: [] for change in CHANGE_TYPES}
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[int, str] = {}
+    malformed: List[Dict[str, Any]] = []
+    duplicates = 0
+
+    def _to_process() -> Iterator[Dict[str, Any]]:
+        nonlocal duplicates
+        index = 0
+        for item in iter_records(new, fmt=fmt):
+            if "error" in item:
+                malformed.append(item)
+                continue
+            record = item["record"]
+            digest = record_hash(record)
+            record_id = record_key(record, key, digest)
+            if record_id in seen:
+                duplicates += 1
+                continue
+            seen[record_id] = digest
+
+            previous_digest = previous_index.get(record_id)
+            if previous_digest is None:
+                changes["added"].append(record_id)
+            elif previous_digest != digest:
+                changes["changed"].append(record_id)
+            else:
+                changes["unchanged"].append(record_id)
+                if record_id in previous_results:
+                    results[record_id] = {**previous_results[record_id], "hash": digest, "carried_over": True}
+                    continue
+
+            pending[index] = record_id
+            index += 1
+            yield record
+
+    processed = 0
+    for result in run_pipeline_batch(_to_process(), workers=workers, output_root=output_root, max_in_flight=max_in_flight):
+        record_id = pending.pop(result["index"])
+        results[record_id] = {**summarize_result(result), "hash": seen[record_id], "carried_over": False}
+        processed += 1
+
+    changes["removed"] = sorted(set(previous_index) - set(seen))
+    score_moves = [
+        _score_move(record_id, change, previous_results.get(record_id), results.get(record_id))
+        for change in ("changed", "added", "removed")
+        for record_id in changes[change]
+    ]
+    deltas = [move["input_delta"] for move in score_moves if move["input_delta"] is not None]
+
+    return {
+        "summary": catalog_summary(results),
+        "changes": {
+            "counts": {change: len(changes[change]) for change in CHANGE_TYPES},
+            "processed": processed,
+            "carried_over": len(results) - processed,
+            "duplicates": duplicates,
+            "malformed": malformed,
+            "improved": sum(1 for delta in deltas if delta > 0),
+            "regressed": sum(1 for delta in deltas if delta < 0),
+            "score_moves": score_moves,
+        },
+        "results": results,
+    }
@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+from pipeline import run_pipeline_batch
+
+
+def load_sample(name: str) -> dict:
+    sample_path = Path(__file__).parents[1] / "samples" / name
+    return json.loads(sample_path.read_text())
+
+
+def test_batch_preserves_order_and_isolates_errors(tmp_path):
+    good = load_sample("good_health_dcat.json")
+    bad = load_sample("bad_health_dcat_missing_fields.json")
+    pii = {**good, "description": "Contains patient names"}
+    records = [good, pii, bad, good]
+
+    results = list(run_pipeline_batch(records, workers=2, output_root=str(tmp_path), max_in_flight=2))
+
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["status"] for r in results] == ["ok", "error", "ok", "ok"]
+    assert "PII/PHI" in results[1]["error"]
+    assert len({r["output_dir"] for r in results if r["status"] == "ok"}) == 3
+
+
+def test_batch_unordered_inline(tmp_path):
+    good = load_sample("good_health_dcat.json")
+    results = list(run_pipeline_batch([good, good], workers=1, output_root=str(tmp_path), ordered=False))
+
+    assert sorted(r["index"] for r in results) == [0, 1]
+    assert all(r["compliance_after"]["overall_status"] == "pass" for r in results)
+
+
+def test_batches_started_together_keep_their_reports(tmp_path):
+    good = load_sample("good_health_dcat.json")
+    bad = load_sample("bad_health_dcat_missing_fields.json")
+
+    first = list(run_pipeline_batch([bad], workers=0, output_root=str(tmp_path)))
+    second = list(run_pipeline_batch([good], workers=0, output_root=str(tmp_path)))
+
+    assert first[0]["output_dir"] != second[0]["output_dir"]
+    for result in first + second:
+        report = json.loads((Path(result["output_dir"]) / "compliance_report.json").read_text())
+        assert report["score"] == result["compliance_before"]["score"]
+
+
+def test_batch_with_spawned_workers(tmp_path):
+    good = load_sample("good_health_dcat.json")
+    results = list(run_pipeline_batch([good, good], workers=2, output_root=str(tmp_path), mp_context="spawn"))
+
+    assert [r["status"] for r in results] == ["ok", "ok"]
@@ -0,0 +1,26 @@
+from benchmarks.run_benchmarks import compare, parse_size
+from benchmarks.synthetic import generate_records
+from pipeline import Pipeline
+from pipeline.explain_fix import Explainer
+
+
+def test_generator_is_seeded_and_honours_failure_mix(tmp_path):
+    assert list(generate_records(20, seed=3)) == list(generate_records(20, seed=3))
+    assert list(generate_records(20, seed=3)) != list(generate_records(20, seed=4))
+
+    pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"))
+    clean = [pipeline.stage1(r)["compliance_before"]["score"] for r in generate_records(5, failure_mix={}, nesting_depth=3)]
+    broken = [pipeline.stage1(r)["compliance_before"]["score"] for r in generate_records(5, failure_mix={"title": 1.0})]
+    rejected = [pipeline.stage1(r)["status"] for r in generate_records(3, failure_mix={"pii": 1.0})]
+
+    assert clean == [100] * 5
+    assert all(score < 100 for score in broken)
+    assert rejected == ["error"] * 3
+
+
+def test_compare_flags_slow_stages():
+    baseline = {"results": {"1000": {"run_compliance": {"us_per_record": 10.0}, "apply_patches": {"us_per_record": 5.0}}}}
+    current = {"results": {"1000": {"run_compliance": {"us_per_record": 14.0}, "apply_patches": {"us_per_record": 5.5}}}}
+
+    assert parse_size("1M") == 1000000 and parse_size("100k") == 100000
+    assert [(stage, round(ratio, 2)) for _, stage, _, _, ratio in compare(current, baseline, 0.25)] == [("run_compliance", 1.4)]
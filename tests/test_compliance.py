@@ -0,0 +1,68 @@
+from pipeline.compliance import RULE_TYPES, RuleSet, register_rule_type
+
+
+def test_extended_rule_types():
+    ruleset = RuleSet([
+        {"id": "D1", "severity": "minor", "field": "issued", "rule": "format:date"},
+        {"id": "E1", "severity": "major", "field": "meta.status", "rule": "enum", "values": ["draft", "final"]},
+        {"id": "M1", "severity": "major", "field": "keywords", "rule": "min_items", "min": 2},
+        {"id": "X1", "severity": "critical", "field": "id", "rule": "regex", "pattern": r"ds-\d+"},
+    ])
+
+    passing = ruleset.evaluate({"issued": "2024-01-01", "meta": {"status": "final"}, "keywords": ["a", "b"], "id": "ds-7"})
+    failing = ruleset.evaluate({"issued": "01/01/2024", "meta": {"status": "other"}, "keywords": ["a"], "id": "ds-7x"})
+
+    assert passing == {"overall_status": "pass", "score": 100, "findings": []}
+    assert [f["id"] for f in failing["findings"]] == ["D1", "E1", "M1", "X1"]
+    assert failing["score"] == 100 - 3 - 10 - 10 - 25
+    assert failing["overall_status"] == "fail"
+
+
+def test_custom_rule_type_registration():
+    @register_rule_type("test:uppercase")
+    def _uppercase(rule):
+        return lambda value: isinstance(value, str) and value.isupper()
+
+    try:
+        ruleset = RuleSet([{"id": "U1", "severity": "minor", "field": "code", "rule": "test:uppercase"}])
+        assert ruleset.evaluate({"code": "ABC"})["overall_status"] == "pass"
+        assert ruleset.evaluate({"code": "abc"})["overall_status"] == "pass_with_warnings"
+    finally:
+        RULE_TYPES.pop("test:uppercase")
+
+
+def test_reevaluate_matches_full_run_for_random_patches():
+    import random
+    from copy import deepcopy
+
+    from pipeline.compliance import load_ruleset
+    from pipeline.patcher import apply_patches
+
+    ruleset = load_ruleset("configs/federator_sim_rules.yaml")
+    rng = random.Random(13)
+    values = ["", "x", "a@b.org", "https://example.org", ["k"], [], {"email": "bad"}, {"email": "c@d.eu"}, None]
+    paths = ["/title", "/description", "/contact", "/contact/email", "/license", "/landing_page", "/keywords", "/keywords/0"]
+
+    loire = {"title": "", "contact": {"email": "nope"}, "keywords": []}
+    compliance = ruleset.evaluate(loire)
+    for _ in range(300):
+        patches = [{"op": "add", "path": rng.choice(paths), "value": deepcopy(rng.choice(values))} for _ in range(rng.randint(1, 3))]
+        loire = apply_patches(loire, patches)
+        compliance = ruleset.reevaluate(loire, compliance, patches, verify=True)
+
+
+def test_reevaluate_only_checks_affected_rules():
+    ruleset = RuleSet([
+        {"id": "A", "severity": "major", "field": "contact.email", "rule": "format:email"},
+        {"id": "B", "severity": "minor", "field": "title", "rule": "required"},
+    ])
+
+    assert ruleset.affected_rules([("contact",)]) == {0}
+    assert ruleset.affected_rules([("contact", "email", "x")]) == {0}
+    assert ruleset.affected_rules([("keywords", "0")]) == set()
+    assert ruleset.affected_rules([()]) is None
+
+    # B's finding is carried over without being re-checked.
+    previous = ruleset.evaluate({})
+    result = ruleset.reevaluate({"contact": {"email": "a@b.org"}}, previous, [{"op": "add", "path": "/contact/email"}])
+    assert [f["id"] for f in result["findings"]] == ["B"]
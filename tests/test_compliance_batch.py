@@ -0,0 +1,30 @@
+import pytest
+
+from pipeline.compliance import RuleSet
+
+RULES = [
+    {"id": "R1", "severity": "critical", "field": "title", "rule": "required"},
+    {"id": "R3", "severity": "critical", "field": "contact.email", "rule": "format:email"},
+    {"id": "R5", "severity": "minor", "field": "landing_page", "rule": "format:url"},
+]
+RECORDS = [
+    {"title": "A", "contact": {"email": "a@b.org"}, "landing_page": "https://x.org"},
+    {"title": "B", "contact": {"email": "a@b.org"}, "landing_page": "nope"},
+    {"title": "", "contact": {"email": "bad"}, "landing_page": "nope"},
+    {},
+]
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_batch_matches_per_record_evaluation(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    ruleset = RuleSet(RULES)
+
+    batch = ruleset.evaluate_batch(RECORDS, use_numpy=use_numpy)
+
+    assert [batch.result(i) for i in range(len(RECORDS))] == [ruleset.evaluate(r) for r in RECORDS]
+    assert [bool(v) for v in batch.violations[2]] == [True, True, True]
+    assert list(batch.overall_status) == ["pass", "pass_with_warnings", "fail", "fail"]
+    assert batch.summary()["rule_failures"] == {"R1": 2, "R3": 2, "R5": 3}
+    assert batch.summary()["status_counts"] == {"pass": 1, "pass_with_warnings": 1, "fail": 2}
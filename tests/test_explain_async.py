@@ -0,0 +1,83 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from pipeline.explain_async import DEADLINE_MESSAGE, AsyncExplainer
+from pipeline.explain_fix import Explainer
+
+LOIRE = {"title": ""}
+COMPLIANCE = {"findings": [{"id": "R1", "severity": "critical", "field": "title", "rule": "required"}]}
+RESPONSE = {"explanation": {"critical": ["Title missing"]}, "patches": [{"op": "add", "path": "/title", "value": "T"}]}
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class StubAsyncClient:
+    """Stands in for AsyncOpenAI: fails with the queued errors, then answers after ``delay``."""
+
+    def __init__(self, errors=(), delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.errors:
+                raise self.errors.pop(0)
+            message = SimpleNamespace(content=json.dumps(RESPONSE))
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        finally:
+            self.in_flight -= 1
+
+
+def make(client, **options):
+    return AsyncExplainer(Explainer("system", "fix", api_key="test-key"), client=client, **options)
+
+
+def test_retries_rate_limits_and_server_errors():
+    client = StubAsyncClient(errors=[StatusError(429), StatusError(503)])
+    explainer = make(client, backoff_base=0.001)
+
+    result = asyncio.run(explainer.explain(LOIRE, COMPLIANCE, ["title"]))
+
+    assert result["patches"] == RESPONSE["patches"]
+    assert client.calls == 3
+
+
+def test_client_errors_are_not_retried():
+    client = StubAsyncClient(errors=[StatusError(400)])
+
+    result = asyncio.run(make(client).explain(LOIRE, COMPLIANCE, ["title"]))
+
+    assert result["patches"] == [] and client.calls == 1
+
+
+def test_deadline_falls_back_to_deterministic_patches():
+    client = StubAsyncClient(delay=1.0)
+    explainer = make(client, timeout=0.05, deadline=0.1, backoff_base=0.01)
+
+    result = asyncio.run(explainer.explain(LOIRE, COMPLIANCE, ["title"]))
+
+    assert DEADLINE_MESSAGE in result["explanation"]["minor"]
+    assert result["patches"] == [{"op": "add", "path": "/title", "value": "REQUIRED_VALUE"}]
+
+
+def test_concurrency_is_bounded():
+    client = StubAsyncClient(delay=0.01)
+    explainer = make(client, max_concurrency=3)
+
+    results = asyncio.run(explainer.explain_many([(LOIRE, COMPLIANCE, ["title"])] * 10))
+
+    assert len(results) == 10 and client.calls == 10
+    assert client.max_in_flight == 3
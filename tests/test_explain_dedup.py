@@ -0,0 +1,65 @@
+import json
+from types import SimpleNamespace
+
+from pathlib import Path
+
+from pipeline import Pipeline
+from pipeline.explain_dedup import explain_deduplicated, finding_signature
+from pipeline.explain_fix import Explainer
+from pipeline.metrics import Metrics
+
+ROOT = Path(__file__).parents[1]
+
+TITLE = {"id": "R1", "severity": "critical", "field": "title", "rule": "required"}
+EMAIL = {"id": "R3", "severity": "critical", "field": "contact.email", "rule": "format:email"}
+
+
+class RecordingClient:
+    def __init__(self):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, **kwargs):
+        payload = json.loads(messages[-1]["content"])
+        self.requests.append(payload["loire"])
+        patches = [{"op": "replace", "path": "/" + f["field"].replace(".", "/"), "value": "FIX"} for f in payload["findings"]]
+        message = SimpleNamespace(content=json.dumps({"explanation": {}, "patches": patches}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_identical_failures_share_one_request():
+    explainer = Explainer("system", "fix", api_key="test-key")
+    explainer._client = RecordingClient()
+    common = {"title": "", "contact": {"email": "bad"}}
+    items = [
+        ({**common, "description": f"dataset {i}"}, {"findings": [TITLE, EMAIL]}, ["title"]) for i in range(3)
+    ] + [({"title": "", "contact": {"email": "other"}}, {"findings": [TITLE, EMAIL]}, ["title"])]
+
+    llm_stats = [{} for _ in items]
+    results, stats = explain_deduplicated(explainer, items, stats=llm_stats)
+
+    assert stats["records"] == 4 and stats["llm_requests"] == 2 and stats["dedup_ratio"] == 2.0
+    assert explainer.client.requests[0] == {"title": "", "contact": {"email": "bad"}}
+    assert all(r["patches"] == results[0]["patches"] for r in results)
+    assert results[1]["patches"] is not results[0]["patches"]
+    assert [s["source"] for s in llm_stats] == ["llm"] * 4
+    assert [bool(s.get("shared")) for s in llm_stats] == [False, True, True, False]
+
+
+def test_dedup_batches_record_llm_stats_per_record(tmp_path):
+    bad = json.loads((ROOT / "samples" / "bad_health_dcat_missing_fields.json").read_text())
+    metrics = Metrics()
+    pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"), metrics=metrics)
+
+    results = pipeline.stage1_many([bad, dict(bad)], dedup=True)
+
+    assert all(r["timings"]["llm"]["source"] == "fallback" for r in results)
+    assert all(r["llm_source"] == "fallback" for r in results)
+    assert metrics.llm_calls["fallback"] == 2
+
+
+def test_signature_depends_on_failing_values_only():
+    a = finding_signature({"title": "", "description": "x"}, [TITLE])
+    b = finding_signature({"title": "", "description": "y"}, [TITLE])
+    c = finding_signature({"title": None, "description": "x"}, [TITLE])
+    assert a == b != c
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from pipeline import Pipeline
+from pipeline.explain_fix import Explainer
+from pipeline.findings_export import FindingsColumns, count_failing, export_findings, iter_output_results
+
+ROOT = Path(__file__).parents[1]
+
+
+def load_sample(name: str) -> dict:
+    return json.loads((ROOT / "samples" / name).read_text())
+
+
+def run_results(tmp_path):
+    pipeline = Pipeline(output_root=str(tmp_path / "out"), explainer=Explainer("system", "fix"), auto_reload=False)
+    records = [load_sample("good_health_dcat.json"), load_sample("bad_health_dcat_missing_fields.json")]
+    results = [{**pipeline.run(record), "index": index} for index, record in enumerate(records)]
+    results.append({"status": "error", "error": "PII", "index": 2})
+    return results
+
+
+def test_column_export_is_readable_per_column(tmp_path):
+    results = run_results(tmp_path)
+    bad_before = results[1]["compliance_before"]
+
+    summary = export_findings(results, str(tmp_path / "findings"), fmt="columns", chunk_rows=2)
+
+    with FindingsColumns(summary["path"]) as table:
+        assert table.rows == summary["rows"] == 1 + len(bad_before["findings"]) + 1 + 1 + 1
+        assert table.column("record")[:2] == [0, 0]
+        assert table.column("stage")[-1] == "error"
+        first_rule = bad_before["findings"][0]["id"]
+        assert table.count_failing(first_rule, stage="before") == 1
+        assert table.count_failing(first_rule, stage="after") == 0
+        rows = list(zip(table.column("record"), table.column("rule_id"), table.column("score")))
+    assert (1, first_rule, bad_before["score"]) in rows
+    assert count_failing(summary["path"], "missing") == 0
+
+
+def test_export_from_output_directories(tmp_path):
+    run_results(tmp_path)
+
+    summary = export_findings(iter_output_results(str(tmp_path / "out")), str(tmp_path / "cols"), fmt="columns")
+
+    with FindingsColumns(summary["path"]) as table:
+        assert set(table.column("stage")) == {"before", "after"}
+        assert len(set(table.column("run_id"))) == 2
+
+
+def test_arrow_formats_match_the_column_export(tmp_path):
+    pytest.importorskip("pyarrow")
+    results = run_results(tmp_path)
+    rule_id = results[1]["compliance_before"]["findings"][0]["id"]
+
+    for fmt, name in (("parquet", "findings.parquet"), ("arrow", "findings.arrow")):
+        summary = export_findings(results, str(tmp_path / name), fmt=fmt)
+        assert count_failing(summary["path"], rule_id, stage="before") == 1
+
+
+def test_close_releases_handed_out_views(tmp_path):
+    summary = export_findings(run_results(tmp_path), str(tmp_path / "findings"), fmt="columns")
+
+    table = FindingsColumns(summary["path"])
+    view = table.raw("stage")
+    codes = list(view)
+    part = table.raw("rule_id")[1:]
+    table.close()
+
+    assert codes and len(part) == table.rows - 1
+    with pytest.raises(ValueError):
+        view[0]
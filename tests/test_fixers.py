@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+from pipeline import Pipeline
+from pipeline.compliance import RuleSet
+from pipeline.config_loader import load_yaml_config
+from pipeline.explain_fix import Explainer, _fallback_patches
+from pipeline.fixers import FixerSet
+from pipeline.patcher import apply_patches
+
+ROOT = Path(__file__).parents[1]
+
+
+def load_sample(name: str) -> dict:
+    return json.loads((ROOT / "samples" / name).read_text())
+
+
+def ruleset() -> RuleSet:
+    return RuleSet.from_config(load_yaml_config(str(ROOT / "configs" / "federator_sim_rules.yaml")))
+
+
+def fixable_record() -> dict:
+    return {
+        **load_sample("good_health_dcat.json"),
+        "datasetTitle": "",
+        "title": {"de": "Kohorte", "en": "Cohort study"},
+        "contactPoint": {"email": " Mailto:Jane.Doe@Health.Example.ORG "},
+        "keywords": [],
+        "tags": "cohort, registry",
+        "license": "creativecommons.org/licenses/by/4.0/",
+        "landingPage": "//data.health.example.org/datasets/1",
+    }
+
+
+class CountingExplainer:
+    """Fixes only the first finding it is asked about."""
+
+    model = "test"
+
+    def __init__(self):
+        self.requests = []
+
+    def explain(self, loire, compliance, required_fields, stats=None):
+        self.requests.append([f["id"] for f in compliance["findings"]])
+        return {
+            "explanation": {"critical": [], "major": [], "minor": []},
+            "patches": _fallback_patches(loire, compliance["findings"][:1]),
+            "questions": [],
+        }
+
+
+def test_fixers_repair_values_and_copy_variants():
+    rules = ruleset()
+    pipeline = Pipeline(explainer=Explainer("system", "fix"), auto_reload=False)
+    record = fixable_record()
+    loire, _, _ = pipeline.mapper.map(record)
+    before = rules.evaluate(loire)
+
+    patches = FixerSet(rules).patches(loire, before["findings"], record)
+
+    fixed = apply_patches(loire, patches)
+    assert fixed["title"] == "Cohort study"
+    assert fixed["contact"]["email"] == "jane.doe@health.example.org"
+    assert fixed["keywords"] == ["cohort", "registry"]
+    assert fixed["license"] == "https://creativecommons.org/licenses/by/4.0/"
+    assert rules.evaluate(fixed)["overall_status"] == "pass"
+
+
+def test_list_variants_keep_their_shape_when_the_field_is_missing():
+    rules = ruleset()
+    loire = {"title": "T", "contact": {"email": "a@b.org"}, "license": "https://example.org/l"}
+    findings = rules.evaluate(loire)["findings"]
+
+    patches = FixerSet(rules).patches(loire, findings, {"tags": ["x", "y"]})
+    assert {"op": "add", "path": "/keywords", "value": ["x", "y"]} in patches
+
+    patches = FixerSet(rules).patches(loire, findings, {"tags": "x, y"})
+    assert {"op": "add", "path": "/keywords", "value": ["x", "y"]} in patches
+
+
+def test_unfixable_findings_are_left_for_the_llm():
+    rules = ruleset()
+    loire = {"title": "T", "contact": {"email": "invalid-email"}, "license": "not-a-url"}
+
+    patches = FixerSet(rules).patches(loire, rules.evaluate(loire)["findings"], {})
+
+    assert all(p["path"] not in ("/contact/email", "/license") for p in patches)
+
+
+def test_stage1_skips_the_llm_when_fixers_resolve_everything(tmp_path):
+    pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"), auto_reload=False)
+    pipeline.explainer = explainer = CountingExplainer()
+
+    result = pipeline.run(fixable_record())
+
+    assert explainer.requests == []
+    assert result["fix_tiers"]["llm_calls"] == 0
+    assert result["compliance_after"]["overall_status"] == "pass"
+
+
+def test_llm_loop_only_sees_residual_findings(tmp_path):
+    pipeline = Pipeline(
+        output_root=str(tmp_path), explainer=Explainer("system", "fix"), auto_reload=False, max_fix_iterations=2
+    )
+    pipeline.explainer = explainer = CountingExplainer()
+    record = {**fixable_record(), "license": "not-a-url", "issued": "", "description": ""}
+
+    stage1 = pipeline.stage1(record)
+
+    assert explainer.requests == [["R2", "R4", "R7"], ["R4", "R7"]]
+    assert stage1["fix_tiers"] == {"deterministic": 4, "llm": 2, "llm_calls": 2}
+    after = pipeline.stage2(stage1)["compliance_after"]
+    assert [f["id"] for f in after["findings"]] == ["R7"]
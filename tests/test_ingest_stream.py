@@ -0,0 +1,47 @@
+import io
+import json
+from pathlib import Path
+
+from pipeline.ingest_stream import iter_json_array, iter_records, stream_pipeline
+
+
+def load_sample(name: str) -> dict:
+    sample_path = Path(__file__).parents[1] / "samples" / name
+    return json.loads(sample_path.read_text())
+
+
+def test_json_array_elements_survive_chunk_boundaries():
+    records = [{"id": i, "text": 'quote " brace } é' * i, "nested": [1, {"x": "]"}]} for i in range(50)]
+    data = json.dumps(records, ensure_ascii=False).encode("utf-8")
+
+    items = list(iter_json_array(io.BytesIO(data), chunk_size=5))
+
+    assert [item["record"] for item in items] == records
+    for item in items:
+        decoded, _ = json.JSONDecoder().raw_decode(data[item["offset"]:].decode("utf-8"))
+        assert decoded == item["record"]
+
+
+def test_malformed_entries_are_reported_with_offsets():
+    ndjson = b'{"a": 1}\n{broken\n\n{"c": 3}\n'
+    items = list(iter_records(io.BytesIO(ndjson)))
+    assert [item.get("record") for item in items] == [{"a": 1}, None, {"c": 3}]
+    assert items[1]["offset"] == 9 and "line 2" in items[1]["error"]
+
+    array = b'[{"a": 1}, {"a": , 2}, {"b": 2}]'
+    items = list(iter_records(io.BytesIO(array)))
+    assert [item.get("record") for item in items] == [{"a": 1}, None, {"b": 2}]
+    assert items[1]["offset"] == 11
+
+
+def test_stream_pipeline_yields_results_per_record(tmp_path):
+    good = load_sample("good_health_dcat.json")
+    bad = load_sample("bad_health_dcat_missing_fields.json")
+    lines = [json.dumps(good), "not json", json.dumps(bad)]
+    source = tmp_path / "catalog.ndjson"
+    source.write_text("\n".join(lines) + "\n")
+
+    results = list(stream_pipeline(str(source), workers=1, output_root=str(tmp_path / "out")))
+
+    statuses = sorted((r["offset"], r["status"]) for r in results)
+    assert statuses == [(0, "ok"), (len(lines[0]) + 1, "error"), (len(lines[0]) + len(lines[1]) + 2, "ok")]
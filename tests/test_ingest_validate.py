@@ -0,0 +1,34 @@
+import pytest
+
+from pipeline.ingest_validate import ValidationError, detect_pii, validate_health_dcat
+
+
+def test_detect_pii_paths_and_safe_path_exemptions():
+    data = {
+        "description": "Call +1 555 123 4567 for access",
+        "contactPoint": {"email": "steward@example.org", "phone": "+1 555 123 4567"},
+        "notes": ["ok", {"owner": "jane@example.org", "ref": "ID 12345678901"}],
+        "title": "Patient cohort",
+    }
+
+    assert detect_pii(data) == [
+        "contactPoint.phone",
+        "notes[1].owner",
+        "notes[1].ref",
+        "notes[1].ref",
+        "title",
+    ]
+
+
+def test_detect_pii_handles_deep_documents():
+    root = current = {}
+    for _ in range(5000):
+        current["child"] = {}
+        current = current["child"]
+    current["ssn"] = "SSN on file"
+
+    hits = detect_pii(root)
+
+    assert len(hits) == 1 and hits[0].endswith("child.ssn")
+    with pytest.raises(ValidationError):
+        validate_health_dcat(root)
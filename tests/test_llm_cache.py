@@ -0,0 +1,55 @@
+import json
+from types import SimpleNamespace
+
+from pipeline.explain_fix import Explainer
+from pipeline.llm_cache import LLMCache
+
+LOIRE = {"title": "", "provenance": {"mapped_from": {"title": "datasetTitle"}, "generated_at": "2024-01-01T00:00:00Z"}}
+COMPLIANCE = {"findings": [{"id": "R1", "severity": "critical", "field": "title", "rule": "required"}]}
+RESPONSE = {"explanation": {"critical": ["Title missing"]}, "patches": [{"op": "add", "path": "/title", "value": "T"}]}
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=json.dumps(RESPONSE))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_explainer(cache):
+    explainer = Explainer("system", "fix", api_key="test-key", cache=cache)
+    explainer._client = FakeClient()
+    return explainer
+
+
+def test_cached_responses_ignore_generated_at(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.sqlite"))
+    explainer = make_explainer(cache)
+
+    first = explainer.explain(LOIRE, COMPLIANCE, ["title"])
+    rerun = {**LOIRE, "provenance": {**LOIRE["provenance"], "generated_at": "2025-06-01T00:00:00Z"}}
+    second = explainer.explain(rerun, COMPLIANCE, ["title"])
+
+    assert first == second
+    assert first["patches"] == RESPONSE["patches"]
+    assert explainer.client.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    cache.bypass = True
+    explainer.explain(LOIRE, COMPLIANCE, ["title"])
+    assert explainer.client.calls == 2
+
+
+def test_cache_evicts_by_size_and_age(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.sqlite"), max_entries=2)
+    for i in range(4):
+        cache.put(f"k{i}", {"i": i})
+    assert cache.stats()["entries"] == 2
+    assert cache.get("k0") is None and cache.get("k3") == {"i": 3}
+
+    cache.max_age_seconds = -1
+    assert cache.get("k3") is None
@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+from pipeline.mapper import CompiledMapper, map_health_dcat_to_loire
+
+CONFIG = Path(__file__).parents[1] / "configs" / "mapping_healthdcat_to_loire.yaml"
+
+
+def test_sample_mapping_output():
+    good = json.loads((Path(__file__).parents[1] / "samples" / "good_health_dcat.json").read_text())
+
+    loire, missing, provenance = map_health_dcat_to_loire(good, str(CONFIG))
+
+    assert loire["title"] == "Open Health Dataset"
+    assert loire["contact"] == {"email": "contact@health.gov", "name": "Data Steward"}
+    assert loire["landing_page"] == good["landingPage"]
+    assert missing == [] and loire["missing_fields"] is missing
+    assert provenance["contact.email"] == "contactPoint.email"
+    assert loire["provenance"]["mapped_from"] is provenance
+
+
+def test_mapping_transforms_and_defaults():
+    mapper = CompiledMapper({
+        "mappings": {
+            "title": {"source": "datasetTitle", "transforms": ["trim"]},
+            "contact.email": {"source": "contactPoint.email", "transforms": ["trim", "lowercase"]},
+            "keywords": {"source": "keyword", "transforms": ["list_wrap"]},
+            "license": {"source": "license", "default": "https://example.com/license"},
+        },
+        "required_fields": ["title", "license"],
+    })
+
+    loire, missing, _ = mapper.map({
+        "datasetTitle": "  Title  ",
+        "contactPoint": {"email": " Data@Example.ORG "},
+        "keyword": "health",
+    })
+
+    assert loire["title"] == "Title"
+    assert loire["contact"]["email"] == "data@example.org"
+    assert loire["keywords"] == ["health"]
+    assert loire["license"] == "https://example.com/license"
+    assert missing == []
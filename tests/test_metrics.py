@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+from pipeline import Pipeline
+from pipeline.explain_fix import Explainer
+from pipeline.metrics import NULL_TIMINGS, Metrics, RunTimings
+from pipeline.run_store import RunStore
+
+ROOT = Path(__file__).parents[1]
+
+
+def load_sample(name: str) -> dict:
+    return json.loads((ROOT / "samples" / name).read_text())
+
+
+def test_run_timings_record_each_span():
+    timings = RunTimings()
+    with timings.span("map"):
+        pass
+    resumed = RunTimings(timings.to_dict())
+    with resumed.span("patch"):
+        pass
+
+    data = resumed.to_dict()
+    assert set(data["stages"]) == {"map", "patch"}
+    assert data["total_wall_ms"] >= 0
+    assert NULL_TIMINGS.to_dict() is None
+
+
+def test_pipeline_exports_timings_and_metrics(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    metrics = Metrics()
+    pipeline = Pipeline(output_root=str(tmp_path / "out"), explainer=Explainer("system", "fix"), metrics=metrics)
+
+    result = pipeline.run(load_sample("bad_health_dcat_missing_fields.json"))
+
+    stages = result["timings"]["stages"]
+    assert {"validate", "map", "compliance", "explain", "patch", "recheck", "reports"} <= set(stages)
+    assert result["timings"]["llm"]["source"] == "fallback"
+    assert "Stage Timings (ms)" in (Path(result["output_dir"]) / "compliance_report.md").read_text()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["records"] == 1
+    assert snapshot["llm"]["calls"] == {"fallback": 1}
+    assert any(f["stage"] == "before" for f in snapshot["findings"])
+
+    text = metrics.to_prometheus()
+    assert 'dcc_stage_wall_seconds_total{stage="explain"}' in text
+    assert "dcc_findings_total{rule=" in text
+
+    metrics.write_prometheus(str(tmp_path / "metrics" / "dcc.prom"))
+    metrics.write_json(str(tmp_path / "metrics" / "dcc.json"))
+    assert json.loads((tmp_path / "metrics" / "dcc.json").read_text())["records"] == 1
+
+
+def test_pipeline_without_metrics_adds_no_timings(tmp_path, monkeypatch):
+    monkeypatch.delenv("DCC_METRICS", raising=False)
+    pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"))
+
+    result = pipeline.run(load_sample("bad_health_dcat_missing_fields.json"))
+
+    assert "timings" not in result
+    assert pipeline.metrics is None
+
+
+def test_runs_reused_from_the_run_store_are_counted(tmp_path):
+    good = load_sample("good_health_dcat.json")
+    metrics = Metrics()
+    store = RunStore(str(tmp_path / "runs.sqlite"))
+    pipeline = Pipeline(
+        output_root=str(tmp_path / "out"), explainer=Explainer("system", "fix"), metrics=metrics, run_store=store
+    )
+
+    pipeline.run(good)
+    assert pipeline.run(good)["from_run_store"] is True
+
+    snapshot = metrics.snapshot()
+    assert snapshot["records"] == 2
+    assert snapshot["runs_by_source"] == {"pipeline": 1, "run_store": 1}
+    assert snapshot["run_store"]["hit_rate"] == 0.5
+    assert 'dcc_runs_total{status="pass",source="run_store"} 1' in metrics.to_prometheus()
+    store.close()
@@ -0,0 +1,48 @@
+import json
+import pickle
+from pathlib import Path
+
+from pipeline.compliance import run_compliance
+from pipeline.ingest_validate import validate_health_dcat
+from pipeline.models import ComplianceResult, Finding, ValidationResult, json_default
+from pipeline.report import _render_markdown
+
+ROOT = Path(__file__).parents[1]
+RULES_PATH = str(ROOT / "configs" / "federator_sim_rules.yaml")
+
+
+def test_compliance_results_share_findings_and_serialize_as_before():
+    first = run_compliance({}, RULES_PATH)
+    second = run_compliance({}, RULES_PATH)
+
+    assert isinstance(first, ComplianceResult) and isinstance(first.findings[0], Finding)
+    assert first.findings[0] is second.findings[0]
+    assert first == first.to_dict() and first.to_dict() == second
+    assert json.loads(json.dumps({"result": first}, default=json_default)) == {"result": first.to_dict()}
+    assert first["findings"][0].get("severity") == first.findings[0].severity
+    assert {**first}.keys() == {"overall_status", "score", "findings"}
+    assert pickle.loads(pickle.dumps(first)) == first
+
+
+def test_models_are_read_only_and_accept_plain_dicts():
+    finding = Finding.from_dict({"id": "R1", "severity": "critical", "field": "title", "message": "m", "rule": "required"})
+
+    try:
+        finding.severity = "minor"  # type: ignore[misc]
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Finding should be read-only")
+    report = {"overall_status": "fail", "score": 75, "findings": [finding.to_dict()]}
+    assert "- [R1] title: m" in _render_markdown(report)
+    assert ComplianceResult.from_dict(report) == report
+
+
+def test_validation_result_unpacks_like_a_tuple():
+    metadata = json.loads((ROOT / "samples" / "bad_health_dcat_missing_fields.json").read_text())
+
+    result = validate_health_dcat(metadata)
+    validated, errors, score = result
+
+    assert isinstance(result, ValidationResult)
+    assert result.to_dict() == {"validated": validated, "validation_errors": errors, "quality_score": score}
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pipeline import Pipeline
+from pipeline.explain_fix import Explainer
+from pipeline.report import ReportWriter
+
+ROOT = Path(__file__).parents[1]
+
+
+def load_sample(name: str) -> dict:
+    return json.loads((ROOT / "samples" / name).read_text())
+
+
+def test_pipeline_reloads_changed_configs(tmp_path):
+    config_dir = tmp_path / "configs"
+    shutil.copytree(ROOT / "configs", config_dir)
+    pipeline = Pipeline(
+        config_dir=str(config_dir),
+        prompts_dir=str(ROOT / "prompts"),
+        output_root=str(tmp_path / "out"),
+        explainer=Explainer("system", "fix"),
+    )
+    bad = load_sample("bad_health_dcat_missing_fields.json")
+
+    before = pipeline.stage1(bad)["compliance_before"]
+
+    rules_path = config_dir / "federator_sim_rules.yaml"
+    rules_path.write_text(rules_path.read_text().replace("severity: critical", "severity: minor"))
+    stat = rules_path.stat()
+    os.utime(rules_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    after = pipeline.stage1(bad)["compliance_before"]
+
+    assert after["score"] > before["score"]
+    assert {f["severity"] for f in after["findings"]} <= {"major", "minor"}
+    assert pipeline.reload_if_changed() is False
+
+
+def test_pipeline_run_uses_fallback_patches_without_api_key(tmp_path):
+    pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"))
+
+    result = pipeline.run(load_sample("bad_health_dcat_missing_fields.json"))
+
+    assert result["status"] == "ok"
+    assert result["patches"]
+    assert result["compliance_after"]["score"] > result["compliance_before"]["score"]
+
+
+def test_stage1_stream_ends_with_stage1_result(tmp_path):
+    pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"))
+
+    events = list(pipeline.stage1_stream(load_sample("bad_health_dcat_missing_fields.json")))
+
+    patch_events = [e for e in events if e["type"] == "patch"]
+    final = events[-1]
+    assert final["type"] == "stage1" and final["result"]["status"] == "ok"
+    assert [e["patch"] for e in patch_events] == final["result"]["patches"]
+    assert patch_events[-1]["compliance"]["score"] > final["result"]["compliance_before"]["score"]
+    assert pipeline.stage2(final["result"])["compliance_after"] == patch_events[-1]["compliance"]
+
+
+def test_stage_handoff_carries_checksum_and_artifact_refs(tmp_path):
+    metadata = load_sample("bad_health_dcat_missing_fields.json")
+    pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"))
+
+    stage1 = pipeline.stage1(metadata)
+    result = pipeline.stage2(stage1)
+
+    checksum = hashlib.sha256(json.dumps(metadata, indent=2).encode("utf-8")).hexdigest()
+    assert "raw_input" not in stage1 and stage1["input_checksum"] == checksum
+    assert "loire" not in result and result["input_checksum"] == checksum
+    assert f"- Input SHA256: {checksum}" in pipeline.load_artifact(result, "report")
+    assert pipeline.load_artifact(result, "loire_before") == stage1["loire"]
+    assert pipeline.load_artifact(result, "loire_after") == result["loire_after"]
+
+
+
+@pytest.mark.parametrize("mode, bundle_name", [("ndjson", "runs.ndjson"), ("zip", "runs.zip")])
+def test_artifacts_load_from_report_bundles(tmp_path, mode, bundle_name):
+    records = [load_sample("bad_health_dcat_missing_fields.json"), load_sample("good_health_dcat.json")]
+    with ReportWriter(mode=mode, bundle_path=str(tmp_path / bundle_name)) as writer:
+        pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"), report_writer=writer)
+        stage1 = [pipeline.stage1(record) for record in records]
+        results = [pipeline.stage2(item) for item in stage1]
+
+        for item, result in zip(stage1, results):
+            assert pipeline.load_artifact(result, "loire_before") == item["loire"]
+            assert pipeline.load_artifact(result, "compliance_after") == result["compliance_after"]
+        if mode == "zip":
+            assert "Input SHA256" in pipeline.load_artifact(results[0], "report")
+        else:
+            with pytest.raises(KeyError):
+                pipeline.load_artifact(results[0], "report")
+def test_stage2_rechecks_every_rule_without_a_matching_config_hash(tmp_path):
+    pipeline = Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"))
+    stage1 = pipeline.stage1(load_sample("bad_health_dcat_missing_fields.json"))
+    faked = {**stage1, "compliance_before": {"overall_status": "pass", "score": 100, "findings": []}}
+    faked["patches"] = [{"op": "add", "path": "/title", "value": "A title"}]
+
+    for stamp in (None, "other-rules"):
+        result = pipeline.stage2({**faked, "config_hash": stamp})
+        assert result["compliance_after"] == pipeline.ruleset.evaluate(result["loire_after"])
+        assert result["compliance_after"]["overall_status"] != "pass"
+    assert stage1["config_hash"] == pipeline.config_hash
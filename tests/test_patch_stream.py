@@ -0,0 +1,44 @@
+import json
+from types import SimpleNamespace
+
+from pipeline.explain_fix import Explainer
+from pipeline.patch_stream import IncrementalPatchParser
+
+RESPONSE = {
+    "explanation": {"critical": ["Title is empty; see {\"patches\": []}"]},
+    "patches": [
+        {"op": "add", "path": "/title", "value": {"nested": "} ]"}},
+        {"op": "remove", "path": "/description"},
+        {"op": "replace", "path": "/contact/email", "value": "a@b.org"},
+    ],
+    "questions": ["Which \"license\"?"],
+}
+
+
+def test_parser_emits_each_patch_once_complete():
+    text = json.dumps(RESPONSE)
+    parser = IncrementalPatchParser()
+    emitted = []
+    for i in range(0, len(text), 3):
+        emitted.extend(parser.feed(text[i:i + 3]))
+
+    assert emitted == RESPONSE["patches"]
+    assert parser.result() == RESPONSE
+
+
+def test_stream_explain_yields_patches_before_result():
+    text = json.dumps(RESPONSE)
+    chunks = [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[i:i + 7]))])
+        for i in range(0, len(text), 7)
+    ]
+    explainer = Explainer("system", "fix", api_key="test-key")
+    explainer._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: iter(chunks)))
+    )
+
+    events = list(explainer.stream_explain({"title": ""}, {"findings": []}, []))
+
+    assert [e["type"] for e in events] == ["patch", "patch", "result"]
+    assert [e["patch"]["path"] for e in events[:2]] == ["/title", "/contact/email"]
+    assert events[-1]["result"]["patches"] == [e["patch"] for e in events[:2]]
@@ -19,3 +19,29 @@ def test_apply_patches_falls_back_when_jsonpatch_fails(monkeypatch):
     assert updated != loire
     assert updated["nested"]["field"] == "ok"
     assert loire == {}
+
+
+def test_compiled_patch_copies_only_patched_paths():
+    shared = {"items": list(range(100))}
+    loire = {"contact": {"name": "A"}, "distribution": shared}
+    compiled = patcher.compile_patches([{"op": "add", "path": "/contact/email", "value": "a@b.org"}])
+
+    first, second = compiled.apply_many([loire, {"contact": {}}])
+
+    assert first == {"contact": {"name": "A", "email": "a@b.org"}, "distribution": shared}
+    assert first["distribution"] is shared
+    assert loire["contact"] == {"name": "A"}
+    assert second == {"contact": {"email": "a@b.org"}}
+
+
+def test_compiled_patch_follows_rfc6902_before_falling_back(monkeypatch):
+    monkeypatch.setattr(patcher, "jsonpatch", object())
+    loire = {"keywords": ["a"], "title": "x"}
+
+    appended = patcher.apply_patches(loire, [{"op": "add", "path": "/keywords/-", "value": "b"}])
+    # Replacing a missing member is invalid under RFC 6902; the lenient fallback adds it instead.
+    lenient = patcher.apply_patches(loire, [{"op": "replace", "path": "/license", "value": "https://l"}])
+
+    assert appended["keywords"] == ["a", "b"]
+    assert lenient["license"] == "https://l"
+    assert loire == {"keywords": ["a"], "title": "x"}
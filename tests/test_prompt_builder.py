@@ -0,0 +1,32 @@
+import json
+
+from pipeline.prompt_builder import build_user_content, project_loire
+
+LOIRE = {
+    "title": "",
+    "description": "Long description. " * 400,
+    "publisher": {"name": "Org"},
+    "contact": {"email": "invalid", "name": "Steward"},
+    "keywords": ["a"],
+    "provenance": {"mapped_from": {"title": "datasetTitle"}, "generated_at": "2024-01-01T00:00:00Z"},
+    "missing_fields": ["title"],
+}
+FINDINGS = [
+    {"id": "R1", "severity": "critical", "field": "title", "rule": "required"},
+    {"id": "R3", "severity": "critical", "field": "contact.email", "rule": "format:email"},
+]
+
+
+def test_projection_keeps_original_paths_and_drops_provenance():
+    projected = project_loire(LOIRE, ["contact.email"], ["publisher.name"])
+
+    assert projected == {"publisher": {"name": "Org"}, "contact": {"email": "invalid", "name": "Steward"}}
+
+
+def test_prompt_is_trimmed_to_budget():
+    content, projected, stats = build_user_content(LOIRE, FINDINGS, ["title", "description"], "fix", token_budget=300)
+
+    assert stats["within_budget"] and stats["prompt_tokens"] < stats["full_tokens"]
+    assert json.loads(content)["loire"] == projected
+    assert projected["title"] == "" and projected["contact"]["email"] == "invalid"
+    assert "provenance" not in projected
@@ -0,0 +1,56 @@
+import json
+import zipfile
+
+import pytest
+
+from pipeline.report import ReportWriter, write_reports
+
+ARTIFACTS = {
+    "loire_before": {"title": ""},
+    "loire_after": {"title": "Fixed"},
+    "compliance_before": {"overall_status": "fail", "score": 75, "findings": [{"id": "R1", "severity": "critical"}]},
+    "compliance_after": {"overall_status": "pass", "score": 100, "findings": []},
+    "patches": [{"op": "add", "path": "/title", "value": "Fixed"}],
+}
+
+
+def test_background_files_match_inline_reports(tmp_path):
+    write_reports(str(tmp_path / "inline" / "run_1"), ARTIFACTS, "{}")
+    with ReportWriter(compact=True) as writer:
+        writer.submit(str(tmp_path / "bg" / "run_1"), ARTIFACTS, "{}")
+
+    inline = sorted(p.name for p in (tmp_path / "inline" / "run_1").iterdir())
+    background = sorted(p.name for p in (tmp_path / "bg" / "run_1").iterdir())
+    assert inline == background and len(inline) == 7
+    compact = (tmp_path / "bg" / "run_1" / "loire_self_description_after.json").read_text()
+    assert "\n" not in compact and json.loads(compact) == ARTIFACTS["loire_after"]
+
+
+def test_ndjson_and_zip_bundles(tmp_path):
+    ndjson_path = tmp_path / "batch.ndjson"
+    writer = ReportWriter(mode="ndjson", bundle_path=str(ndjson_path), max_queue=2)
+    for index in range(5):
+        writer.submit(str(tmp_path / f"run_{index}"), ARTIFACTS, "{}")
+    writer.flush()
+    lines = ndjson_path.read_text().splitlines()
+    writer.close()
+    assert [json.loads(line)["audit"]["run_id"] for line in lines] == [f"run_{i}" for i in range(5)]
+
+    zip_path = tmp_path / "batch.zip"
+    with ReportWriter(mode="zip", bundle_path=str(zip_path)) as writer:
+        writer.submit(str(tmp_path / "run_a"), ARTIFACTS, "{}")
+        writer.flush()
+        writer.submit(str(tmp_path / "run_b"), ARTIFACTS, "{}")
+    with zipfile.ZipFile(zip_path) as archive:
+        names = archive.namelist()
+    assert "run_a/compliance_report.md" in names and "run_b/fix_patches.json" in names
+
+
+def test_write_errors_surface_on_flush(tmp_path):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    writer = ReportWriter()
+    writer.submit(str(blocker / "run_1"), ARTIFACTS, "{}")
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.close()
@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from pipeline import Pipeline
+from pipeline.explain_fix import Explainer
+from pipeline.orchestrator import _new_run_id
+from pipeline.run_store import RunStore, input_checksum, metadata_checksum
+
+ROOT = Path(__file__).parents[1]
+
+
+def load_sample(name: str) -> dict:
+    return json.loads((ROOT / "samples" / name).read_text())
+
+
+def model_explainer():
+    # A client answering every request, so runs count as explained by the model.
+    message = SimpleNamespace(content=json.dumps({"explanation": {}, "patches": [], "questions": []}))
+    response = SimpleNamespace(choices=[SimpleNamespace(message=message)])
+    explainer = Explainer("system", "fix", api_key="test-key")
+    explainer._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kw: response)))
+    return explainer
+
+
+def test_run_ids_are_unique_within_a_second():
+    assert len({_new_run_id() for _ in range(100)}) == 100
+
+
+def test_pipeline_reuses_stored_runs_and_answers_queries(tmp_path):
+    store = RunStore(str(tmp_path / "runs.sqlite"))
+    pipeline = Pipeline(output_root=str(tmp_path / "out"), explainer=model_explainer(), run_store=store)
+    bad = load_sample("bad_health_dcat_missing_fields.json")
+    good = load_sample("good_health_dcat.json")
+
+    first = pipeline.run(bad)
+    again = pipeline.run(bad)
+    pipeline.run(good)
+
+    assert "from_run_store" not in first
+    assert again["from_run_store"] is True
+    assert again["run_id"] == first["run_id"]
+    assert again["compliance_after"] == first["compliance_after"]
+
+    changed = dict(bad, description="Now described.")
+    assert "from_run_store" not in pipeline.run(changed)
+
+    failing_before = {row["run_id"] for row in store.runs_failing("R1", stage="before")}
+    assert first["run_id"] in failing_before
+    latest = {row["dataset_id"]: row for row in store.latest_per_dataset()}
+    assert latest[good["landingPage"]]["score_after"] == 100
+    store.close()
+
+
+def test_fallback_runs_are_not_stored(tmp_path):
+    store = RunStore(str(tmp_path / "runs.sqlite"))
+    bad = load_sample("bad_health_dcat_missing_fields.json")
+    fallback = Pipeline(output_root=str(tmp_path / "out"), explainer=Explainer("system", "fix"), run_store=store)
+
+    first = fallback.run(bad)
+    assert first["llm_source"] == "fallback"
+    assert "from_run_store" not in fallback.run(bad)
+    assert store.get(first["run_id"]) is None
+
+    with_key = Pipeline(output_root=str(tmp_path / "out"), explainer=model_explainer(), run_store=store)
+    assert with_key.prompt_hash != fallback.prompt_hash
+    store.close()
+
+
+def test_stored_runs_are_copied_to_the_requested_run_directory(tmp_path):
+    store = RunStore(str(tmp_path / "runs.sqlite"))
+    pipeline = Pipeline(output_root=str(tmp_path / "out"), explainer=model_explainer(), run_store=store)
+    bad = load_sample("bad_health_dcat_missing_fields.json")
+
+    first = pipeline.run(bad)
+    again = pipeline.run(bad, output_root=str(tmp_path / "other"), run_id="run_again")
+
+    assert again["from_run_store"] is True
+    assert again["run_id"] == "run_again"
+    assert again["output_dir"] == str(tmp_path / "other" / "run_again")
+    assert pipeline.load_artifact(again, "loire_after") == first["loire_after"]
+    store.close()
+
+
+def test_metadata_checksum_matches_the_serialized_input():
+    metadata = {**load_sample("good_health_dcat.json"), "notes": "Gesundheitsdaten \u00fc \u2603", "extra": [1.5, None, {"a": []}]}
+
+    expected = input_checksum(json.dumps(metadata, indent=2))
+    assert metadata_checksum(metadata) == expected
+    assert metadata_checksum(metadata, chunk_size=7) == expected
@@ -0,0 +1,108 @@
+import http.client
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from pipeline import orchestrator
+from pipeline.explain_fix import Explainer
+from pipeline.run_store import RunStore, metadata_checksum
+from pipeline.service import DCCServer, DCCService
+
+ROOT = Path(__file__).parents[1]
+
+
+def load_sample(name: str) -> dict:
+    return json.loads((ROOT / "samples" / name).read_text())
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    server = DCCServer(("127.0.0.1", 0), DCCService(workers=0, output_root=str(tmp_path)), quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, path, body: bytes):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=30)
+    conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response.status, data
+
+
+def test_stage_endpoints_round_trip(server):
+    bad = json.dumps(load_sample("bad_health_dcat_missing_fields.json")).encode()
+
+    status, body = _post(server, "/validate", bad)
+    assert status == 200
+    assert json.loads(body)["validation_errors"]
+
+    status, body = _post(server, "/stage1", bad)
+    stage1 = json.loads(body)
+    assert status == 200 and stage1["patches"]
+
+    status, body = _post(server, "/stage2", json.dumps(stage1).encode())
+    result = json.loads(body)
+    assert status == 200
+    assert result["compliance_after"]["score"] >= stage1["compliance_before"]["score"]
+    assert Path(result["output_dir"], "compliance_report.md").exists()
+
+
+def test_stage2_ignores_client_output_dir(server, tmp_path):
+    bad = json.dumps(load_sample("bad_health_dcat_missing_fields.json")).encode()
+    stage1 = json.loads(_post(server, "/stage1", bad)[1])
+    outside = tmp_path.parent / f"{tmp_path.name}_outside"
+
+    escaped = {**stage1, "output_dir": str(tmp_path / "elsewhere" / ".." / ".." / outside.name)}
+    status, body = _post(server, "/stage2", json.dumps(escaped).encode())
+    assert status == 200 and json.loads(body)["status"] == "error"
+    assert not outside.exists()
+
+    status, body = _post(server, "/stage2", json.dumps({**stage1, "run_id": "../../escaped"}).encode())
+    result = json.loads(body)
+    assert result["run_id"] != "../../escaped"
+    assert Path(result["output_dir"]).parent == tmp_path
+    assert not (tmp_path.parent / "escaped").exists()
+
+
+def test_stage2_results_posted_by_clients_are_not_stored(server, tmp_path, monkeypatch):
+    store = RunStore(str(tmp_path / "runs.sqlite"))
+    pipeline = orchestrator.Pipeline(output_root=str(tmp_path), explainer=Explainer("system", "fix"), run_store=store)
+    monkeypatch.setattr(orchestrator, "_default_pipeline", pipeline)
+    good = load_sample("good_health_dcat.json")
+    stage1 = json.loads(_post(server, "/stage1", json.dumps(load_sample("bad_health_dcat_missing_fields.json")).encode())[1])
+
+    forged = {**stage1, "input_checksum": metadata_checksum(good), "llm_source": "llm", "patches": []}
+    assert json.loads(_post(server, "/stage2", json.dumps(forged).encode())[1])["status"] == "ok"
+
+    result = json.loads(_post(server, "/run", json.dumps(good).encode())[1])
+    assert "from_run_store" not in result
+    assert result["compliance_after"]["overall_status"] == "pass"
+    store.close()
+
+
+def test_bad_requests(server):
+    assert _post(server, "/run", b"{not json")[0] == 400
+    assert _post(server, "/run", b"[]")[0] == 400
+    assert _post(server, "/nope", b"{}")[0] == 404
+
+
+def test_bulk_streams_ndjson_in_order(server):
+    good = load_sample("good_health_dcat.json")
+    bad = load_sample("bad_health_dcat_missing_fields.json")
+    lines = [json.dumps(good), json.dumps(bad), "{broken", json.dumps(good)]
+
+    status, body = _post(server, "/bulk", ("\n".join(lines) + "\n").encode())
+
+    results = [json.loads(line) for line in body.decode().splitlines()]
+    assert status == 200
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["status"] for r in results] == ["ok", "ok", "error", "ok"]
+    assert results[0]["compliance_after"]["overall_status"] == "pass"
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from pipeline.snapshot_diff import diff_snapshots
+
+ROOT = Path(__file__).parents[1]
+
+
+def write_snapshot(path: Path, records: list) -> str:
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return str(path)
+
+
+def test_diff_processes_only_added_and_changed_records(tmp_path):
+    good = json.loads((ROOT / "samples" / "good_health_dcat.json").read_text())
+    bad = json.loads((ROOT / "samples" / "bad_health_dcat_missing_fields.json").read_text())
+    a = dict(good, landingPage="https://data.example/a")
+    b = dict(bad, landingPage="https://data.example/b")
+    c = dict(good, landingPage="https://data.example/c")
+    d = dict(good, landingPage="https://data.example/d")
+    b_fixed = dict(good, landingPage="https://data.example/b")
+
+    night1 = write_snapshot(tmp_path / "night1.ndjson", [a, b, c])
+    night2 = write_snapshot(tmp_path / "night2.ndjson", [a, b_fixed, d])
+    out = str(tmp_path / "out")
+
+    first = diff_snapshots(night1, night1, workers=0, output_root=out)
+    assert first["changes"]["counts"]["unchanged"] == 3
+    assert first["changes"]["processed"] == 3
+
+    second = diff_snapshots(night1, night2, previous_results=first["results"], workers=0, output_root=out)
+    changes = second["changes"]
+
+    assert changes["counts"] == {"added": 1, "removed": 1, "changed": 1, "unchanged": 1}
+    assert changes["processed"] == 2 and changes["carried_over"] == 1
+    assert second["results"]["https://data.example/a"]["carried_over"] is True
+    moves = {move["key"]: move for move in changes["score_moves"]}
+    assert moves["https://data.example/b"]["input_delta"] > 0
+    assert moves["https://data.example/c"]["change"] == "removed"
+    assert changes["improved"] == 1
+    assert second["summary"]["records"] == 3
+    assert second["summary"]["status_counts"]["pass"] == 3